@@ -0,0 +1,329 @@
+"""Benchmarks for the per-tick hot path.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_hot_path --output bench.json
+    python -m benchmarks.bench_hot_path --compare bench.json
+
+Results are JSON so runs from different commits can be diffed or compared.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Iterator, Sequence
+from unittest import mock
+
+import main as app_main
+from riskline.config import AppConfig, HttpConfig, Symbols, Thresholds, clear_config_cache, load_config
+from riskline.engine.decision import decide_action
+from riskline.engine.format_message import format_alert
+from riskline.engine.score import compute_score
+from riskline.http import create_session
+from riskline.indicators.trend import ma200
+from riskline.indicators.volatility import daily_return_volatility_pct
+from riskline.notify import telegram
+from riskline.sources import binance_futures, binance_spot, cmc_fear_greed
+from riskline.state import RiskState, load_state, save_state
+
+
+DAY_MS = 86_400_000
+THRESHOLDS = Thresholds(
+    fear_greed_buy=20,
+    fear_greed_sell=70,
+    funding_short_crowded=-0.0001,
+    funding_long_crowded=0.0001,
+    trend_risk_off_pct=-1.0,
+    oi_deleveraging_pct=-2.0,
+    oi_leverage_build_pct=2.0,
+    high_volatility_pct=3.0,
+)
+
+
+def kline_payload(rows: int = 300) -> list[list[Any]]:
+    # Deterministic stand-in for a recorded /api/v3/klines?interval=1d&limit=300 body.
+    payload = []
+    close = 30_000.0
+    for idx in range(rows):
+        open_price = close
+        close = open_price * (1.0 + (((idx * 7919) % 201) - 100) / 4000.0)
+        open_time = 1_600_000_000_000 + idx * DAY_MS
+        payload.append(
+            [
+                open_time,
+                f"{open_price:.2f}",
+                f"{max(open_price, close) * 1.01:.2f}",
+                f"{min(open_price, close) * 0.99:.2f}",
+                f"{close:.2f}",
+                f"{1000 + idx * 3.5:.8f}",
+                open_time + DAY_MS - 1,
+                f"{(1000 + idx) * close:.8f}",
+                10_000 + idx,
+                "500.00000000",
+                f"{500 * close:.8f}",
+                "0",
+            ]
+        )
+    return payload
+
+
+def measure(fn: Callable[[], Any], *, iterations: int, warmup: int = 1) -> dict[str, float]:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return {
+        "iterations": iterations,
+        "min_s": samples[0],
+        "median_s": statistics.median(samples),
+        "mean_s": statistics.fmean(samples),
+        "p95_s": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+    }
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    latency_seconds = 0.0
+    klines = json.dumps(kline_payload()).encode()
+
+    def _reply(self, body: bytes) -> None:
+        time.sleep(self.latency_seconds)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path.startswith("/api/v3/klines"):
+            body = self.klines
+        elif self.path.startswith("/fapi/v1/premiumIndex"):
+            body = b'{"symbol":"BTCUSDT","lastFundingRate":"0.00010000","markPrice":"64000.5"}'
+        elif self.path.startswith("/fapi/v1/openInterest"):
+            body = b'{"symbol":"BTCUSDT","openInterest":"81234.567"}'
+        elif self.path.startswith("/fapi/v1/forceOrders"):
+            body = b"[]"
+        else:
+            body = b'{"data":{"value":42,"value_classification":"Neutral"}}'
+        self._reply(body)
+
+    def do_POST(self) -> None:  # noqa: N802
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._reply(b'{"ok":true}')
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        return
+
+
+@contextlib.contextmanager
+def stub_server(latency_seconds: float) -> Iterator[str]:
+    handler = type("StubHandler", (_StubHandler,), {"latency_seconds": latency_seconds})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    patches = [
+        mock.patch.object(binance_spot, "BINANCE_SPOT_KLINES_URL", f"{base}/api/v3/klines"),
+        mock.patch.object(
+            binance_futures,
+            "BINANCE_FUTURES_PREMIUM_INDEX_URL",
+            f"{base}/fapi/v1/premiumIndex",
+        ),
+        mock.patch.object(binance_futures, "BINANCE_FUTURES_OI_URL", f"{base}/fapi/v1/openInterest"),
+        mock.patch.object(
+            binance_futures,
+            "BINANCE_FUTURES_FORCE_ORDERS_URL",
+            f"{base}/fapi/v1/forceOrders",
+        ),
+        mock.patch.object(cmc_fear_greed, "CMC_FNG_URL", f"{base}/v3/fear-and-greed/latest"),
+        mock.patch.object(telegram, "TELEGRAM_API_URL", base),
+    ]
+    try:
+        for patch in patches:
+            patch.start()
+        yield base
+    finally:
+        for patch in reversed(patches):
+            patch.stop()
+        server.shutdown()
+        server.server_close()
+
+
+def _app_config(workdir: Path) -> AppConfig:
+    return AppConfig(
+        poll_interval_minutes=30,
+        alert_cooldown_hours=6,
+        state_file=str(workdir / "state.json"),
+        thresholds=THRESHOLDS,
+        symbols=Symbols(futures="BTCUSDT", spot="BTCUSDT"),
+        http=HttpConfig(timeout_seconds=5, max_retries=0, backoff_seconds=0.0),
+        cmc_api_key="bench",
+        telegram_bot_token="bench",
+        telegram_chat_id="bench",
+        dry_run=False,
+        enable_liquidations_proxy=True,
+        kline_cache_file=str(workdir / "klines.json"),
+    )
+
+
+def run_benchmarks(*, iterations: int = 200, tick_iterations: int = 10, latency_ms: float = 50.0) -> dict:
+    results: dict[str, dict[str, float]] = {}
+    payload = kline_payload()
+    closes = [float(row[4]) for row in payload]
+    http = HttpConfig(timeout_seconds=1, max_retries=0, backoff_seconds=0.0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        # Copied so the config snapshot lands in the temp dir, not the checkout.
+        config_path = workdir / "config.yaml"
+        config_path.write_text((Path(__file__).resolve().parent.parent / "config.yaml").read_text())
+        env_path = workdir / ".env"
+        env_path.write_text("CMC_API_KEY=bench\nTELEGRAM_BOT_TOKEN=bench\nTELEGRAM_CHAT_ID=bench\n")
+        snapshot_path = workdir / ".config.yaml.snapshot"
+
+        def _load_config(*, snapshot: bool) -> None:
+            # Each call starts like a new process: warm from the snapshot, or cold without it.
+            clear_config_cache()
+            if not snapshot:
+                snapshot_path.unlink(missing_ok=True)
+            load_config(path=str(config_path), env_path=str(env_path))
+
+        results["load_config"] = measure(lambda: _load_config(snapshot=True), iterations=iterations)
+        results["load_config_no_snapshot"] = measure(lambda: _load_config(snapshot=False), iterations=iterations)
+
+        state_path = str(workdir / "bench_state.json")
+        state = RiskState(last_alert_ts=1, last_regime="NEUTRAL", prev_oi=1.0, prev_daily_close=2.0)
+        results["save_state"] = measure(lambda: save_state(state_path, state), iterations=iterations)
+        results["load_state"] = measure(lambda: load_state(state_path), iterations=iterations)
+
+        with mock.patch.object(binance_spot, "get_json", lambda *args, **kwargs: payload):
+            results["fetch_daily_klines_parse_300"] = measure(
+                lambda: binance_spot.fetch_daily_klines(symbol="BTCUSDT", http=http),
+                iterations=iterations,
+            )
+
+        results["ma200"] = measure(lambda: ma200(closes), iterations=iterations)
+        results["daily_return_volatility_pct"] = measure(
+            lambda: daily_return_volatility_pct(closes),
+            iterations=iterations,
+        )
+        score_kwargs = {
+            "fear_greed_value": 18,
+            "trend_pct_vs_200d": -2.5,
+            "funding_rate": -0.0002,
+            "oi_delta_pct": -3.0,
+            "volatility_pct": 3.5,
+            "thresholds": THRESHOLDS,
+        }
+        results["compute_score"] = measure(lambda: compute_score(**score_kwargs), iterations=iterations)
+        score = compute_score(**score_kwargs)
+        decision = decide_action(score.score)
+        results["format_alert"] = measure(
+            lambda: format_alert(
+                fear_greed_value=18,
+                fear_greed_label="Extreme Fear",
+                btc_price=closes[-1],
+                trend_pct_vs_200d=-2.5,
+                funding_rate=-0.0002,
+                oi_delta_pct=-3.0,
+                liquidations_proxy="Low",
+                score=score,
+                decision=decision,
+                send_reason="regime_flip",
+            ),
+            iterations=iterations,
+        )
+
+        with stub_server(latency_ms / 1000.0):
+            config = _app_config(workdir)
+            with create_session(config.http) as session:
+                runtime = app_main._build_runtime(config, session)
+
+                def _tick() -> None:
+                    # Clearing the alert state makes every tick queue an alert.
+                    for tick_state in runtime.states.values():
+                        tick_state.last_regime = ""
+                    app_main.run_once(runtime)
+
+                results["run_once_stub_http"] = measure(_tick, iterations=tick_iterations)
+                runtime.outbox.close(timeout=5.0)
+
+    return {"meta": _metadata(latency_ms), "results": results}
+
+
+def _metadata(latency_ms: float) -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "stub_latency_ms": latency_ms,
+    }
+
+
+def compare(current: dict, baseline: dict) -> list[str]:
+    lines = []
+    for name, stats in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            lines.append(f"{name}: {stats['median_s'] * 1e6:.1f}us (new)")
+            continue
+        ratio = stats["median_s"] / before["median_s"] if before["median_s"] else float("inf")
+        lines.append(
+            f"{name}: {before['median_s'] * 1e6:.1f}us -> {stats['median_s'] * 1e6:.1f}us ({ratio:.2f}x)"
+        )
+    return lines
+
+
+def _parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--tick-iterations", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="latency injected by the stub server")
+    parser.add_argument("--output", help="write JSON results to this file instead of stdout")
+    parser.add_argument("--compare", help="baseline JSON file to compare medians against")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = _parse_args(argv)
+    report = run_benchmarks(
+        iterations=args.iterations,
+        tick_iterations=args.tick_iterations,
+        latency_ms=args.latency_ms,
+    )
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    else:
+        print(json.dumps(report, indent=2))
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        # Keeps stdout valid JSON when no --output is given.
+        print("\n".join(compare(report, baseline)), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
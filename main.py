@@ -1,95 +1,676 @@
 from __future__ import annotations
 
+import argparse
+import importlib
 import logging
+import signal
 import time
+from dataclasses import replace
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Sequence
 
-from riskline.config import ConfigError, load_config
+from riskline.config import AppConfig, ConfigError, Symbols, load_config
 from riskline.engine.decision import decide_action
-from riskline.engine.format_message import format_alert
-from riskline.engine.score import compute_score
-from riskline.indicators.trend import ma200, pct_distance_from_ma
-from riskline.indicators.volatility import daily_return_volatility_pct
-from riskline.notify.telegram import send_telegram_alert
-from riskline.sources.binance_futures import fetch_futures_snapshot
-from riskline.sources.binance_spot import fetch_daily_klines
-from riskline.sources.cmc_fear_greed import fetch_fear_greed
-from riskline.state import compute_oi_delta_pct, load_state, save_state, should_send_alert
+from riskline.engine.format_message import asset_label, format_alert
+from riskline.engine.incremental import IncrementalScorer
+from riskline.fetch import FetchError, FetchResult, fetch_concurrently
+from riskline.indicators.rolling import RollingIndicators
+from riskline.indicators.trend import pct_distance_from_ma
+from riskline.kline_store import Kline, KlineStore
+from riskline.metrics import FETCH_SECONDS, REGISTRY, STAGE_SECONDS, TICK_SECONDS
+from riskline.reload import ConfigWatcher
+from riskline.runtime import Runtime, SymbolInputs
+from riskline.scheduler import Scheduler
+from riskline.state import RiskState, compute_oi_delta_pct, should_send_alert
+from riskline.state_store import StateLockError, create_state_store, state_lock
 
+if TYPE_CHECKING:
+    from riskline.http import HttpSession
+    from riskline.notify.queue import Fanout
+    from riskline.sources.binance_stream import LiveSnapshot
+
+
+def _lazy(module: str, name: str) -> Callable[..., Any]:
+    """Forward calls to ``module.name``, importing the module on first use."""
+
+    def call(*args: Any, **kwargs: Any) -> Any:
+        return getattr(importlib.import_module(module), name)(*args, **kwargs)
+
+    call.__name__ = call.__qualname__ = name
+    return call
+
+
+# Sources and Telegram pull in requests, so they are bound lazily: a run that
+# stops before fetching (config error, state lock timeout) never imports it.
+fetch_daily_candles = _lazy("riskline.sources.binance_spot", "fetch_daily_candles")
+fetch_fear_greed = _lazy("riskline.sources.cmc_fear_greed", "fetch_fear_greed")
+fetch_liquidations_proxy = _lazy("riskline.sources.binance_futures", "fetch_liquidations_proxy")
+fetch_open_interest = _lazy("riskline.sources.binance_futures", "fetch_open_interest")
+fetch_premium_index = _lazy("riskline.sources.binance_futures", "fetch_premium_index")
+fetch_premium_indexes = _lazy("riskline.sources.binance_futures", "fetch_premium_indexes")
+send_telegram_alert = _lazy("riskline.notify.telegram", "send_telegram_alert")
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 logger = logging.getLogger("riskline")
 
 
-def run_once() -> int:
-    config = load_config()
-    state = load_state(config.state_file)
+def _live_snapshots(runtime: Runtime) -> dict[str, LiveSnapshot]:
+    if runtime.live is None:
+        return {}
+    snapshots = {}
+    for symbols in runtime.config.watched_symbols():
+        snapshot = runtime.live.snapshot(symbols.futures, max_age_seconds=runtime.config.stream.max_age_seconds)
+        if snapshot is not None:
+            snapshots[symbols.futures] = snapshot
+    return snapshots
+
+
+def _fetch_inputs(runtime: Runtime, live: dict[str, LiveSnapshot]) -> FetchResult:
+    config = runtime.config
+    session = runtime.session
+    http = config.http
+    lake = runtime.lake
+    watched = config.watched_symbols()
+    tasks: dict[str, Callable[[], Any]] = {
+        "fear_greed": lambda: fetch_fear_greed(
+            api_key=config.cmc_api_key,
+            http=http,
+            session=session,
+            lake=lake,
+        ),
+    }
+    # Funding and liquidations already streamed live need no REST call.
+    polled = [symbols for symbols in watched if symbols.futures not in live]
+    if len(polled) == 1:
+        futures_symbol = polled[0].futures
+        tasks["premium"] = lambda: {
+            futures_symbol: fetch_premium_index(symbol=futures_symbol, http=http, session=session, lake=lake)
+        }
+    elif polled:
+        tasks["premium"] = lambda: fetch_premium_indexes(
+            symbols=[symbols.futures for symbols in polled],
+            http=http,
+            session=session,
+            lake=lake,
+        )
+
+    for symbols in watched:
+        tasks[f"open_interest:{symbols.futures}"] = partial(
+            fetch_open_interest,
+            symbol=symbols.futures,
+            http=http,
+            session=session,
+            lake=lake,
+        )
+        tasks[f"candles:{symbols.spot}"] = partial(
+            fetch_daily_candles,
+            symbol=symbols.spot,
+            http=http,
+            session=session,
+            store=runtime.kline_store,
+            lake=lake,
+        )
+        if config.enable_liquidations_proxy and symbols.futures not in live:
+            tasks[f"liquidations_proxy:{symbols.futures}"] = partial(
+                fetch_liquidations_proxy,
+                symbol=symbols.futures,
+                http=http,
+                session=session,
+            )
+
+    timed_tasks = {name: _timed_fetch(name, task) for name, task in tasks.items()}
+    with STAGE_SECONDS.time(stage="fetch"):
+        # More threads than pooled connections would only wait for a connection.
+        result = fetch_concurrently(
+            timed_tasks,
+            deadline_seconds=config.fetch_deadline_seconds,
+            max_workers=config.http.pool_maxsize,
+        )
+    for name, error in sorted(result.errors.items()):
+        logger.warning("Input %s unavailable: %s", name, error)
+    for name in result.timed_out:
+        logger.warning("Input %s missed the %.1fs fetch deadline", name, config.fetch_deadline_seconds)
+    if not result.values:
+        raise FetchError("No inputs arrived before the fetch deadline")
+    return result
+
+
+def _timed_fetch(name: str, task: Callable[[], Any]) -> Callable[[], Any]:
+    source, _, symbol = name.partition(":")
+
+    def _run() -> Any:
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            value = task()
+            outcome = "ok"
+            return value
+        finally:
+            FETCH_SECONDS.observe(
+                time.perf_counter() - started,
+                source=source,
+                symbol=symbol,
+                outcome=outcome,
+            )
+
+    return _run
+
+
+def run_once(runtime: Runtime | None = None) -> int:
+    if runtime is None:
+        config = load_config()
+        snapshot_path = f"{config.metrics.textfile}.state.json" if config.metrics.textfile else ""
+        if snapshot_path:
+            REGISTRY.load_snapshot(snapshot_path)
+        try:
+            with state_lock(config.state_file, timeout_seconds=config.state_lock_timeout_seconds):
+                from riskline.http import create_session
+
+                with create_session(config.http, config.cache) as session:
+                    runtime = _build_runtime(config, session)
+                    try:
+                        return _timed_tick(runtime)
+                    finally:
+                        runtime.state_store.close()
+                        # State is already saved; undelivered alerts stay spooled.
+                        runtime.outbox.close(timeout=config.notify.flush_timeout_seconds)
+        finally:
+            if snapshot_path:
+                REGISTRY.save_snapshot(snapshot_path)
+    return _timed_tick(runtime)
+
+
+def _timed_tick(runtime: Runtime) -> int:
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        result = _run_tick(runtime)
+        outcome = "ok"
+        return result
+    finally:
+        TICK_SECONDS.observe(time.perf_counter() - started, outcome=outcome)
+        if runtime.config.metrics.textfile:
+            try:
+                REGISTRY.write_textfile(runtime.config.metrics.textfile)
+            except OSError as exc:
+                logger.warning("Could not write metrics textfile: %s", exc)
+
 
-    fear_greed = fetch_fear_greed(api_key=config.cmc_api_key, http=config.http)
-    futures = fetch_futures_snapshot(
-        symbol=config.symbols.futures,
-        http=config.http,
-        include_liquidations_proxy=config.enable_liquidations_proxy,
+def _build_runtime(config: AppConfig, session: HttpSession) -> Runtime:
+    history = None
+    if config.history_dir:
+        from riskline.history import HistoryStore
+
+        history = HistoryStore(config.history_dir)
+    lake = None
+    if config.lake_dir:
+        from riskline.lake import DataLake
+
+        lake = DataLake(config.lake_dir)
+    # A single-symbol state file from before watchlists belongs to ``symbols``.
+    state_store = create_state_store(
+        config.state_backend,
+        config.state_file,
+        legacy_symbol=config.symbols.futures,
     )
-    closes = fetch_daily_klines(symbol=config.symbols.spot, http=config.http)
-
-    current_price = closes[-1]
-    moving_average_200 = ma200(closes)
-    trend_pct = pct_distance_from_ma(current_price, moving_average_200)
-    volatility_pct = daily_return_volatility_pct(closes)
-    oi_delta_pct = compute_oi_delta_pct(state.prev_oi, futures["open_interest"])
-
-    score = compute_score(
-        fear_greed_value=fear_greed["value"],
-        trend_pct_vs_200d=trend_pct,
-        funding_rate=futures["funding_rate"],
-        oi_delta_pct=oi_delta_pct,
+    states = state_store.load([symbols.futures for symbols in config.watched_symbols()])
+    return Runtime(
+        config=config,
+        session=session,
+        states=states,
+        state_store=state_store,
+        kline_store=KlineStore.load(config.kline_cache_file),
+        indicators=_indicators_for(states),
+        outbox=_create_outbox(config, session),
+        history=history,
+        lake=lake,
+    )
+
+
+def _indicators_for(states: dict[str, RiskState]) -> dict[str, RollingIndicators]:
+    return {
+        symbol: RollingIndicators.from_dict(state.indicators) if state.indicators else RollingIndicators()
+        for symbol, state in states.items()
+    }
+
+
+# Settings baked into objects built once per daemon (session, stores, outbox,
+# stream, metrics server); a reload keeps their running values.
+RESTART_ONLY_FIELDS = (
+    "state_file",
+    "state_backend",
+    "state_lock_timeout_seconds",
+    "history_dir",
+    "lake_dir",
+    "kline_cache_file",
+    "http",
+    "cache",
+    "notify",
+    "stream",
+    "metrics",
+    "telegram_bot_token",
+    "telegram_chat_id",
+    "dry_run",
+    "config_reload_seconds",
+)
+
+
+def _apply_config(runtime: Runtime, config: AppConfig) -> None:
+    """Swap in a reloaded config; callers hold ``runtime.lock`` so no tick sees a mix."""
+    pinned = [name for name in RESTART_ONLY_FIELDS if getattr(config, name) != getattr(runtime.config, name)]
+    if pinned:
+        logger.warning("Config reload: %s changed; restart to apply", ", ".join(pinned))
+    config = replace(config, **{name: getattr(runtime.config, name) for name in RESTART_ONLY_FIELDS})
+    watched = {symbols.futures for symbols in config.watched_symbols()}
+    added = [symbol for symbol in watched if symbol not in runtime.states]
+    if added:
+        states = runtime.state_store.load(added)
+        runtime.states.update(states)
+        runtime.indicators.update(_indicators_for(states))
+    # Dropped symbols keep their saved state but stop being scored live.
+    for symbol in set(runtime.last_inputs) - watched:
+        del runtime.last_inputs[symbol]
+    for symbol in set(runtime.scorers) - watched:
+        del runtime.scorers[symbol]
+    runtime.config = config
+    logger.info("Config reloaded (%d symbol(s), %d added)", len(watched), len(added))
+
+
+def _create_outbox(config: AppConfig, session: HttpSession) -> Fanout:
+    from riskline.notify.channels import Notifier, TelegramNotifier, create_notifier
+    from riskline.notify.queue import DeliveryQueue, Fanout, channel_spool_path
+
+    notifiers: list[Notifier] = [
+        TelegramNotifier(
+            bot_token=config.telegram_bot_token,
+            chat_id=config.telegram_chat_id,
+            dry_run=config.dry_run,
+            timeout_seconds=config.http.timeout_seconds,
+            session=session,
+            send=send_telegram_alert,
+        )
+    ]
+    for channel in config.notify.channels:
+        notifiers.append(create_notifier(channel.kind, name=channel.name, session=session, **dict(channel.options)))
+    return Fanout(
+        {
+            notifier.name: DeliveryQueue(
+                notifier.send,
+                spool_path=channel_spool_path(config.notify.spool_file, notifier.name),
+                workers=config.notify.workers,
+                max_attempts=config.notify.max_attempts,
+                backoff_seconds=config.notify.backoff_seconds,
+                merge=config.notify.merge_alerts,
+                channel=notifier.name,
+            )
+            for notifier in notifiers
+        }
+    )
+
+
+def _update_indicators(indicators: RollingIndicators, candles: list[Kline]) -> RollingIndicators:
+    last_key = indicators.last_key
+    if last_key is None or candles[0].open_time > last_key:
+        # No overlap with what the indicators have seen: reseed from history.
+        indicators = RollingIndicators(
+            ma_window=indicators.ma_window,
+            vol_lookback=indicators.vol_lookback,
+        )
+        last_key = None
+    for candle in candles:
+        if last_key is None or candle.open_time >= last_key:
+            indicators.update(candle.open_time, candle.close)
+    return indicators
+
+
+def _run_tick(runtime: Runtime) -> int:
+    with runtime.lock:
+        return _run_tick_locked(runtime)
+
+
+def _run_tick_locked(runtime: Runtime) -> int:
+    config = runtime.config
+    runtime.session.reset_retry_budget()
+    live = _live_snapshots(runtime)
+    inputs = _fetch_inputs(runtime, live).values
+    premiums = inputs.get("premium") or {}
+
+    for symbols in config.watched_symbols():
+        premium = premiums.get(symbols.futures) or {}
+        liquidations_proxy = inputs.get(f"liquidations_proxy:{symbols.futures}")
+        snapshot = live.get(symbols.futures)
+        if snapshot is not None:
+            premium = {"funding_rate": snapshot.funding_rate, "mark_price": snapshot.mark_price}
+            liquidations_proxy = snapshot.liquidations_label()
+        open_interest = inputs.get(f"open_interest:{symbols.futures}")
+        candles = inputs.get(f"candles:{symbols.spot}")
+        if not premium and open_interest is None and not candles:
+            logger.warning("No market inputs for %s; skipping", symbols.futures)
+            continue
+        _evaluate_symbol(
+            runtime,
+            symbols,
+            fear_greed=inputs.get("fear_greed"),
+            premium=premium,
+            open_interest=open_interest,
+            candles=candles,
+            liquidations_proxy=liquidations_proxy,
+        )
+
+    with STAGE_SECONDS.time(stage="persist"):
+        runtime.state_store.save(runtime.states)
+        runtime.kline_store.save()
+    return 0
+
+
+def _evaluate_symbol(
+    runtime: Runtime,
+    symbols: Symbols,
+    *,
+    fear_greed: dict | None,
+    premium: dict,
+    open_interest: float | None,
+    candles: list[Kline] | None,
+    liquidations_proxy: str | None,
+) -> None:
+    state = runtime.states[symbols.futures]
+    now_ts = int(time.time())
+    current_price = candles[-1].close if candles else premium.get("mark_price")
+    oi_delta_pct = _oi_delta_pct(runtime, symbols.futures, open_interest, now_ts)
+    ma = None
+    volatility_pct = None
+    if candles:
+        indicators = _update_indicators(runtime.indicators[symbols.futures], candles)
+        runtime.indicators[symbols.futures] = indicators
+        ma = indicators.ma()
+        volatility_pct = indicators.volatility_pct()
+    inputs = SymbolInputs(
+        fear_greed=fear_greed,
+        funding_rate=premium.get("funding_rate"),
+        price=current_price,
+        ma=ma,
         volatility_pct=volatility_pct,
-        thresholds=config.thresholds,
+        oi_delta_pct=oi_delta_pct,
+        liquidations_proxy=liquidations_proxy,
+    )
+    runtime.last_inputs[symbols.futures] = inputs
+    sent, reason = _score_and_alert(runtime, symbols, inputs)
+    if not sent:
+        logger.info("Alert skipped for %s (%s)", symbols.futures, reason)
+    if runtime.history is not None:
+        _record_history(runtime, symbols.futures, inputs, open_interest, now_ts)
+
+    if open_interest is not None:
+        state.prev_oi = open_interest
+    if current_price is not None:
+        state.prev_daily_close = current_price
+    if symbols.futures in runtime.indicators:
+        state.indicators = runtime.indicators[symbols.futures].to_dict()
+
+
+def _oi_delta_pct(runtime: Runtime, futures_symbol: str, open_interest: float | None, now_ts: int) -> float | None:
+    if runtime.history is not None:
+        # Accept a baseline up to two ticks older than exactly 24h.
+        tolerance = max(3600, 2 * runtime.config.poll_interval_minutes * 60)
+        delta = runtime.history.oi_delta_pct(
+            futures_symbol,
+            open_interest,
+            now_ts=now_ts,
+            tolerance_seconds=tolerance,
+        )
+        if delta is not None:
+            return delta
+    # Until a day of history exists, fall back to the previous tick.
+    return compute_oi_delta_pct(runtime.states[futures_symbol].prev_oi, open_interest)
+
+
+def _record_history(
+    runtime: Runtime,
+    futures_symbol: str,
+    inputs: SymbolInputs,
+    open_interest: float | None,
+    now_ts: int,
+) -> None:
+    from riskline.history import HistoryRecord
+
+    result = runtime.scorers[futures_symbol].result
+    record = HistoryRecord(
+        ts=now_ts,
+        funding_rate=inputs.funding_rate,
+        open_interest=open_interest,
+        price=inputs.price,
+        trend_pct=pct_distance_from_ma(inputs.price, inputs.ma) if inputs.price is not None else None,
+        volatility_pct=inputs.volatility_pct,
+        fear_greed=inputs.fear_greed["value"] if inputs.fear_greed else None,
+        score=result.score if result is not None else None,
+        regime=result.regime if result is not None else "",
     )
-    decision = decide_action(score.score)
+    try:
+        runtime.history.append(futures_symbol, record)
+    except (OSError, ValueError) as exc:
+        logger.warning("Could not record history for %s: %s", futures_symbol, exc)
+
+
+def _scorer_for(runtime: Runtime, symbols: Symbols) -> IncrementalScorer:
+    thresholds = runtime.config.thresholds_for(symbols)
+    rules = runtime.config.scoring
+    scorer = runtime.scorers.get(symbols.futures)
+    if scorer is None or scorer.thresholds != thresholds or scorer.rules != rules:
+        scorer = IncrementalScorer(thresholds, rules)
+        runtime.scorers[symbols.futures] = scorer
+    return scorer
+
+
+def _score_and_alert(
+    runtime: Runtime,
+    symbols: Symbols,
+    inputs: SymbolInputs,
+    *,
+    force: bool = True,
+) -> tuple[bool, str]:
+    config = runtime.config
+    state = runtime.states[symbols.futures]
+    fear_greed = inputs.fear_greed
+
+    with STAGE_SECONDS.time(stage="score"):
+        fear_greed_value = fear_greed["value"] if fear_greed else None
+        trend_pct = pct_distance_from_ma(inputs.price, inputs.ma) if inputs.price is not None else None
+        scorer = _scorer_for(runtime, symbols)
+        values = (fear_greed_value, trend_pct, inputs.funding_rate, inputs.oi_delta_pct, inputs.volatility_pct)
+        score = scorer.score(
+            fear_greed_value=fear_greed_value,
+            trend_pct_vs_200d=trend_pct,
+            funding_rate=inputs.funding_rate,
+            oi_delta_pct=inputs.oi_delta_pct,
+            volatility_pct=inputs.volatility_pct,
+            force=force,
+        )
+        if score is None:
+            # No input changed band, so neither the score nor the regime moved.
+            return False, "inputs_unchanged"
+        decision = decide_action(score.score, plan=scorer.plan)
+        # Missing inputs are scored as neutral, so the regime they give is a guess.
+        missing = scorer.plan.missing(values)
 
     send_allowed, reason = should_send_alert(
         state=state,
         current_regime=score.regime,
         cooldown_hours=config.alert_cooldown_hours,
         now_ts=int(time.time()),
+        partial=bool(missing),
     )
 
     if send_allowed:
         message = format_alert(
-            fear_greed_value=fear_greed["value"],
-            fear_greed_label=fear_greed["label"],
-            btc_price=current_price,
+            fear_greed_value=fear_greed_value,
+            fear_greed_label=fear_greed["label"] if fear_greed else "n/a",
+            btc_price=inputs.price,
             trend_pct_vs_200d=trend_pct,
-            funding_rate=futures["funding_rate"],
-            oi_delta_pct=oi_delta_pct,
-            liquidations_proxy=futures["liquidations_proxy"],
+            funding_rate=inputs.funding_rate,
+            oi_delta_pct=inputs.oi_delta_pct,
+            liquidations_proxy=inputs.liquidations_proxy,
             score=score,
             decision=decision,
             send_reason=reason,
+            asset=asset_label(symbols.spot),
+            missing_inputs=missing,
         )
-        send_telegram_alert(
-            text=message,
-            bot_token=config.telegram_bot_token,
-            chat_id=config.telegram_chat_id,
-            timeout_seconds=config.http.timeout_seconds,
-            dry_run=config.dry_run,
-        )
+        with STAGE_SECONDS.time(stage="notify"):
+            runtime.outbox.submit(message)
         state.last_alert_ts = int(time.time())
         state.last_regime = score.regime
-        logger.info("Alert sent (%s)", reason)
-    else:
-        logger.info("Alert skipped (%s)", reason)
+        logger.info("Alert queued for %s (%s)", symbols.futures, reason)
+    return send_allowed, reason
+
+
+def _on_live_update(runtime: Runtime, futures_symbol: str) -> None:
+    # Streamed funding, mark price and liquidations replace the polled values;
+    # everything else comes from the last tick.
+    base = runtime.last_inputs.get(futures_symbol)
+    if base is None or runtime.live is None:
+        return  # nothing to combine with until the first tick has run
+    snapshot = runtime.live.snapshot(futures_symbol)
+    if snapshot is None:
+        return
+    # A running tick will pick up the live values itself.
+    if not runtime.lock.acquire(blocking=False):
+        return
+    try:
+        with state_lock(runtime.config.state_file, timeout_seconds=0.0):
+            _update_from_live(runtime, futures_symbol, base, snapshot)
+    except StateLockError:
+        pass  # a one-shot run holds the state; the next tick catches up
+    finally:
+        runtime.lock.release()
+
+
+def _update_from_live(runtime: Runtime, futures_symbol: str, base: SymbolInputs, snapshot: Any) -> None:
+    symbols = next((s for s in runtime.config.watched_symbols() if s.futures == futures_symbol), None)
+    if symbols is None:
+        return  # dropped by a config reload
+    inputs = replace(
+        base,
+        funding_rate=snapshot.funding_rate if snapshot.funding_rate is not None else base.funding_rate,
+        price=snapshot.mark_price,
+        liquidations_proxy=snapshot.liquidations_label(),
+    )
+    runtime.last_inputs[futures_symbol] = inputs
+    _reload_states(runtime)
+    sent, _ = _score_and_alert(runtime, symbols, inputs, force=False)
+    if sent:
+        runtime.state_store.save(runtime.states)
+
+
+def _reload_states(runtime: Runtime) -> None:
+    # A one-shot run may have saved newer state while the lock was free.
+    runtime.states.update(runtime.state_store.load(list(runtime.states)))
+
+
+def _daemon_tick(runtime: Runtime) -> int:
+    # The lock is held per tick rather than for the daemon's lifetime, so a
+    # manual one-shot run can take its turn between ticks.
+    config = runtime.config
+    with state_lock(config.state_file, timeout_seconds=config.state_lock_timeout_seconds):
+        with runtime.lock:
+            _reload_states(runtime)
+        return run_once(runtime)
+
 
-    state.prev_oi = futures["open_interest"]
-    state.prev_daily_close = current_price
-    save_state(config.state_file, state)
+def run_daemon() -> int:
+    config = load_config()
+    from riskline.http import create_session
+
+    with create_session(config.http, config.cache) as session:
+        runtime = _build_runtime(config, session)
+        scheduler = Scheduler(
+            partial(_daemon_tick, runtime),
+            interval_seconds=config.poll_interval_minutes * 60,
+        )
+
+        def _request_stop(signum: int, _frame: Any) -> None:
+            logger.info("Received %s; stopping after the current tick", signal.Signals(signum).name)
+            scheduler.stop()
+
+        previous_handlers = {
+            signum: signal.signal(signum, _request_stop)
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        stream = None
+        if config.stream.enabled:
+            from riskline.sources.binance_stream import (
+                BINANCE_FUTURES_STREAM_URL,
+                LiveMarket,
+                MarketStream,
+                stream_url,
+            )
+
+            futures_symbols = [symbols.futures for symbols in config.watched_symbols()]
+            runtime.live = LiveMarket(
+                futures_symbols,
+                liquidation_window_seconds=config.stream.liquidation_window_seconds,
+            )
+            stream = MarketStream(
+                stream_url(futures_symbols, config.stream.url or BINANCE_FUTURES_STREAM_URL),
+                runtime.live,
+                on_update=partial(_on_live_update, runtime),
+            )
+            stream.start()
+            logger.info("Streaming mark price and liquidations for %d symbol(s)", len(futures_symbols))
+        metrics_server = None
+        if config.metrics.port:
+            from riskline.metrics import serve_metrics
+
+            metrics_server = serve_metrics(config.metrics.port, host=config.metrics.host)
+            logger.info("Serving metrics on %s:%d/metrics", config.metrics.host, config.metrics.port)
+
+        def _reload(new_config: AppConfig) -> None:
+            # Waits for an in-flight tick or live update to finish first.
+            with runtime.lock:
+                _apply_config(runtime, new_config)
+            scheduler.interval_seconds = runtime.config.poll_interval_minutes * 60
+
+        watcher = None
+        if config.config_reload_seconds > 0:
+            watcher = ConfigWatcher(
+                load_config,
+                config,
+                _reload,
+                interval_seconds=config.config_reload_seconds,
+            )
+            watcher.start()
+        logger.info("Daemon started (interval %d min)", config.poll_interval_minutes)
+        try:
+            scheduler.run()
+        finally:
+            if watcher is not None:
+                watcher.stop()
+            if stream is not None:
+                stream.stop()
+            if metrics_server is not None:
+                metrics_server.shutdown()
+                metrics_server.server_close()
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+            runtime.state_store.close()
+            runtime.outbox.close(timeout=config.notify.flush_timeout_seconds)
+    logger.info("Daemon stopped after %d tick(s)", scheduler.ticks_run)
     return 0
 
 
-def main() -> None:
+def _parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Riskline BTC risk-regime monitor")
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="run continuously, ticking every poll_interval_minutes",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = _parse_args(argv)
     try:
-        raise_code = run_once()
+        raise_code = run_daemon() if args.daemon else run_once()
         raise SystemExit(raise_code)
     except ConfigError as exc:
         logger.error("Configuration error: %s", exc)
@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Sequence
+
+from riskline.config import DEFAULT_SCORING, ScoringRules, Thresholds, load_config
+from riskline.engine.batch import score_batch
+from riskline.history import HistoryFile
+from riskline.lake import MARKET, DataLake, asof
+from riskline.indicators.series import rolling_ma, rolling_volatility_pct
+from riskline.indicators.trend import pct_distance_from_ma
+from riskline.state import RiskState, compute_oi_delta_pct, should_send_alert
+
+
+DAY_SECONDS = 86400
+
+
+@dataclass(frozen=True)
+class HistoricalSeries:
+    symbol: str
+    timestamps: list[int]
+    closes: Sequence[float]
+    funding_rates: list[float | None]
+    open_interest: list[float | None]
+    fear_greed: list[int | None]
+
+
+@dataclass(frozen=True)
+class BacktestInputs:
+    """Per-bar scoring inputs, computed once and reusable across thresholds."""
+
+    symbol: str
+    timestamps: list[int]
+    prices: list[float]
+    trend_pct: list[float | None]
+    volatility_pct: list[float]
+    oi_delta_pct: list[float | None]
+    funding_rates: list[float | None]
+    fear_greed: list[int | None]
+
+
+@dataclass
+class BacktestResult:
+    symbol: str
+    bars: int = 0
+    scores: list[int] = field(default_factory=list)
+    regimes: list[str] = field(default_factory=list)
+    actions: list[str] = field(default_factory=list)
+    alerts: list[tuple[int, str]] = field(default_factory=list)
+    regime_totals: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def alert_count(self) -> int:
+        return len(self.alerts)
+
+    def regime_counts(self) -> dict[str, int]:
+        return dict(self.regime_totals)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "symbol": self.symbol,
+            "bars": self.bars,
+            "alerts": self.alert_count,
+            "regimes": self.regime_counts(),
+            "actions": dict(Counter(self.actions)),
+        }
+
+
+def _optional(value: str | None, cast: type) -> Any:
+    if value is None or value.strip() == "":
+        return None
+    return cast(float(value)) if cast is int else cast(value)
+
+
+def load_series_csv(path: str, symbol: str | None = None) -> HistoricalSeries:
+    """Read ``timestamp,close,funding_rate,open_interest,fear_greed`` rows.
+
+    Timestamps are Unix seconds; every column except ``close`` may be blank.
+    """
+    timestamps: list[int] = []
+    closes: list[float] = []
+    funding_rates: list[float | None] = []
+    open_interest: list[float | None] = []
+    fear_greed: list[int | None] = []
+    with open(path, newline="") as handle:
+        for row in csv.DictReader(handle):
+            timestamps.append(int(float(row["timestamp"])))
+            closes.append(float(row["close"]))
+            funding_rates.append(_optional(row.get("funding_rate"), float))
+            open_interest.append(_optional(row.get("open_interest"), float))
+            fear_greed.append(_optional(row.get("fear_greed"), int))
+    return HistoricalSeries(
+        symbol=symbol or Path(path).stem.upper(),
+        timestamps=timestamps,
+        closes=closes,
+        funding_rates=funding_rates,
+        open_interest=open_interest,
+        fear_greed=fear_greed,
+    )
+
+
+def load_series_history(
+    path: str,
+    symbol: str | None = None,
+    *,
+    start_ts: int | None = None,
+    end_ts: int | None = None,
+) -> HistoricalSeries:
+    """Daily bars from the records of a ``history_dir`` file in ``[start_ts, end_ts)``.
+
+    Records are written once per tick, so they are resampled to one bar per UTC
+    day (the day's last price, and its latest funding, OI and F&G) to match the
+    daily candles the live indicators use.
+    """
+    bars: dict[int, dict[str, Any]] = {}
+    for record in HistoryFile(path).range(start_ts, end_ts):
+        if record.price is None:
+            continue
+        bar = bars.setdefault(record.ts // DAY_SECONDS, {})
+        bar["ts"] = record.ts
+        bar["close"] = record.price
+        for name in ("funding_rate", "open_interest", "fear_greed"):
+            value = getattr(record, name)
+            if value is not None:
+                bar[name] = value
+    daily = [bars[day] for day in sorted(bars)]
+    return HistoricalSeries(
+        symbol=symbol or Path(path).stem.upper(),
+        timestamps=[bar["ts"] for bar in daily],
+        closes=[bar["close"] for bar in daily],
+        funding_rates=[bar.get("funding_rate") for bar in daily],
+        open_interest=[bar.get("open_interest") for bar in daily],
+        fear_greed=[bar.get("fear_greed") for bar in daily],
+    )
+
+
+def load_series_lake(
+    lake_dir: str,
+    symbol: str,
+    *,
+    start_ts: int | None = None,
+    end_ts: int | None = None,
+    tolerance_seconds: int = 2 * 86400,
+) -> HistoricalSeries:
+    """Daily bars from a ``lake_dir`` with funding, OI and F&G as of each close.
+
+    Closes are a zero-copy view of the lake column. The other inputs take the
+    last value recorded at or before the bar's close, if within ``tolerance_seconds``.
+    """
+    lake = DataLake(lake_dir)
+    candles = lake.read(
+        symbol,
+        "candles_1d",
+        None if start_ts is None else start_ts * 1000,
+        None if end_ts is None else end_ts * 1000,
+    )
+    timestamps = [close_time // 1000 for close_time in candles["close_time"].tolist()]
+    funding = lake.read(symbol, "funding")
+    open_interest = lake.read(symbol, "open_interest")
+    fear_greed = lake.read(MARKET, "fear_greed")
+    return HistoricalSeries(
+        symbol=symbol.upper(),
+        timestamps=timestamps,
+        closes=candles["close"],
+        funding_rates=asof(funding["ts"], funding["funding_rate"], timestamps, tolerance=tolerance_seconds),
+        open_interest=asof(
+            open_interest["ts"],
+            open_interest["open_interest"],
+            timestamps,
+            tolerance=tolerance_seconds,
+        ),
+        fear_greed=asof(fear_greed["ts"], fear_greed["value"], timestamps, tolerance=tolerance_seconds),
+    )
+
+
+def load_series(path: str) -> HistoricalSeries:
+    if path.endswith(".bin"):
+        return load_series_history(path)
+    if Path(path).is_dir():
+        # A ``lake_dir/<SYMBOL>`` directory.
+        lake_path = Path(path)
+        return load_series_lake(str(lake_path.parent), lake_path.name)
+    return load_series_csv(path)
+
+
+def _none_if_nan(value: float | None) -> float | None:
+    if value is None or math.isnan(value):
+        return None
+    return float(value)
+
+
+def precompute_inputs(series: HistoricalSeries, *, backend: str = "auto") -> BacktestInputs:
+    moving_averages = rolling_ma(series.closes, backend=backend)
+    volatilities = rolling_volatility_pct(series.closes, backend=backend)
+
+    trend_pct: list[float | None] = []
+    oi_delta_pct: list[float | None] = []
+    prev_oi: float | None = None
+    for idx, price in enumerate(series.closes):
+        trend_pct.append(pct_distance_from_ma(price, _none_if_nan(moving_averages[idx])))
+        current_oi = series.open_interest[idx]
+        oi_delta_pct.append(compute_oi_delta_pct(prev_oi, current_oi))
+        if current_oi is not None:
+            prev_oi = current_oi
+
+    return BacktestInputs(
+        symbol=series.symbol,
+        timestamps=list(series.timestamps),
+        prices=list(series.closes),
+        trend_pct=trend_pct,
+        volatility_pct=[float(value) for value in volatilities],
+        oi_delta_pct=oi_delta_pct,
+        funding_rates=list(series.funding_rates),
+        fear_greed=list(series.fear_greed),
+    )
+
+
+def simulate(
+    inputs: BacktestInputs,
+    thresholds: Thresholds,
+    *,
+    cooldown_hours: int,
+    rules: ScoringRules = DEFAULT_SCORING,
+    record_bars: bool = True,
+    backend: str = "auto",
+) -> BacktestResult:
+    result = BacktestResult(symbol=inputs.symbol, bars=len(inputs.timestamps))
+    state = RiskState()
+    # Scoring is stateless, so every bar is scored in one pass; only the
+    # alert cooldown has to walk the bars in order.
+    scores = score_batch(
+        fear_greed=inputs.fear_greed,
+        trend_pct=inputs.trend_pct,
+        funding=inputs.funding_rates,
+        oi_delta=inputs.oi_delta_pct,
+        volatility=inputs.volatility_pct,
+        thresholds=thresholds,
+        rules=rules,
+        backend=backend,
+    )
+    regimes = scores.regime_labels()
+    # Same rule as the live tick: a bar missing a fetched input cannot flip the regime.
+    rows = zip(inputs.fear_greed, inputs.trend_pct, inputs.funding_rates, inputs.oi_delta_pct, inputs.volatility_pct)
+    partial = [bool(scores.plan.missing(row)) for row in rows]
+
+    for ts, regime, bar_partial in zip(inputs.timestamps, regimes, partial):
+        send_allowed, reason = should_send_alert(
+            state=state,
+            current_regime=regime,
+            cooldown_hours=cooldown_hours,
+            now_ts=ts,
+            partial=bar_partial,
+        )
+        if send_allowed:
+            state.last_alert_ts = ts
+            state.last_regime = regime
+            result.alerts.append((ts, reason))
+        result.regime_totals[regime] += 1
+    if record_bars:
+        result.scores = [int(score) for score in scores.score]
+        result.regimes = regimes
+        result.actions = scores.action_labels()
+    return result
+
+
+def run_backtest(
+    series: Sequence[HistoricalSeries],
+    thresholds: Thresholds | dict[str, Thresholds],
+    *,
+    cooldown_hours: int,
+    rules: ScoringRules = DEFAULT_SCORING,
+    backend: str = "auto",
+) -> dict[str, BacktestResult]:
+    results: dict[str, BacktestResult] = {}
+    for item in series:
+        symbol_thresholds = thresholds[item.symbol] if isinstance(thresholds, dict) else thresholds
+        inputs = precompute_inputs(item, backend=backend)
+        results[item.symbol] = simulate(
+            inputs,
+            symbol_thresholds,
+            cooldown_hours=cooldown_hours,
+            rules=rules,
+            backend=backend,
+        )
+    return results
+
+
+def _parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay Riskline scoring over historical data")
+    parser.add_argument(
+        "files",
+        nargs="+",
+        help="CSV files, history_dir .bin files or lake_dir/<SYMBOL> directories, one per symbol",
+    )
+    parser.add_argument("--config", default="config.yaml", help="config file providing thresholds and scoring rules")
+    parser.add_argument("--backend", default="auto", choices=("auto", "python", "numpy"))
+    parser.add_argument("--json", action="store_true", help="print machine-readable summaries")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = _parse_args(argv)
+    config = load_config(path=args.config, require_secrets=False)
+    per_symbol = {symbols.futures: config.thresholds_for(symbols) for symbols in config.watched_symbols()}
+    series = [load_series(path) for path in args.files]
+    thresholds = {item.symbol: per_symbol.get(item.symbol, config.thresholds) for item in series}
+
+    results = run_backtest(
+        series,
+        thresholds,
+        cooldown_hours=config.alert_cooldown_hours,
+        rules=config.scoring,
+        backend=args.backend,
+    )
+    summaries = [result.summary() for result in results.values()]
+    if args.json:
+        print(json.dumps(summaries, indent=2))
+        return
+    for summary in summaries:
+        regimes = ", ".join(f"{name}={count}" for name, count in sorted(summary["regimes"].items()))
+        print(f"{summary['symbol']}: bars={summary['bars']} alerts={summary['alerts']} {regimes}")
+
+
+if __name__ == "__main__":
+    main()
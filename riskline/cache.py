@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Mapping
+from urllib.parse import urlencode
+
+from riskline.config import CacheConfig
+from riskline.state import atomic_write_text
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    stored_at: float
+    payload: Any
+
+
+class MemoryBackend:
+    """LRU map of cache key to entry, capped at ``max_entries``."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class DiskBackend(MemoryBackend):
+    """LRU cache persisted to a JSON file so one-shot runs share entries."""
+
+    def __init__(self, path: str, max_entries: int = 256) -> None:
+        super().__init__(max_entries)
+        self.path = path
+        self._save_lock = threading.Lock()
+        p = Path(path)
+        if p.exists():
+            try:
+                rows = json.loads(p.read_text())
+            except (OSError, ValueError):
+                rows = []
+            for key, stored_at, payload in rows[-self.max_entries :]:
+                self._entries[key] = CacheEntry(stored_at=float(stored_at), payload=payload)
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        super().set(key, entry)
+        self._save()
+
+    def _save(self) -> None:
+        with self._save_lock:
+            with self._lock:
+                rows = [[key, entry.stored_at, entry.payload] for key, entry in self._entries.items()]
+            atomic_write_text(self.path, json.dumps(rows, separators=(",", ":")))
+
+
+class ResponseCache:
+    """Payloads keyed by URL and params, with a TTL per source and a stale window."""
+
+    def __init__(
+        self,
+        backend: MemoryBackend,
+        *,
+        ttl_seconds: Mapping[str, float],
+        max_stale_seconds: float = 86400.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.backend = backend
+        self.ttl_seconds = dict(ttl_seconds)
+        self.max_stale_seconds = max_stale_seconds
+        self._clock = clock
+
+    @staticmethod
+    def key(url: str, params: Mapping[str, Any] | None = None) -> str:
+        if not params:
+            return url
+        return f"{url}?{urlencode(sorted(params.items()))}"
+
+    def ttl_for(self, source: str) -> float:
+        return self.ttl_seconds.get(source, 0.0)
+
+    def lookup(self, url: str, params: Mapping[str, Any] | None = None) -> CacheEntry | None:
+        return self.backend.get(self.key(url, params))
+
+    def is_fresh(self, source: str, entry: CacheEntry) -> bool:
+        return self._clock() - entry.stored_at < self.ttl_for(source)
+
+    def is_usable_stale(self, entry: CacheEntry) -> bool:
+        return self._clock() - entry.stored_at <= self.max_stale_seconds
+
+    def store(self, url: str, params: Mapping[str, Any] | None, payload: Any) -> None:
+        self.backend.set(self.key(url, params), CacheEntry(stored_at=self._clock(), payload=payload))
+
+
+def create_response_cache(cache: CacheConfig) -> ResponseCache | None:
+    if cache.backend == "none":
+        return None
+    if cache.backend == "disk":
+        backend: MemoryBackend = DiskBackend(cache.file, cache.max_entries)
+    else:
+        backend = MemoryBackend(cache.max_entries)
+    return ResponseCache(
+        backend,
+        ttl_seconds=dict(cache.ttl_seconds),
+        max_stale_seconds=cache.max_stale_seconds,
+    )
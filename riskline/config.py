@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import os
-from dataclasses import dataclass
+import threading
+import time
+from dataclasses import dataclass, fields, replace
 from pathlib import Path
-from typing import Any
+from typing import Any, Mapping
 
-import yaml
-from dotenv import load_dotenv
+from riskline.state import atomic_write_text
 
 
 class ConfigError(ValueError):
@@ -24,11 +27,21 @@ class Thresholds:
     oi_leverage_build_pct: float
     high_volatility_pct: float
 
+    def replace_from(self, raw: Mapping[str, Any]) -> Thresholds:
+        """A copy with the fields named in ``raw`` replaced; other keys are ignored."""
+        overrides: dict[str, Any] = {}
+        for field in fields(Thresholds):
+            if field.name in raw:
+                cast = int if field.name.startswith("fear_greed") else float
+                overrides[field.name] = cast(raw[field.name])
+        return replace(self, **overrides)
+
 
 @dataclass(frozen=True)
 class Symbols:
     futures: str
     spot: str
+    thresholds: Thresholds | None = None
 
 
 @dataclass(frozen=True)
@@ -36,6 +49,187 @@ class HttpConfig:
     timeout_seconds: int
     max_retries: int
     backoff_seconds: float
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    keep_alive: bool = True
+    breaker_failure_threshold: int = 5
+    breaker_reset_seconds: float = 60.0
+    retry_budget: int = 6
+    retry_budget_seconds: float = 10.0
+    rate_limit_safety: float = 0.8
+    rate_limit_max_wait_seconds: float = 10.0
+
+
+@dataclass(frozen=True)
+class MetricsConfig:
+    textfile: str = ""
+    port: int = 0
+    host: str = "127.0.0.1"
+
+
+@dataclass(frozen=True)
+class StreamConfig:
+    enabled: bool = False
+    url: str = ""
+    liquidation_window_seconds: float = 300.0
+    max_age_seconds: float = 15.0
+
+
+@dataclass(frozen=True)
+class ChannelConfig:
+    kind: str
+    name: str
+    options: tuple[tuple[str, Any], ...] = ()
+
+
+@dataclass(frozen=True)
+class NotifyConfig:
+    spool_file: str = ""
+    workers: int = 2
+    max_attempts: int = 5
+    backoff_seconds: float = 2.0
+    merge_alerts: bool = False
+    flush_timeout_seconds: float = 30.0
+    channels: tuple[ChannelConfig, ...] = ()
+
+
+DEFAULT_CACHE_TTLS = (("fear_greed", 3600.0), ("premium_index", 600.0))
+
+
+@dataclass(frozen=True)
+class CacheConfig:
+    backend: str = "disk"
+    file: str = ".riskline_cache.json"
+    max_entries: int = 256
+    max_stale_seconds: float = 86400.0
+    ttl_seconds: tuple[tuple[str, float], ...] = DEFAULT_CACHE_TTLS
+
+    def ttl_for(self, source: str) -> float:
+        return dict(self.ttl_seconds).get(source, 0.0)
+
+
+# Inputs a scoring rule can compare, in the order the plan evaluates them.
+SCORING_INPUTS = ("fear_greed", "trend_pct", "funding", "oi_delta", "volatility")
+SCORING_OPS = ("<=", "<", ">=", ">", "==")
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """``input op threshold``; ``threshold`` is a Thresholds field name or a literal."""
+
+    input: str
+    op: str
+    threshold: str | float
+
+
+@dataclass(frozen=True)
+class SignalRule:
+    op: str
+    threshold: str | float
+    weight: int
+    label: str
+
+
+@dataclass(frozen=True)
+class Signal:
+    """One scored input: the first matching rule wins, else the default outcome."""
+
+    name: str
+    input: str
+    rules: tuple[SignalRule, ...]
+    default_label: str
+    default_weight: int = 0
+    # An empty missing_label sends a missing input to the default outcome.
+    missing_label: str = ""
+    missing_weight: int = 0
+
+
+@dataclass(frozen=True)
+class Outcome:
+    """A regime or action picked when the score range and every comparison match."""
+
+    name: str
+    min_score: int | None = None
+    max_score: int | None = None
+    when: tuple[Comparison, ...] = ()
+    guidance: str = ""
+
+
+@dataclass(frozen=True)
+class ScoringRules:
+    signals: tuple[Signal, ...]
+    regimes: tuple[Outcome, ...]
+    actions: tuple[Outcome, ...]
+    base_score: int = 50
+    min_score: int = 0
+    max_score: int = 100
+
+
+DEFAULT_SCORING = ScoringRules(
+    signals=(
+        Signal(
+            name="fear_greed",
+            input="fear_greed",
+            rules=(
+                SignalRule("<=", "fear_greed_buy", -20, "Extreme Fear (buy bias)"),
+                SignalRule(">=", "fear_greed_sell", 20, "Greed (sell bias)"),
+            ),
+            default_label="Neutral sentiment",
+            missing_label="No sentiment data",
+        ),
+        Signal(
+            name="trend",
+            input="trend_pct",
+            rules=(SignalRule("<=", "trend_risk_off_pct", 15, "Risk-off"),),
+            default_label="Risk-on/neutral",
+            default_weight=-5,
+        ),
+        Signal(
+            name="funding",
+            input="funding",
+            rules=(
+                SignalRule("<=", "funding_short_crowded", -10, "Short crowded"),
+                SignalRule(">=", "funding_long_crowded", 10, "Long crowded"),
+            ),
+            default_label="Balanced",
+            missing_label="No funding data",
+        ),
+        Signal(
+            name="oi",
+            input="oi_delta",
+            rules=(
+                SignalRule("<=", "oi_deleveraging_pct", -10, "Deleveraging"),
+                SignalRule(">=", "oi_leverage_build_pct", 10, "Leverage build-up"),
+            ),
+            default_label="Stable",
+            missing_label="No prior OI baseline",
+        ),
+        Signal(
+            name="volatility",
+            input="volatility",
+            rules=(SignalRule(">=", "high_volatility_pct", 5, "High"),),
+            default_label="Normal",
+            missing_label="No price history",
+        ),
+    ),
+    regimes=(
+        Outcome(
+            name="EXTREME_FEAR_RISK_OFF",
+            when=(
+                Comparison("fear_greed", "<=", 20.0),
+                Comparison("trend_pct", "<=", "trend_risk_off_pct"),
+            ),
+        ),
+        Outcome(name="RISK_OFF_BUY_ZONE", max_score=35),
+        Outcome(name="RISK_ON_EUPHORIA", min_score=70),
+        Outcome(name="NEUTRAL"),
+    ),
+    actions=(
+        Outcome(name="BUY", max_score=35, guidance="DCA-BUY (3 tranches) / Reduce leverage"),
+        Outcome(name="REDUCE", min_score=70, guidance="Take profits / Reduce leverage"),
+        Outcome(name="HOLD", guidance="Hold spot / Avoid overtrading"),
+    ),
+)
 
 
 @dataclass(frozen=True)
@@ -51,6 +245,25 @@ class AppConfig:
     telegram_chat_id: str
     dry_run: bool
     enable_liquidations_proxy: bool
+    fetch_deadline_seconds: float = 30.0
+    kline_cache_file: str = ".riskline_klines.json"
+    watchlist: tuple[Symbols, ...] = ()
+    metrics: MetricsConfig = MetricsConfig()
+    cache: CacheConfig = CacheConfig()
+    stream: StreamConfig = StreamConfig()
+    state_backend: str = "json"
+    state_lock_timeout_seconds: float = 60.0
+    history_dir: str = ""
+    lake_dir: str = ""
+    notify: NotifyConfig = NotifyConfig()
+    config_reload_seconds: float = 5.0
+    scoring: ScoringRules = DEFAULT_SCORING
+
+    def watched_symbols(self) -> tuple[Symbols, ...]:
+        return self.watchlist or (self.symbols,)
+
+    def thresholds_for(self, symbols: Symbols) -> Thresholds:
+        return symbols.thresholds or self.thresholds
 
 
 def _to_bool(value: Any, default: bool = False) -> bool:
@@ -62,39 +275,237 @@ def _to_bool(value: Any, default: bool = False) -> bool:
     return normalized in {"1", "true", "yes", "on"}
 
 
-def _required_env(name: str) -> str:
+def _required_env(name: str, required: bool = True) -> str:
     value = os.getenv(name, "").strip()
-    if not value:
+    if not value and required:
         raise ConfigError(f"Missing required environment variable: {name}")
     return value
 
 
-def load_config(path: str = "config.yaml", env_path: str = ".env") -> AppConfig:
-    load_dotenv(env_path)
-    raw = yaml.safe_load(Path(path).read_text()) or {}
+DEFAULT_THRESHOLDS = Thresholds(
+    fear_greed_buy=20,
+    fear_greed_sell=70,
+    funding_short_crowded=-0.0001,
+    funding_long_crowded=0.0001,
+    trend_risk_off_pct=-1.0,
+    oi_deleveraging_pct=-2.0,
+    oi_leverage_build_pct=2.0,
+    high_volatility_pct=3.0,
+)
 
-    thresholds_raw = raw.get("thresholds", {})
-    symbols_raw = raw.get("symbols", {})
-    http_raw = raw.get("http", {})
 
-    thresholds = Thresholds(
-        fear_greed_buy=int(thresholds_raw.get("fear_greed_buy", 20)),
-        fear_greed_sell=int(thresholds_raw.get("fear_greed_sell", 70)),
-        funding_short_crowded=float(thresholds_raw.get("funding_short_crowded", -0.0001)),
-        funding_long_crowded=float(thresholds_raw.get("funding_long_crowded", 0.0001)),
-        trend_risk_off_pct=float(thresholds_raw.get("trend_risk_off_pct", -1.0)),
-        oi_deleveraging_pct=float(thresholds_raw.get("oi_deleveraging_pct", -2.0)),
-        oi_leverage_build_pct=float(thresholds_raw.get("oi_leverage_build_pct", 2.0)),
-        high_volatility_pct=float(thresholds_raw.get("high_volatility_pct", 3.0)),
+def _parse_cache(raw: dict[str, Any]) -> CacheConfig:
+    backend = str(raw.get("backend", "disk")).strip().lower()
+    if backend not in {"memory", "disk", "none"}:
+        raise ConfigError(f"Unknown cache backend: {backend}")
+    ttl_raw = raw.get("ttl_seconds")
+    ttls = dict(DEFAULT_CACHE_TTLS)
+    if ttl_raw is not None:
+        if not isinstance(ttl_raw, dict):
+            raise ConfigError("cache.ttl_seconds must be a mapping of source to seconds")
+        ttls.update({str(source): float(ttl) for source, ttl in ttl_raw.items()})
+    return CacheConfig(
+        backend=backend,
+        file=str(raw.get("file", ".riskline_cache.json")),
+        max_entries=int(raw.get("max_entries", 256)),
+        max_stale_seconds=float(raw.get("max_stale_seconds", 86400.0)),
+        ttl_seconds=tuple(sorted(ttls.items())),
     )
-    symbols = Symbols(
-        futures=str(symbols_raw.get("futures", "BTCUSDT")),
-        spot=str(symbols_raw.get("spot", "BTCUSDT")),
+
+
+def _parse_channels(raw: Any) -> tuple[ChannelConfig, ...]:
+    if raw is None:
+        return ()
+    if not isinstance(raw, list):
+        raise ConfigError("notify.channels must be a list")
+    channels: list[ChannelConfig] = []
+    seen = {"telegram"}
+    for entry in raw:
+        if not isinstance(entry, dict) or not entry.get("type"):
+            raise ConfigError("Every notify channel needs a type")
+        kind = str(entry["type"]).strip().lower()
+        name = str(entry.get("name") or kind)
+        if name in seen:
+            raise ConfigError(f"Duplicate notify channel name: {name}")
+        seen.add(name)
+        options = tuple(
+            (str(key), tuple(value) if isinstance(value, list) else value)
+            for key, value in entry.items()
+            if key not in ("type", "name")
+        )
+        channels.append(ChannelConfig(kind=kind, name=name, options=options))
+    return tuple(channels)
+
+
+def _parse_threshold(value: Any, where: str) -> str | float:
+    if isinstance(value, str) and value in {field.name for field in fields(Thresholds)}:
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ConfigError(f"{where}: threshold must be a number or a thresholds key, got {value!r}") from None
+
+
+def _parse_comparison(raw: Any, where: str) -> Comparison:
+    if not isinstance(raw, dict):
+        raise ConfigError(f"{where}: expected a mapping with input, op and threshold")
+    comparison = Comparison(
+        input=str(raw.get("input", "")),
+        op=str(raw.get("op", "")),
+        threshold=_parse_threshold(raw.get("threshold"), where),
     )
+    if comparison.input not in SCORING_INPUTS:
+        raise ConfigError(f"{where}: unknown input {comparison.input!r}; expected one of {SCORING_INPUTS}")
+    if comparison.op not in SCORING_OPS:
+        raise ConfigError(f"{where}: unknown op {comparison.op!r}; expected one of {SCORING_OPS}")
+    return comparison
+
+
+def _parse_outcome_label(raw: Any) -> tuple[str, int]:
+    if isinstance(raw, dict):
+        return str(raw.get("label", "")), int(raw.get("weight", 0))
+    return str(raw or ""), 0
+
+
+def _parse_signal(raw: Any) -> Signal:
+    if not isinstance(raw, dict) or not raw.get("name"):
+        raise ConfigError("Every scoring signal needs a name")
+    name = str(raw["name"])
+    if raw.get("input") not in SCORING_INPUTS:
+        raise ConfigError(f"scoring signal {name}: input must be one of {SCORING_INPUTS}")
+    rules = []
+    for index, entry in enumerate(raw.get("rules") or []):
+        where = f"scoring signal {name} rule {index + 1}"
+        if not isinstance(entry, dict):
+            raise ConfigError(f"{where}: expected a mapping with op, threshold, weight and label")
+        comparison = _parse_comparison({**entry, "input": raw.get("input")}, where)
+        rules.append(
+            SignalRule(
+                op=comparison.op,
+                threshold=comparison.threshold,
+                weight=int(entry.get("weight", 0)),
+                label=str(entry.get("label", "")),
+            )
+        )
+    default_label, default_weight = _parse_outcome_label(raw.get("default"))
+    missing_label, missing_weight = _parse_outcome_label(raw.get("missing"))
+    if not default_label:
+        raise ConfigError(f"scoring signal {name} needs a default label")
+    return Signal(
+        name=name,
+        input=str(raw["input"]),
+        rules=tuple(rules),
+        default_label=default_label,
+        default_weight=default_weight,
+        missing_label=missing_label,
+        missing_weight=missing_weight,
+    )
+
+
+def _parse_outcomes(raw: Any, section: str) -> tuple[Outcome, ...]:
+    if not isinstance(raw, list) or not raw:
+        raise ConfigError(f"scoring.{section} must be a non-empty list")
+    outcomes = []
+    for entry in raw:
+        if not isinstance(entry, dict) or not entry.get("name"):
+            raise ConfigError(f"Every scoring.{section} entry needs a name")
+        name = str(entry["name"])
+        if entry.get("when") and section == "actions":
+            raise ConfigError(f"scoring.actions entry {name} may only use min_score/max_score")
+        outcomes.append(
+            Outcome(
+                name=name,
+                min_score=int(entry["min_score"]) if entry.get("min_score") is not None else None,
+                max_score=int(entry["max_score"]) if entry.get("max_score") is not None else None,
+                when=tuple(_parse_comparison(item, f"scoring.{section} {name}") for item in entry.get("when") or []),
+                guidance=str(entry.get("guidance", "")),
+            )
+        )
+    last = outcomes[-1]
+    if last.min_score is not None or last.max_score is not None or last.when:
+        raise ConfigError(f"The last scoring.{section} entry must be unconditional")
+    names = [outcome.name for outcome in outcomes]
+    if len(set(names)) != len(names):
+        raise ConfigError(f"scoring.{section} contains duplicate names")
+    return tuple(outcomes)
+
+
+def _parse_scoring(raw: Any) -> ScoringRules:
+    if not raw:
+        return DEFAULT_SCORING
+    if not isinstance(raw, dict):
+        raise ConfigError("scoring must be a mapping")
+    signals = DEFAULT_SCORING.signals
+    if "signals" in raw:
+        if not isinstance(raw["signals"], list):
+            raise ConfigError("scoring.signals must be a list")
+        signals = tuple(_parse_signal(entry) for entry in raw["signals"])
+        names = [signal.name for signal in signals]
+        if len(set(names)) != len(names):
+            raise ConfigError("scoring.signals contains duplicate names")
+    return ScoringRules(
+        signals=signals,
+        regimes=_parse_outcomes(raw["regimes"], "regimes") if "regimes" in raw else DEFAULT_SCORING.regimes,
+        actions=_parse_outcomes(raw["actions"], "actions") if "actions" in raw else DEFAULT_SCORING.actions,
+        base_score=int(raw.get("base_score", DEFAULT_SCORING.base_score)),
+        min_score=int(raw.get("min_score", DEFAULT_SCORING.min_score)),
+        max_score=int(raw.get("max_score", DEFAULT_SCORING.max_score)),
+    )
+
+
+def _parse_symbol_entry(raw: Any, thresholds: Thresholds) -> Symbols:
+    if isinstance(raw, str):
+        return Symbols(futures=raw, spot=raw)
+    if not isinstance(raw, dict):
+        raise ConfigError(f"Invalid symbols entry: {raw!r}")
+    overrides = raw.get("thresholds")
+    return Symbols(
+        futures=str(raw.get("futures", "BTCUSDT")),
+        spot=str(raw.get("spot", raw.get("futures", "BTCUSDT"))),
+        thresholds=thresholds.replace_from(overrides) if overrides else None,
+    )
+
+
+def _parse_watchlist(raw: Any, thresholds: Thresholds) -> tuple[Symbols, ...]:
+    entries = raw if isinstance(raw, list) else [raw]
+    watchlist = tuple(_parse_symbol_entry(entry, thresholds) for entry in entries)
+    if not watchlist:
+        raise ConfigError("symbols must list at least one symbol")
+    futures = [entry.futures for entry in watchlist]
+    if len(set(futures)) != len(futures):
+        raise ConfigError("symbols contains duplicate futures symbols")
+    return watchlist
+
+
+def _build_config(raw: dict[str, Any]) -> AppConfig:
+    """Compile parsed YAML into an AppConfig; secrets are filled in by load_config."""
+
+    thresholds_raw = raw.get("thresholds", {})
+    symbols_raw = raw.get("symbols") or {}
+    http_raw = raw.get("http", {})
+    metrics_raw = raw.get("metrics") or {}
+    cache_raw = raw.get("cache") or {}
+    stream_raw = raw.get("stream") or {}
+    notify_raw = raw.get("notify") or {}
+    state_backend = str(raw.get("state_backend", "json")).strip().lower()
+    if state_backend not in {"json", "sqlite"}:
+        raise ConfigError(f"Unknown state backend: {state_backend}")
+
+    thresholds = DEFAULT_THRESHOLDS.replace_from(thresholds_raw)
+    watchlist = _parse_watchlist(symbols_raw, thresholds)
     http = HttpConfig(
         timeout_seconds=int(http_raw.get("timeout_seconds", 12)),
         max_retries=int(http_raw.get("max_retries", 3)),
         backoff_seconds=float(http_raw.get("backoff_seconds", 1.0)),
+        pool_connections=int(http_raw.get("pool_connections", 10)),
+        pool_maxsize=int(http_raw.get("pool_maxsize", 10)),
+        keep_alive=_to_bool(http_raw.get("keep_alive", True), default=True),
+        breaker_failure_threshold=int(http_raw.get("breaker_failure_threshold", 5)),
+        breaker_reset_seconds=float(http_raw.get("breaker_reset_seconds", 60.0)),
+        retry_budget=int(http_raw.get("retry_budget", 6)),
+        retry_budget_seconds=float(http_raw.get("retry_budget_seconds", 10.0)),
+        rate_limit_safety=float(http_raw.get("rate_limit_safety", 0.8)),
+        rate_limit_max_wait_seconds=float(http_raw.get("rate_limit_max_wait_seconds", 10.0)),
     )
 
     return AppConfig(
@@ -102,11 +513,213 @@ def load_config(path: str = "config.yaml", env_path: str = ".env") -> AppConfig:
         alert_cooldown_hours=int(raw.get("alert_cooldown_hours", 6)),
         state_file=str(raw.get("state_file", ".riskline_state.json")),
         thresholds=thresholds,
-        symbols=symbols,
+        symbols=watchlist[0],
         http=http,
-        cmc_api_key=_required_env("CMC_API_KEY"),
-        telegram_bot_token=_required_env("TELEGRAM_BOT_TOKEN"),
-        telegram_chat_id=_required_env("TELEGRAM_CHAT_ID"),
-        dry_run=_to_bool(os.getenv("RISKLINE_DRY_RUN"), default=False),
+        cmc_api_key="",
+        telegram_bot_token="",
+        telegram_chat_id="",
+        dry_run=False,
         enable_liquidations_proxy=_to_bool(raw.get("enable_liquidations_proxy", False), default=False),
+        fetch_deadline_seconds=float(raw.get("fetch_deadline_seconds", 30.0)),
+        kline_cache_file=str(raw.get("kline_cache_file", ".riskline_klines.json")),
+        watchlist=watchlist,
+        metrics=MetricsConfig(
+            textfile=str(metrics_raw.get("textfile") or ""),
+            port=int(metrics_raw.get("port", 0)),
+            host=str(metrics_raw.get("host", "127.0.0.1")),
+        ),
+        cache=_parse_cache(cache_raw),
+        stream=StreamConfig(
+            enabled=_to_bool(stream_raw.get("enabled", False), default=False),
+            url=str(stream_raw.get("url") or ""),
+            liquidation_window_seconds=float(stream_raw.get("liquidation_window_seconds", 300.0)),
+            max_age_seconds=float(stream_raw.get("max_age_seconds", 15.0)),
+        ),
+        state_backend=state_backend,
+        state_lock_timeout_seconds=float(raw.get("state_lock_timeout_seconds", 60.0)),
+        history_dir=str(raw.get("history_dir") or ""),
+        lake_dir=str(raw.get("lake_dir") or ""),
+        config_reload_seconds=float(raw.get("config_reload_seconds", 5.0)),
+        scoring=_parse_scoring(raw.get("scoring")),
+        notify=NotifyConfig(
+            spool_file=str(notify_raw.get("spool_file") or ""),
+            workers=int(notify_raw.get("workers", 2)),
+            max_attempts=int(notify_raw.get("max_attempts", 5)),
+            backoff_seconds=float(notify_raw.get("backoff_seconds", 2.0)),
+            merge_alerts=_to_bool(notify_raw.get("merge_alerts", False), default=False),
+            flush_timeout_seconds=float(notify_raw.get("flush_timeout_seconds", 30.0)),
+            channels=_parse_channels(notify_raw.get("channels")),
+        ),
+    )
+
+
+@dataclass(frozen=True)
+class _Compiled:
+    """A validated AppConfig (without secrets) and the parsed YAML it was built from."""
+
+    stats: tuple[Any, ...] | None
+    digest: str
+    raw: dict[str, Any]
+    config: AppConfig
+
+
+# Any change to this module invalidates compiled configs built by older code.
+_CODE_VERSION = Path(__file__).stat().st_mtime_ns
+_RACY_NS = 2_000_000_000
+
+_compiled: dict[str, _Compiled] = {}
+_env_cache: dict[str, tuple[tuple[int, int], dict[str, str]]] = {}
+# Environment values that load_config took from .env, so a reload can tell
+# them apart from the real environment and replace them when .env changes.
+_env_applied: dict[str, str] = {}
+_compiled_lock = threading.Lock()
+
+
+def _snapshot_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.snapshot")
+
+
+def _stat(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _settled(stat: tuple[int, int] | None) -> bool:
+    # A file written within the mtime granularity could change again without
+    # its stat changing, so such a stat is not trusted as a cache key.
+    return stat is None or time.time_ns() - stat[0] >= _RACY_NS
+
+
+def _read_snapshot(snapshot: Path) -> tuple[tuple[Any, ...] | None, str, dict[str, Any]] | None:
+    """``(stats, digest, raw)`` from a JSON snapshot; it holds data only, never code or secrets."""
+    try:
+        data = json.loads(snapshot.read_bytes())
+        stats = data["stats"]
+        stored = (
+            (stats[0], tuple(stats[1])) if stats is not None else None,
+            str(data["digest"]),
+            data["raw"],
+        )
+    except (OSError, ValueError, TypeError, KeyError, IndexError):
+        return None
+    return stored if isinstance(stored[2], dict) else None
+
+
+def _compile(path: Path) -> _Compiled:
+    """Return the compiled config, re-parsing only when config.yaml's content changed.
+
+    An unchanged mtime and size is trusted without reading the file; a changed
+    stat falls back to comparing content hashes, so a touch or a save without
+    edits does not trigger a rebuild.
+    """
+    cache_key = str(path)
+    snapshot = _snapshot_path(path)
+    stats = (_CODE_VERSION, _stat(path))
+    with _compiled_lock:
+        cached = _compiled.get(cache_key)
+    if cached is not None and cached.stats == stats:
+        return cached
+    stored = _read_snapshot(snapshot)
+    if stored is not None and stored[0] == stats:
+        compiled = _Compiled(stats=stats, digest=stored[1], raw=stored[2], config=_build_config(stored[2]))
+        with _compiled_lock:
+            _compiled[cache_key] = compiled
+        return compiled
+
+    config_source = path.read_bytes()
+    # Re-stat after reading so a write racing the read is picked up next time.
+    stat = _stat(path)
+    stats = (_CODE_VERSION, stat) if _settled(stat) else None
+    digest = hashlib.sha256(f"{_CODE_VERSION}:".encode() + config_source).hexdigest()
+    if cached is not None and cached.digest == digest:
+        compiled = replace(cached, stats=stats)
+    elif stored is not None and stored[1] == digest:
+        compiled = _Compiled(stats=stats, digest=digest, raw=stored[2], config=_build_config(stored[2]))
+    else:
+        import yaml
+
+        try:
+            raw = yaml.safe_load(config_source) or {}
+        except yaml.YAMLError as exc:
+            raise ConfigError(f"Invalid YAML in {path}: {exc}") from exc
+        compiled = _Compiled(stats=stats, digest=digest, raw=raw, config=_build_config(raw))
+    try:
+        payload = json.dumps({"stats": compiled.stats, "digest": compiled.digest, "raw": compiled.raw})
+    except (TypeError, ValueError):
+        # YAML values without a JSON form (e.g. dates) are simply not snapshotted.
+        payload = None
+    if payload is not None:
+        _write_snapshot(snapshot, payload)
+    with _compiled_lock:
+        _compiled[cache_key] = compiled
+    return compiled
+
+
+def _write_snapshot(target: Path, text: str) -> None:
+    # The snapshot is only a cache; failing to write it is not an error.
+    try:
+        atomic_write_text(str(target), text)
+    except OSError:
+        pass
+
+
+def _read_env_file(env_path: Path) -> dict[str, str]:
+    """Values from ``.env``; cached in memory only, so secrets never land in a snapshot."""
+    stat = _stat(env_path)
+    if stat is None:
+        return {}
+    key = str(env_path)
+    with _compiled_lock:
+        cached = _env_cache.get(key)
+    if cached is not None and cached[0] == stat:
+        return cached[1]
+    from dotenv import dotenv_values
+
+    values = {name: value for name, value in dotenv_values(env_path).items() if value is not None}
+    if _settled(stat):
+        with _compiled_lock:
+            _env_cache[key] = (stat, values)
+    return values
+
+
+def clear_config_cache() -> None:
+    """Forget the in-process cache, as in a fresh process; the snapshot file is kept."""
+    with _compiled_lock:
+        _compiled.clear()
+        _env_cache.clear()
+
+
+def _apply_env_file(values: dict[str, str]) -> None:
+    """Mirror ``.env`` into ``os.environ``; values the real environment set always win."""
+    with _compiled_lock:
+        for name in set(_env_applied) - set(values):
+            if os.environ.get(name) == _env_applied.pop(name):
+                del os.environ[name]
+        for name, value in values.items():
+            current = os.environ.get(name)
+            if current is None or current == _env_applied.get(name):
+                os.environ[name] = value
+                _env_applied[name] = value
+
+
+def load_config(
+    path: str = "config.yaml",
+    env_path: str = ".env",
+    *,
+    require_secrets: bool = True,
+) -> AppConfig:
+    # The parsed YAML is cached in memory and in a JSON snapshot next to it, so
+    # yaml is only imported when config.yaml changed. Secrets are always read
+    # from the environment and .env.
+    compiled = _compile(Path(path))
+    _apply_env_file(_read_env_file(Path(env_path)))
+    return replace(
+        compiled.config,
+        cmc_api_key=_required_env("CMC_API_KEY", require_secrets),
+        telegram_bot_token=_required_env("TELEGRAM_BOT_TOKEN", require_secrets),
+        telegram_chat_id=_required_env("TELEGRAM_CHAT_ID", require_secrets),
+        dry_run=_to_bool(os.getenv("RISKLINE_DRY_RUN"), default=False),
     )
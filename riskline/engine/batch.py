@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+from riskline.config import DEFAULT_SCORING, ScoringRules, Thresholds
+from riskline.engine.plan import ScoringPlan, compile_plan
+from riskline.engine.score import ScoreResult
+from riskline.indicators.series import np, resolve_backend
+
+
+@dataclass(frozen=True)
+class BatchScores:
+    """Column results of ``score_batch``; regimes, actions and diagnostics are integer codes.
+
+    Regime and action codes index ``plan.regime_names`` / ``plan.action_names``;
+    ``diagnostics[name]`` codes index that signal's ``plan.labels`` entry.
+    Columns are numpy arrays with the numpy backend and lists with the python one.
+    """
+
+    plan: ScoringPlan
+    score: Any
+    regime: Any
+    action: Any
+    diagnostics: dict[str, Any]
+
+    def __len__(self) -> int:
+        return len(self.score)
+
+    def regime_labels(self) -> list[str]:
+        return [self.plan.regime_names[code] for code in self.regime]
+
+    def action_labels(self) -> list[str]:
+        return [self.plan.action_names[code] for code in self.action]
+
+    def diagnostics_at(self, index: int) -> dict[str, str]:
+        return self.plan.diagnostics([codes[index] for codes in self.diagnostics.values()])
+
+    def result(self, index: int) -> ScoreResult:
+        """The ScoreResult compute_score would return for row ``index``."""
+        return ScoreResult(
+            score=int(self.score[index]),
+            regime=self.plan.regime_names[self.regime[index]],
+            diagnostics=self.diagnostics_at(index),
+        )
+
+
+def score_batch(
+    *,
+    fear_greed: Sequence[float | None],
+    trend_pct: Sequence[float | None],
+    funding: Sequence[float | None],
+    oi_delta: Sequence[float | None],
+    volatility: Sequence[float | None],
+    thresholds: Thresholds,
+    rules: ScoringRules = DEFAULT_SCORING,
+    backend: str = "auto",
+) -> BatchScores:
+    """Score every row of the input columns, matching ``compute_score`` row by row.
+
+    Missing values may be ``None`` or NaN; both mean "no data".
+    """
+    columns = (fear_greed, trend_pct, funding, oi_delta, volatility)
+    if len({len(column) for column in columns}) > 1:
+        raise ValueError("score_batch input columns must all have the same length")
+    plan = compile_plan(rules, thresholds)
+    if resolve_backend(backend) == "numpy":
+        return _score_numpy(plan, columns)
+    return _score_python(plan, columns)
+
+
+def _score_python(plan: ScoringPlan, columns: tuple[Sequence[float | None], ...]) -> BatchScores:
+    codes: list[list[int]] = [[] for _ in plan.signal_names]
+    scores: list[int] = []
+    regimes: list[int] = []
+    actions: list[int] = []
+    for values in zip(*columns):
+        row = plan.codes(values)
+        for column, code in zip(codes, row):
+            column.append(code)
+        score = plan.total(row)
+        scores.append(score)
+        regimes.append(plan.regime(score, values))
+        actions.append(plan.action(score))
+    return BatchScores(
+        plan=plan,
+        score=scores,
+        regime=regimes,
+        action=actions,
+        diagnostics=dict(zip(plan.signal_names, codes)),
+    )
+
+
+def _gate_codes(gates: tuple, score: Any, values: list[Any]) -> Any:
+    # Walk the gates last to first so the earliest matching gate wins.
+    codes = np.full(score.shape, len(gates) - 1, dtype=np.int16)
+    for code in range(len(gates) - 1, -1, -1):
+        low, high, checks = gates[code]
+        mask = (score >= low) & (score <= high)
+        for index, compare, threshold in checks:
+            mask &= compare(values[index], threshold)  # NaN never matches
+        codes[mask] = code
+    return codes
+
+
+def _score_numpy(plan: ScoringPlan, columns: tuple[Sequence[float | None], ...]) -> BatchScores:
+    values = [np.asarray(column, dtype=np.float64) for column in columns]
+    size = values[0].shape[0]
+    codes = [np.full(size, default, dtype=np.int16) for default in plan.default_codes]
+    # Apply each signal's steps last to first so its first matching rule wins.
+    for signal, index, compare, threshold, code in reversed(plan.steps):
+        codes[signal][compare(values[index], threshold)] = code
+    for signal, index in enumerate(plan.signal_inputs):
+        codes[signal][np.isnan(values[index])] = plan.missing_codes[signal]
+
+    score = np.full(size, plan.base_score, dtype=np.int64)
+    for weights, column in zip(plan.weights, codes):
+        score += np.asarray(weights, dtype=np.int64)[column]
+    np.clip(score, plan.min_score, plan.max_score, out=score)
+    return BatchScores(
+        plan=plan,
+        score=score,
+        regime=_gate_codes(plan.regime_gates, score, values),
+        action=_gate_codes(plan.action_gates, score, values),
+        diagnostics=dict(zip(plan.signal_names, codes)),
+    )
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from riskline.config import DEFAULT_SCORING, DEFAULT_THRESHOLDS, ScoringRules
+from riskline.engine.plan import ScoringPlan, compile_plan
+
 
 @dataclass(frozen=True)
 class Decision:
@@ -9,9 +12,10 @@ class Decision:
     guidance: str
 
 
-def decide_action(score: int) -> Decision:
-    if score <= 35:
-        return Decision(action="BUY", guidance="DCA-BUY (3 tranches) / Reduce leverage")
-    if score >= 70:
-        return Decision(action="REDUCE", guidance="Take profits / Reduce leverage")
-    return Decision(action="HOLD", guidance="Hold spot / Avoid overtrading")
+def decide_action(score: int, rules: ScoringRules = DEFAULT_SCORING, *, plan: ScoringPlan | None = None) -> Decision:
+    """Action for ``score``, from ``plan`` when given or else the compiled ``rules``."""
+    if plan is None:
+        # Action gates never compare inputs, so the thresholds do not affect them.
+        plan = compile_plan(rules, DEFAULT_THRESHOLDS)
+    index = plan.action(score)
+    return Decision(action=plan.action_names[index], guidance=plan.action_guidance[index])
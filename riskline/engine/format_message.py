@@ -1,51 +1,60 @@
 from __future__ import annotations
 
+from typing import Sequence
+
 from riskline.engine.decision import Decision
 from riskline.engine.score import ScoreResult
 
 
-def _funding_label(funding_rate: float) -> str:
-    if funding_rate <= -0.0001:
-        return "Short crowded"
-    if funding_rate >= 0.0001:
-        return "Long crowded"
-    return "Balanced"
+def _signal_label(score: ScoreResult, signal: str, value: float | None) -> str:
+    # The scorer already classified the input against the symbol's thresholds
+    # and the configured rules; reuse its outcome rather than re-deriving it.
+    if value is None:
+        return "n/a"
+    return score.diagnostics.get(signal, "n/a")
 
 
-def _oi_label(oi_delta_pct: float | None) -> str:
-    if oi_delta_pct is None:
-        return "n/a"
-    if oi_delta_pct <= -2:
-        return "Deleveraging"
-    if oi_delta_pct >= 2:
-        return "Leverage build-up"
-    return "Stable"
+def asset_label(symbol: str) -> str:
+    for quote in ("USDT", "USDC", "FDUSD", "BUSD"):
+        if symbol.endswith(quote) and len(symbol) > len(quote):
+            return symbol[: -len(quote)]
+    return symbol
 
 
 def format_alert(
     *,
-    fear_greed_value: int,
+    fear_greed_value: int | None,
     fear_greed_label: str,
-    btc_price: float,
+    btc_price: float | None,
     trend_pct_vs_200d: float | None,
-    funding_rate: float,
+    funding_rate: float | None,
     oi_delta_pct: float | None,
     liquidations_proxy: str | None,
     score: ScoreResult,
     decision: Decision,
     send_reason: str,
+    asset: str = "BTC",
+    missing_inputs: Sequence[str] = (),
 ) -> str:
     trend_text = "n/a" if trend_pct_vs_200d is None else f"{trend_pct_vs_200d:+.2f}%"
     liq_text = liquidations_proxy or "n/a"
+    fear_greed_text = "n/a" if fear_greed_value is None else str(fear_greed_value)
+    price_text = "n/a" if btc_price is None else f"{btc_price:,.2f}"
+    funding_text = "n/a" if funding_rate is None else f"{funding_rate * 100:.4f}%/8h"
+    oi_text = "n/a" if oi_delta_pct is None else f"{oi_delta_pct:+.2f}%"
 
     lines = [
         "RISKLINE ALERT",
         f"Reason: {send_reason}",
+    ]
+    if missing_inputs:
+        lines.append(f"Partial inputs: no {', '.join(missing_inputs)}; regime not confirmed")
+    lines += [
         f"Regime: {score.regime} | Score: {score.score}",
-        f"F&G: {fear_greed_value} ({fear_greed_label})",
-        f"BTC: {btc_price:,.2f} | vs 200D: {trend_text}",
-        f"Funding: {funding_rate * 100:.4f}%/8h ({_funding_label(funding_rate)})",
-        f"OI 24h proxy: {('n/a' if oi_delta_pct is None else f'{oi_delta_pct:+.2f}%')} ({_oi_label(oi_delta_pct)})",
+        f"F&G: {fear_greed_text} ({fear_greed_label})",
+        f"{asset}: {price_text} | vs 200D: {trend_text}",
+        f"Funding: {funding_text} ({_signal_label(score, 'funding', funding_rate)})",
+        f"OI 24h proxy: {oi_text} ({_signal_label(score, 'oi', oi_delta_pct)})",
         f"Liq proxy: {liq_text}",
         f"Action: {decision.guidance}",
     ]
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from riskline.config import DEFAULT_SCORING, ScoringRules, Thresholds
+from riskline.engine.plan import compile_plan
+from riskline.engine.score import ScoreResult, score_with_plan
+
+
+Bands = tuple[int, ...]
+
+
+def input_bands(
+    *,
+    fear_greed_value: int | None,
+    trend_pct_vs_200d: float | None,
+    funding_rate: float | None,
+    oi_delta_pct: float | None,
+    volatility_pct: float | None,
+    thresholds: Thresholds,
+    rules: ScoringRules = DEFAULT_SCORING,
+) -> Bands:
+    # The result only depends on each signal's outcome and on the regime
+    # comparisons, so equal bands always produce an identical ScoreResult.
+    return compile_plan(rules, thresholds).bands(
+        (fear_greed_value, trend_pct_vs_200d, funding_rate, oi_delta_pct, volatility_pct)
+    )
+
+
+class IncrementalScorer:
+    """Re-scores only when an input moves into a different threshold band."""
+
+    def __init__(self, thresholds: Thresholds, rules: ScoringRules = DEFAULT_SCORING) -> None:
+        self.thresholds = thresholds
+        self.rules = rules
+        self.plan = compile_plan(rules, thresholds)
+        self.bands: Bands | None = None
+        self.result: ScoreResult | None = None
+        self.rescored = 0
+        self.skipped = 0
+
+    def score(
+        self,
+        *,
+        fear_greed_value: int | None,
+        trend_pct_vs_200d: float | None,
+        funding_rate: float | None,
+        oi_delta_pct: float | None,
+        volatility_pct: float | None,
+        force: bool = False,
+    ) -> ScoreResult | None:
+        values = (fear_greed_value, trend_pct_vs_200d, funding_rate, oi_delta_pct, volatility_pct)
+        bands = self.plan.bands(values)
+        if bands == self.bands and self.result is not None:
+            self.skipped += 1
+            return self.result if force else None
+        self.bands = bands
+        self.result = score_with_plan(self.plan, values)
+        self.rescored += 1
+        return self.result
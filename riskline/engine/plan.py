@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import operator
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Sequence
+
+from riskline.config import SCORING_INPUTS, Comparison, Outcome, ScoringRules, Thresholds
+
+OPERATORS: dict[str, Callable[[Any, Any], Any]] = {
+    "<=": operator.le,
+    "<": operator.lt,
+    ">=": operator.ge,
+    ">": operator.gt,
+    "==": operator.eq,
+}
+
+# (input index, operator, threshold)
+Check = tuple[int, Callable[[Any, Any], Any], float]
+# (signal index, input index, operator, threshold, outcome code)
+Step = tuple[int, int, Callable[[Any, Any], Any], float, int]
+# (min score, max score, checks)
+Gate = tuple[float, float, tuple[Check, ...]]
+
+
+def is_missing(value: float | None) -> bool:
+    return value is None or value != value
+
+
+@dataclass(frozen=True)
+class ScoringPlan:
+    """ScoringRules with thresholds resolved, flattened for evaluation.
+
+    Each signal's outcomes are numbered: the missing outcome first (when the
+    signal has one), then its rules in order, then the default. ``labels`` and
+    ``weights`` are indexed by signal, then outcome code.
+    """
+
+    signal_names: tuple[str, ...]
+    signal_inputs: tuple[int, ...]
+    labels: tuple[tuple[str, ...], ...]
+    weights: tuple[tuple[int, ...], ...]
+    missing_codes: tuple[int, ...]
+    default_codes: tuple[int, ...]
+    steps: tuple[Step, ...]
+    base_score: int
+    min_score: int
+    max_score: int
+    regime_names: tuple[str, ...]
+    regime_gates: tuple[Gate, ...]
+    action_names: tuple[str, ...]
+    action_guidance: tuple[str, ...]
+    action_gates: tuple[Gate, ...]
+    # Every input comparison a regime depends on, for band tracking.
+    regime_checks: tuple[Check, ...]
+    # Inputs of signals with a missing outcome: a gap there is a failed fetch,
+    # not short history, and the regime it gives is not confirmed.
+    required_inputs: tuple[int, ...]
+    # ``steps`` regrouped per signal for the scalar path:
+    # (input index, missing code, default code, ((operator, threshold, code), ...)).
+    by_signal: tuple[tuple[int, int, int, tuple[tuple[Callable[[Any, Any], Any], float, int], ...]], ...]
+
+    def codes(self, values: Sequence[float | None]) -> list[int]:
+        """Outcome code per signal for one row of ``SCORING_INPUTS`` values."""
+        codes = []
+        for index, missing_code, default_code, rules in self.by_signal:
+            value = values[index]
+            if value is None or value != value:
+                codes.append(missing_code)
+                continue
+            for compare, threshold, code in rules:
+                if compare(value, threshold):
+                    codes.append(code)
+                    break
+            else:
+                codes.append(default_code)
+        return codes
+
+    def total(self, codes: Sequence[int]) -> int:
+        score = self.base_score
+        for weights, code in zip(self.weights, codes):
+            score += weights[code]
+        return max(self.min_score, min(self.max_score, score))
+
+    def regime(self, score: int, values: Sequence[float | None]) -> int:
+        return _first_gate(self.regime_gates, score, values)
+
+    def action(self, score: int) -> int:
+        return _first_gate(self.action_gates, score, ())
+
+    def bands(self, values: Sequence[float | None]) -> tuple[int, ...]:
+        """Everything the result depends on: equal bands always give an equal result."""
+        flags = tuple(int(_check(check, values)) for check in self.regime_checks)
+        return (*self.codes(values), *flags)
+
+    def missing(self, values: Sequence[float | None]) -> tuple[str, ...]:
+        """Names of ``required_inputs`` that have no value in ``values``."""
+        return tuple(SCORING_INPUTS[index] for index in self.required_inputs if is_missing(values[index]))
+
+    def diagnostics(self, codes: Sequence[int]) -> dict[str, str]:
+        return {name: labels[code] for name, labels, code in zip(self.signal_names, self.labels, codes)}
+
+
+def _check(check: Check, values: Sequence[float | None]) -> bool:
+    index, compare, threshold = check
+    value = values[index]
+    return not is_missing(value) and bool(compare(value, threshold))
+
+
+def _first_gate(gates: tuple[Gate, ...], score: int, values: Sequence[float | None]) -> int:
+    for index, (low, high, checks) in enumerate(gates):
+        if not low <= score <= high:
+            continue
+        for check in checks:
+            if not _check(check, values):
+                break
+        else:
+            return index
+    return len(gates) - 1  # the last gate is unconditional
+
+
+def _resolve(threshold: str | float, thresholds: Thresholds) -> float:
+    return getattr(thresholds, threshold) if isinstance(threshold, str) else threshold
+
+
+def _compile_check(comparison: Comparison, thresholds: Thresholds) -> Check:
+    return (
+        SCORING_INPUTS.index(comparison.input),
+        OPERATORS[comparison.op],
+        _resolve(comparison.threshold, thresholds),
+    )
+
+
+def _compile_gates(outcomes: tuple[Outcome, ...], thresholds: Thresholds) -> tuple[Gate, ...]:
+    return tuple(
+        (
+            float("-inf") if outcome.min_score is None else outcome.min_score,
+            float("inf") if outcome.max_score is None else outcome.max_score,
+            tuple(_compile_check(comparison, thresholds) for comparison in outcome.when),
+        )
+        for outcome in outcomes
+    )
+
+
+_plans: dict[tuple[int, int], tuple[ScoringRules, Thresholds, ScoringPlan]] = {}
+
+
+def compile_plan(rules: ScoringRules, thresholds: Thresholds) -> ScoringPlan:
+    """Compiled plan for ``rules`` and ``thresholds``, cached.
+
+    Callers normally pass the same config objects every time, so the cache is
+    looked up by identity first; hashing the whole rule set is the slow path.
+    """
+    key = (id(rules), id(thresholds))
+    cached = _plans.get(key)
+    if cached is not None and cached[0] is rules and cached[1] is thresholds:
+        return cached[2]
+    plan = _compile_plan(rules, thresholds)
+    if len(_plans) >= 256:
+        _plans.clear()
+    # Holding the objects keeps their ids from being reused while cached.
+    _plans[key] = (rules, thresholds, plan)
+    return plan
+
+
+@lru_cache(maxsize=64)
+def _compile_plan(rules: ScoringRules, thresholds: Thresholds) -> ScoringPlan:
+    labels, weights, missing_codes, default_codes, steps = [], [], [], [], []
+    for signal_index, signal in enumerate(rules.signals):
+        signal_labels: list[str] = []
+        signal_weights: list[int] = []
+        if signal.missing_label:
+            signal_labels.append(signal.missing_label)
+            signal_weights.append(signal.missing_weight)
+        for rule in signal.rules:
+            steps.append(
+                (
+                    signal_index,
+                    SCORING_INPUTS.index(signal.input),
+                    OPERATORS[rule.op],
+                    _resolve(rule.threshold, thresholds),
+                    len(signal_labels),
+                )
+            )
+            signal_labels.append(rule.label)
+            signal_weights.append(rule.weight)
+        default_codes.append(len(signal_labels))
+        signal_labels.append(signal.default_label)
+        signal_weights.append(signal.default_weight)
+        missing_codes.append(0 if signal.missing_label else default_codes[-1])
+        labels.append(tuple(signal_labels))
+        weights.append(tuple(signal_weights))
+
+    regime_gates = _compile_gates(rules.regimes, thresholds)
+    return ScoringPlan(
+        signal_names=tuple(signal.name for signal in rules.signals),
+        signal_inputs=tuple(SCORING_INPUTS.index(signal.input) for signal in rules.signals),
+        labels=tuple(labels),
+        weights=tuple(weights),
+        missing_codes=tuple(missing_codes),
+        default_codes=tuple(default_codes),
+        steps=tuple(steps),
+        base_score=rules.base_score,
+        min_score=rules.min_score,
+        max_score=rules.max_score,
+        regime_names=tuple(outcome.name for outcome in rules.regimes),
+        regime_gates=regime_gates,
+        action_names=tuple(outcome.name for outcome in rules.actions),
+        action_guidance=tuple(outcome.guidance for outcome in rules.actions),
+        action_gates=_compile_gates(rules.actions, thresholds),
+        regime_checks=tuple(dict.fromkeys(check for _, _, checks in regime_gates for check in checks)),
+        required_inputs=tuple(
+            sorted({SCORING_INPUTS.index(signal.input) for signal in rules.signals if signal.missing_label})
+        ),
+        by_signal=tuple(
+            (
+                SCORING_INPUTS.index(signal.input),
+                missing_codes[signal_index],
+                default_codes[signal_index],
+                tuple((compare, threshold, code) for owner, _, compare, threshold, code in steps if owner == signal_index),
+            )
+            for signal_index, signal in enumerate(rules.signals)
+        ),
+    )
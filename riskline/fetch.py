@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+
+# Default thread cap; callers normally pass the HTTP pool size instead.
+DEFAULT_MAX_WORKERS = 10
+
+
+class FetchError(RuntimeError):
+    """Raised when no source delivered data before the tick deadline."""
+
+
+@dataclass
+class FetchResult:
+    values: dict[str, Any] = field(default_factory=dict)
+    errors: dict[str, BaseException] = field(default_factory=dict)
+    timed_out: list[str] = field(default_factory=list)
+
+
+def fetch_concurrently(
+    tasks: dict[str, Callable[[], Any]],
+    *,
+    deadline_seconds: float,
+    max_workers: int | None = None,
+) -> FetchResult:
+    """Run ``tasks`` on at most ``max_workers`` threads; a watchlist's tasks queue for a free one."""
+    result = FetchResult()
+    if not tasks:
+        return result
+
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(len(tasks), max_workers or DEFAULT_MAX_WORKERS)),
+        thread_name_prefix="riskline-fetch",
+    )
+    futures = {executor.submit(task): name for name, task in tasks.items()}
+    try:
+        done, pending = wait(futures, timeout=max(0.0, deadline_seconds))
+    finally:
+        # Late calls are abandoned; they are still bounded by the HTTP timeout.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    for future in done:
+        name = futures[future]
+        error = future.exception()
+        if error is not None:
+            result.errors[name] = error
+        else:
+            result.values[name] = future.result()
+    for future in pending:
+        result.timed_out.append(futures[future])
+    result.timed_out.sort()
+    return result
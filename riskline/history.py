@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from riskline.engine.score import REGIMES
+from riskline.state import atomic_write_text, compute_oi_delta_pct
+
+# ts, funding_rate, open_interest, price, trend_pct, volatility_pct, fear_greed,
+# score, regime. Missing floats are NaN and missing ints are -1.
+RECORD = struct.Struct("<qdddddhhB")
+
+# Regime names beyond the built-in ones, shared by every file in a history_dir.
+REGIME_TABLE = "regimes.json"
+
+
+class RegimeCodes:
+    """Regime name <-> record byte code.
+
+    Built-in regimes keep their historical codes; names from a configured
+    ``scoring`` section are appended and persisted to ``path`` so they read back.
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._names = list(REGIMES)
+        self._codes = {name: code for code, name in enumerate(self._names)}
+        self._load()
+
+    def code(self, name: str) -> int:
+        code = self._codes.get(name)
+        if code is not None:
+            return code
+        with self._lock:
+            self._load()
+            if name not in self._codes:
+                if len(self._names) > 255:
+                    raise ValueError(f"Too many regime names to record {name!r}")
+                self._names.append(name)
+                self._codes[name] = len(self._names) - 1
+                self._save()
+            return self._codes[name]
+
+    def name(self, code: int) -> str:
+        if code >= len(self._names):
+            # Another process may have recorded a new regime since we loaded.
+            with self._lock:
+                self._load()
+        return self._names[code] if code < len(self._names) else ""
+
+    def _load(self) -> None:
+        if self.path is None or not os.path.exists(self.path):
+            return
+        with open(self.path) as handle:
+            stored = json.load(handle)
+        for name in stored[len(self._names) :]:
+            self._names.append(str(name))
+            self._codes[str(name)] = len(self._names) - 1
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        # Readable wherever the history file is, since both are needed to decode it.
+        atomic_write_text(self.path, json.dumps(self._names), mode=0o644)
+
+
+_BUILTIN_CODES = RegimeCodes()
+
+
+@dataclass(frozen=True)
+class HistoryRecord:
+    ts: int
+    funding_rate: float | None
+    open_interest: float | None
+    price: float | None
+    trend_pct: float | None
+    volatility_pct: float | None
+    fear_greed: int | None
+    score: int | None
+    regime: str
+
+    def pack(self, codes: RegimeCodes = _BUILTIN_CODES) -> bytes:
+        return RECORD.pack(
+            self.ts,
+            _nan(self.funding_rate),
+            _nan(self.open_interest),
+            _nan(self.price),
+            _nan(self.trend_pct),
+            _nan(self.volatility_pct),
+            -1 if self.fear_greed is None else self.fear_greed,
+            -1 if self.score is None else self.score,
+            codes.code(self.regime),
+        )
+
+    @classmethod
+    def unpack(cls, values: tuple, codes: RegimeCodes = _BUILTIN_CODES) -> HistoryRecord:
+        ts, funding, oi, price, trend, vol, fear_greed, score, regime = values
+        return cls(
+            ts=ts,
+            funding_rate=_none(funding),
+            open_interest=_none(oi),
+            price=_none(price),
+            trend_pct=_none(trend),
+            volatility_pct=_none(vol),
+            fear_greed=None if fear_greed < 0 else fear_greed,
+            score=None if score < 0 else score,
+            regime=codes.name(regime),
+        )
+
+
+def _nan(value: float | None) -> float:
+    return math.nan if value is None else float(value)
+
+
+def _none(value: float) -> float | None:
+    return None if math.isnan(value) else value
+
+
+class HistoryFile:
+    """Append-only file of fixed-size records sorted by timestamp."""
+
+    def __init__(self, path: str, codes: RegimeCodes | None = None) -> None:
+        self.path = path
+        self.codes = codes if codes is not None else RegimeCodes(str(Path(path).with_name(REGIME_TABLE)))
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        try:
+            return os.path.getsize(self.path) // RECORD.size
+        except FileNotFoundError:
+            return 0
+
+    def append(self, record: HistoryRecord) -> None:
+        with self._lock:
+            last = self.last()
+            if last is not None and record.ts < last.ts:
+                raise ValueError(f"History for {self.path} must be appended in time order")
+            with open(self.path, "ab") as handle:
+                handle.write(record.pack(self.codes))
+
+    def last(self) -> HistoryRecord | None:
+        count = len(self)
+        if count == 0:
+            return None
+        with open(self.path, "rb") as handle:
+            handle.seek((count - 1) * RECORD.size)
+            return HistoryRecord.unpack(RECORD.unpack(handle.read(RECORD.size)), self.codes)
+
+    def at_or_before(self, ts: int) -> HistoryRecord | None:
+        with self._mapped() as view:
+            index = _bisect_right(view, ts) - 1
+            if index < 0:
+                return None
+            return HistoryRecord.unpack(RECORD.unpack_from(view, index * RECORD.size), self.codes)
+
+    def range(self, start_ts: int | None = None, end_ts: int | None = None) -> list[HistoryRecord]:
+        """Records with ``start_ts <= ts < end_ts``."""
+        with self._mapped() as view:
+            lo = 0 if start_ts is None else _bisect_left(view, start_ts)
+            hi = len(view) // RECORD.size if end_ts is None else _bisect_left(view, end_ts)
+            if hi <= lo:
+                return []
+            chunk = view[lo * RECORD.size : hi * RECORD.size]
+            try:
+                return [HistoryRecord.unpack(values, self.codes) for values in RECORD.iter_unpack(chunk)]
+            finally:
+                chunk.release()
+
+    def _mapped(self) -> _MappedView:
+        return _MappedView(self.path)
+
+
+class _MappedView:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = None
+        self._map: mmap.mmap | None = None
+        self._view: memoryview | None = None
+
+    def __enter__(self) -> memoryview:
+        size = 0
+        try:
+            self._file = open(self.path, "rb")
+            size = os.fstat(self._file.fileno()).st_size
+        except FileNotFoundError:
+            pass
+        # Ignore a partially written trailing record.
+        size -= size % RECORD.size
+        if size == 0:
+            self._view = memoryview(b"")
+        else:
+            self._map = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._map)
+        return self._view
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self._view is not None:
+            self._view.release()
+        if self._map is not None:
+            self._map.close()
+        if self._file is not None:
+            self._file.close()
+
+
+def _ts_at(view: memoryview, index: int) -> int:
+    return struct.unpack_from("<q", view, index * RECORD.size)[0]
+
+
+def _bisect_left(view: memoryview, ts: int) -> int:
+    lo, hi = 0, len(view) // RECORD.size
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if _ts_at(view, mid) < ts:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _bisect_right(view: memoryview, ts: int) -> int:
+    lo, hi = 0, len(view) // RECORD.size
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if ts < _ts_at(view, mid):
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+class HistoryStore:
+    """One ``<SYMBOL>.bin`` history file per symbol under ``directory``."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        self.codes = RegimeCodes(str(Path(directory) / REGIME_TABLE))
+        self._files: dict[str, HistoryFile] = {}
+
+    def file(self, symbol: str) -> HistoryFile:
+        history = self._files.get(symbol)
+        if history is None:
+            history = HistoryFile(str(Path(self.directory) / f"{symbol.upper()}.bin"), self.codes)
+            self._files[symbol] = history
+        return history
+
+    def append(self, symbol: str, record: HistoryRecord) -> None:
+        self.file(symbol).append(record)
+
+    def at_or_before(self, symbol: str, ts: int) -> HistoryRecord | None:
+        return self.file(symbol).at_or_before(ts)
+
+    def range(self, symbol: str, start_ts: int | None = None, end_ts: int | None = None) -> list[HistoryRecord]:
+        return self.file(symbol).range(start_ts, end_ts)
+
+    def symbols(self) -> list[str]:
+        return sorted(path.stem for path in Path(self.directory).glob("*.bin"))
+
+    def oi_delta_pct(
+        self,
+        symbol: str,
+        open_interest: float | None,
+        *,
+        now_ts: int,
+        lookback_seconds: int = 86400,
+        tolerance_seconds: int = 3600,
+    ) -> float | None:
+        """Change versus the open interest recorded ``lookback_seconds`` ago.
+
+        Returns None when no record lies within ``tolerance_seconds`` before
+        that point, e.g. during the first day of history.
+        """
+        target = now_ts - lookback_seconds
+        record = self.at_or_before(symbol, target)
+        if record is None or record.ts < target - tolerance_seconds:
+            return None
+        return compute_oi_delta_pct(record.open_interest, open_interest)
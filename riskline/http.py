@@ -1,15 +1,222 @@
 from __future__ import annotations
 
+import logging
+import random
+import threading
 import time
-from typing import Any
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from riskline.cache import ResponseCache, create_response_cache
+from riskline.config import CacheConfig, HttpConfig
+from riskline.metrics import (
+    CACHE_LOOKUPS,
+    HTTP_ATTEMPT_SECONDS,
+    HTTP_BACKOFF_SECONDS,
+    HTTP_BUDGET_EXHAUSTED,
+    HTTP_CIRCUIT_REJECTIONS,
+    HTTP_RETRIES,
+    HTTP_THROTTLE_SECONDS,
+)
+from riskline.ratelimit import RateLimitError, WeightLimiter
+
+logger = logging.getLogger("riskline.http")
+
+# Retry-After values above this are treated as "give up now" when no retry
+# budget bounds the wait.
+MAX_RETRY_AFTER_SECONDS = 60.0
 
 
 class HttpRequestError(RuntimeError):
     """Raised when an HTTP call cannot be completed successfully."""
 
 
+class CircuitOpenError(HttpRequestError):
+    """Raised when a host's circuit breaker is open and the call is not attempted."""
+
+
+class CircuitBreaker:
+    """Per-host breaker: closed -> open after repeated failures -> half-open probe."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        reset_timeout_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_owner: int | None = None
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout_seconds:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout_seconds:
+                    return False
+                self._state = self.HALF_OPEN
+            # Half-open lets exactly one probe through at a time.
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            self._probe_owner = threading.get_ident()
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """End this thread's probe without an outcome so a later call may probe again."""
+        with self._lock:
+            if self._probe_in_flight and self._probe_owner == threading.get_ident():
+                self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._probe_in_flight = False
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+
+
+class RetryBudget:
+    """Retries and backoff time shared by every request made during one tick."""
+
+    def __init__(self, *, max_retries: int, max_sleep_seconds: float) -> None:
+        self._lock = threading.Lock()
+        self.retries_left = max_retries
+        self.sleep_left = max_sleep_seconds
+
+    def try_spend(self, sleep_seconds: float) -> bool:
+        with self._lock:
+            if self.retries_left <= 0 or sleep_seconds > self.sleep_left:
+                return False
+            self.retries_left -= 1
+            self.sleep_left -= sleep_seconds
+            return True
+
+
+class HttpSession(requests.Session):
+    """Shared session with per-host keep-alive connection pools, breakers and weight limits."""
+
+    def __init__(
+        self,
+        *,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        keep_alive: bool = True,
+        breaker_failure_threshold: int = 5,
+        breaker_reset_seconds: float = 60.0,
+        retry_budget: int = 6,
+        retry_budget_seconds: float = 10.0,
+        rate_limiter: WeightLimiter | None = None,
+        response_cache: ResponseCache | None = None,
+    ) -> None:
+        super().__init__()
+        # One adapter keeps up to ``pool_connections`` host pools, each holding
+        # ``pool_maxsize`` reusable connections.
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        if not keep_alive:
+            self.headers["Connection"] = "close"
+        self.breaker_failure_threshold = breaker_failure_threshold
+        self.breaker_reset_seconds = breaker_reset_seconds
+        self.retry_budget_size = retry_budget
+        self.retry_budget_seconds = retry_budget_seconds
+        self.retry_budget = self.new_retry_budget()
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+        # Spot and futures share one limiter so their request weight is
+        # accounted against the same per-host buckets.
+        self.rate_limiter = rate_limiter if rate_limiter is not None else WeightLimiter()
+        self.response_cache = response_cache
+
+    def breaker_for(self, host: str) -> CircuitBreaker:
+        with self._breakers_lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    failure_threshold=self.breaker_failure_threshold,
+                    reset_timeout_seconds=self.breaker_reset_seconds,
+                )
+                self._breakers[host] = breaker
+            return breaker
+
+    def new_retry_budget(self) -> RetryBudget:
+        return RetryBudget(max_retries=self.retry_budget_size, max_sleep_seconds=self.retry_budget_seconds)
+
+    def reset_retry_budget(self) -> None:
+        self.retry_budget = self.new_retry_budget()
+
+
+def create_session(http: HttpConfig, cache: CacheConfig | None = None) -> HttpSession:
+    return HttpSession(
+        pool_connections=http.pool_connections,
+        pool_maxsize=http.pool_maxsize,
+        keep_alive=http.keep_alive,
+        breaker_failure_threshold=http.breaker_failure_threshold,
+        breaker_reset_seconds=http.breaker_reset_seconds,
+        retry_budget=http.retry_budget,
+        retry_budget_seconds=http.retry_budget_seconds,
+        rate_limiter=WeightLimiter(
+            safety=http.rate_limit_safety,
+            max_wait_seconds=http.rate_limit_max_wait_seconds,
+        ),
+        response_cache=create_response_cache(cache) if cache is not None else None,
+    )
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def _backoff_delay(backoff_seconds: float, attempt: int, response: requests.Response | None) -> float:
+    if response is not None and response.status_code in (429, 503):
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is not None:
+            return retry_after
+    # Full jitter keeps concurrent callers from retrying in lockstep.
+    return random.uniform(0.0, backoff_seconds * (2**attempt))
+
+
 def get_json(
     url: str,
     *,
@@ -18,32 +225,138 @@ def get_json(
     timeout_seconds: int = 12,
     max_retries: int = 3,
     backoff_seconds: float = 1.0,
+    session: requests.Session | None = None,
+    cache_source: str | None = None,
+) -> Any:
+    cache = session.response_cache if isinstance(session, HttpSession) else None
+    request_kwargs = dict(
+        params=params,
+        headers=headers,
+        timeout_seconds=timeout_seconds,
+        max_retries=max_retries,
+        backoff_seconds=backoff_seconds,
+        session=session,
+    )
+    if cache is None or cache_source is None or cache.ttl_for(cache_source) <= 0:
+        return _request_json(url, **request_kwargs)
+
+    cached = cache.lookup(url, params)
+    if cached is not None and cache.is_fresh(cache_source, cached):
+        CACHE_LOOKUPS.inc(source=cache_source, outcome="hit")
+        return cached.payload
+    try:
+        payload = _request_json(url, **request_kwargs)
+    except HttpRequestError as exc:
+        if cached is None or not cache.is_usable_stale(cached):
+            raise
+        CACHE_LOOKUPS.inc(source=cache_source, outcome="stale")
+        logger.warning("Serving stale %s response after upstream failure: %s", cache_source, exc)
+        return cached.payload
+    CACHE_LOOKUPS.inc(source=cache_source, outcome="miss")
+    cache.store(url, params, payload)
+    return payload
+
+
+def _request_json(
+    url: str,
+    *,
+    params: dict[str, Any] | None,
+    headers: dict[str, str] | None,
+    timeout_seconds: int,
+    max_retries: int,
+    backoff_seconds: float,
+    session: requests.Session | None,
 ) -> Any:
     last_error: Exception | None = None
     attempts = max(1, max_retries + 1)
+    client = session if session is not None else requests
+    host = urlsplit(url).netloc
+    breaker = session.breaker_for(host) if isinstance(session, HttpSession) else None
+    budget = session.retry_budget if isinstance(session, HttpSession) else None
+    limiter = session.rate_limiter if isinstance(session, HttpSession) else None
 
     for attempt in range(attempts):
+        if breaker is not None and not breaker.allow():
+            HTTP_CIRCUIT_REJECTIONS.inc(host=host)
+            raise CircuitOpenError(f"Circuit open for {host}; skipping {url}")
         try:
-            response = requests.get(
-                url,
-                params=params,
-                headers=headers,
-                timeout=timeout_seconds,
-            )
-            should_retry = response.status_code == 429 or response.status_code >= 500
-            if should_retry and attempt < attempts - 1:
-                sleep_seconds = backoff_seconds * (2**attempt)
-                time.sleep(sleep_seconds)
-                continue
-
-            response.raise_for_status()
-            return response.json()
-        except (requests.RequestException, ValueError) as exc:
-            last_error = exc
-            if attempt < attempts - 1:
-                sleep_seconds = backoff_seconds * (2**attempt)
-                time.sleep(sleep_seconds)
-                continue
-            break
+            if limiter is not None:
+                try:
+                    waited = limiter.acquire(url, params)
+                except RateLimitError as exc:
+                    raise HttpRequestError(f"Rate limit for {host}: {exc}") from exc
+                if waited:
+                    HTTP_THROTTLE_SECONDS.inc(waited, host=host)
+
+            started = time.perf_counter()
+            outcome = "error"
+            response: requests.Response | None = None
+            try:
+                response = client.get(
+                    url,
+                    params=params,
+                    headers=headers,
+                    timeout=timeout_seconds,
+                )
+                outcome = f"{response.status_code // 100}xx"
+                if limiter is not None:
+                    limiter.observe(url, response.headers)
+                should_retry = response.status_code == 429 or response.status_code >= 500
+                if should_retry:
+                    _observe_attempt(host, outcome, started)
+                    if breaker is not None:
+                        breaker.record_failure()
+                    last_error = requests.HTTPError(f"{response.status_code} response", response=response)
+                    if attempt < attempts - 1 and _backoff(host, backoff_seconds, attempt, response, budget):
+                        continue
+                    break
+
+                if breaker is not None:
+                    # Anything but 429/5xx proves the host is up, even a 4xx.
+                    breaker.record_success()
+                response.raise_for_status()
+                payload = response.json()
+                _observe_attempt(host, outcome, started)
+                return payload
+            except (requests.RequestException, ValueError) as exc:
+                _observe_attempt(host, outcome if outcome != "2xx" else "invalid", started)
+                last_error = exc
+                if response is None and breaker is not None:
+                    breaker.record_failure()
+                if response is not None and 400 <= response.status_code < 500:
+                    break
+                if attempt < attempts - 1 and _backoff(host, backoff_seconds, attempt, None, budget):
+                    continue
+                break
+        except BaseException:
+            if breaker is not None:
+                # A rate-limit rejection (or any unexpected error) produced no
+                # outcome for the host; free a half-open probe held by this call.
+                breaker.release_probe()
+            raise
 
     raise HttpRequestError(f"HTTP request failed for {url}: {last_error}")
+
+
+def _observe_attempt(host: str, outcome: str, started: float) -> None:
+    HTTP_ATTEMPT_SECONDS.observe(time.perf_counter() - started, host=host, outcome=outcome)
+
+
+def _backoff(
+    host: str,
+    backoff_seconds: float,
+    attempt: int,
+    response: requests.Response | None,
+    budget: RetryBudget | None,
+) -> bool:
+    sleep_seconds = _backoff_delay(backoff_seconds, attempt, response)
+    if budget is not None:
+        if not budget.try_spend(sleep_seconds):
+            HTTP_BUDGET_EXHAUSTED.inc(host=host)
+            return False
+    elif sleep_seconds > MAX_RETRY_AFTER_SECONDS:
+        return False
+    HTTP_RETRIES.inc(host=host)
+    HTTP_BACKOFF_SECONDS.inc(sleep_seconds, host=host)
+    time.sleep(sleep_seconds)
+    return True
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Any
+
+
+def _pct_return(prev_close: float, close: float) -> float | None:
+    if prev_close == 0:
+        return None
+    return ((close - prev_close) / prev_close) * 100.0
+
+
+class RollingIndicators:
+    """Streaming MA and return volatility, updated in O(1) per close.
+
+    Results match ``trend.ma200`` and ``volatility.daily_return_volatility_pct``
+    computed over the same closes, up to float rounding. Running sums are
+    rebuilt once per window length to keep rounding drift bounded, so the cost
+    stays amortised O(1).
+    """
+
+    def __init__(self, *, ma_window: int = 200, vol_lookback: int = 14) -> None:
+        self.ma_window = ma_window
+        self.vol_lookback = vol_lookback
+        self.last_key: int | None = None
+        self._closes: deque[float] = deque(maxlen=max(ma_window, vol_lookback + 1))
+        self._returns: deque[float | None] = deque(maxlen=vol_lookback)
+        self._ma_sum = 0.0
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._updates = 0
+
+    def update(self, key: int, close: float) -> None:
+        if self.last_key is None or key > self.last_key:
+            self.push(close)
+            self.last_key = key
+        elif key == self.last_key:
+            self.replace_last(close)
+
+    def push(self, close: float) -> None:
+        closes = self._closes
+        if len(closes) >= self.ma_window:
+            self._ma_sum -= closes[-self.ma_window]
+        if closes:
+            if len(self._returns) == self.vol_lookback:
+                self._remove_return(self._returns[0])
+            new_return = _pct_return(closes[-1], close)
+            self._returns.append(new_return)
+            self._add_return(new_return)
+        closes.append(close)
+        self._ma_sum += close
+        self._after_update()
+
+    def replace_last(self, close: float) -> None:
+        closes = self._closes
+        if not closes:
+            self.push(close)
+            return
+        self._ma_sum += close - closes[-1]
+        closes[-1] = close
+        if len(closes) >= 2:
+            self._remove_return(self._returns[-1])
+            new_return = _pct_return(closes[-2], close)
+            self._returns[-1] = new_return
+            self._add_return(new_return)
+        self._after_update()
+
+    def ma(self) -> float | None:
+        if len(self._closes) < self.ma_window:
+            return None
+        return self._ma_sum / self.ma_window
+
+    def volatility_pct(self) -> float:
+        if len(self._closes) < 3 or self._count < 2:
+            return 0.0
+        return math.sqrt(max(0.0, self._m2) / self._count)
+
+    @property
+    def last_close(self) -> float | None:
+        return self._closes[-1] if self._closes else None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "ma_window": self.ma_window,
+            "vol_lookback": self.vol_lookback,
+            "last_key": self.last_key,
+            "closes": list(self._closes),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> RollingIndicators:
+        indicators = cls(
+            ma_window=int(data.get("ma_window", 200)),
+            vol_lookback=int(data.get("vol_lookback", 14)),
+        )
+        for close in data.get("closes", []):
+            indicators.push(float(close))
+        last_key = data.get("last_key")
+        indicators.last_key = int(last_key) if last_key is not None else None
+        return indicators
+
+    def _add_return(self, value: float | None) -> None:
+        if value is None:
+            return
+        self._count += 1
+        delta = value - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (value - self._mean)
+
+    def _remove_return(self, value: float | None) -> None:
+        if value is None:
+            return
+        self._count -= 1
+        if self._count == 0:
+            self._mean = 0.0
+            self._m2 = 0.0
+            return
+        delta = value - self._mean
+        self._mean -= delta / self._count
+        self._m2 -= delta * (value - self._mean)
+
+    def _after_update(self) -> None:
+        self._updates += 1
+        if self._updates % self.ma_window == 0:
+            self._resync()
+
+    def _resync(self) -> None:
+        window = list(self._closes)[-self.ma_window :]
+        self._ma_sum = sum(window)
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        for value in self._returns:
+            self._add_return(value)
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+from riskline.indicators.rolling import RollingIndicators
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+
+BACKENDS = ("auto", "python", "numpy")
+
+
+def resolve_backend(backend: str = "auto") -> str:
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown indicator backend {backend!r}; expected one of {BACKENDS}")
+    if backend == "auto":
+        return "numpy" if np is not None else "python"
+    if backend == "numpy" and np is None:
+        raise ValueError("The numpy indicator backend requires numpy to be installed")
+    return backend
+
+
+def rolling_ma(closes: Sequence[float], window: int = 200, *, backend: str = "auto") -> Any:
+    """MA for every prefix of ``closes`` (``ma200`` semantics per element).
+
+    The python backend returns a list with ``None`` where fewer than
+    ``window`` closes exist; the numpy backend returns a float64 array with NaN.
+    """
+    if resolve_backend(backend) == "numpy":
+        return _rolling_ma_numpy(closes, window)
+    indicators = RollingIndicators(ma_window=window)
+    values: list[float | None] = []
+    for close in closes:
+        indicators.push(float(close))
+        values.append(indicators.ma())
+    return values
+
+
+def rolling_volatility_pct(
+    closes: Sequence[float],
+    lookback: int = 14,
+    *,
+    backend: str = "auto",
+) -> Any:
+    """``daily_return_volatility_pct`` for every prefix of ``closes``."""
+    if resolve_backend(backend) == "numpy":
+        return _rolling_volatility_numpy(closes, lookback)
+    indicators = RollingIndicators(ma_window=1, vol_lookback=lookback)
+    values: list[float] = []
+    for close in closes:
+        indicators.push(float(close))
+        values.append(indicators.volatility_pct())
+    return values
+
+
+def _rolling_ma_numpy(closes: Sequence[float], window: int) -> Any:
+    values = np.asarray(closes, dtype=np.float64)
+    out = np.full(values.shape[0], np.nan)
+    if values.shape[0] < window:
+        return out
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    out[window - 1 :] = (cumulative[window:] - cumulative[:-window]) / window
+    return out
+
+
+def _rolling_volatility_numpy(closes: Sequence[float], lookback: int) -> Any:
+    values = np.asarray(closes, dtype=np.float64)
+    size = values.shape[0]
+    out = np.zeros(size)
+    if size < 3:
+        return out
+
+    prev = values[:-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.where(prev != 0, (values[1:] - prev) / prev * 100.0, np.nan)
+
+    # Row k of ``windows`` holds the returns visible at close k + 1, padded with
+    # NaN while fewer than ``lookback`` returns exist.
+    padded = np.concatenate((np.full(lookback - 1, np.nan), returns))
+    windows = np.lib.stride_tricks.sliding_window_view(padded, lookback)
+    valid = ~np.isnan(windows)
+    counts = valid.sum(axis=1)
+    safe_counts = np.maximum(counts, 1)
+    means = np.where(valid, windows, 0.0).sum(axis=1) / safe_counts
+    deviations = np.where(valid, windows - means[:, None], 0.0)
+    stdev = np.sqrt((deviations**2).sum(axis=1) / safe_counts)
+    stdev[counts < 2] = 0.0
+    out[1:] = stdev
+    out[:2] = 0.0
+    return out
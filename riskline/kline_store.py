@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Sequence
+
+from riskline.state import atomic_write_text
+
+
+logger = logging.getLogger("riskline.klines")
+
+
+@dataclass(frozen=True)
+class Kline:
+    open_time: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    close_time: int
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> Kline:
+        # Binance kline format: [open_time, open, high, low, close, volume, close_time, ...]
+        return cls(
+            open_time=int(row[0]),
+            open=float(row[1]),
+            high=float(row[2]),
+            low=float(row[3]),
+            close=float(row[4]),
+            volume=float(row[5]),
+            close_time=int(row[6]) if len(row) > 6 else int(row[0]),
+        )
+
+    def to_row(self) -> list[Any]:
+        return [self.open_time, self.open, self.high, self.low, self.close, self.volume, self.close_time]
+
+
+class KlineStore:
+    """Local candle history keyed by symbol and interval."""
+
+    def __init__(self, path: str | None = None, *, max_rows: int = 1000) -> None:
+        self.path = path
+        self.max_rows = max_rows
+        self._series: dict[str, list[Kline]] = {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: str, *, max_rows: int = 1000) -> KlineStore:
+        store = cls(path, max_rows=max_rows)
+        p = Path(path)
+        if not p.exists():
+            return store
+        try:
+            data: dict[str, list[list[Any]]] = json.loads(p.read_text())
+            store._series = {key: [Kline.from_row(row) for row in rows] for key, rows in data.items()}
+        except (OSError, ValueError, TypeError, IndexError, AttributeError) as exc:
+            # Only a cache: the next fetch downloads the full history again.
+            logger.warning("Ignoring unreadable kline cache %s: %s", path, exc)
+        return store
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        data = {key: [kline.to_row() for kline in klines] for key, klines in self._series.items()}
+        atomic_write_text(self.path, json.dumps(data, separators=(",", ":")))
+        self._dirty = False
+
+    def get(self, symbol: str, interval: str) -> list[Kline]:
+        return list(self._series.get(_key(symbol, interval), ()))
+
+    def last_open_time(self, symbol: str, interval: str) -> int | None:
+        klines = self._series.get(_key(symbol, interval))
+        return klines[-1].open_time if klines else None
+
+    def merge(self, symbol: str, interval: str, klines: Sequence[Kline]) -> None:
+        if not klines:
+            return
+        key = _key(symbol, interval)
+        existing = self._series.get(key, [])
+        first_new = klines[0].open_time
+        # Incoming rows start at the last stored (possibly still open) candle,
+        # so everything from that point on is replaced by the fresh payload.
+        cut = len(existing)
+        while cut > 0 and existing[cut - 1].open_time >= first_new:
+            cut -= 1
+        merged = existing[:cut] + list(klines)
+        self._series[key] = merged[-self.max_rows :]
+        self._dirty = True
+
+
+def _key(symbol: str, interval: str) -> str:
+    return f"{symbol}:{interval}"
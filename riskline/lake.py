@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import bisect
+import logging
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+
+logger = logging.getLogger("riskline.lake")
+
+# Symbol under which market-wide series (Fear & Greed) are stored.
+MARKET = "MARKET"
+
+# Column layout per table; the first column is the ascending row key. ``q`` is
+# int64 and ``d`` float64, both little-endian, and missing floats are NaN.
+# Candle times are Binance milliseconds, every other ``ts`` is Unix seconds.
+TABLES: dict[str, tuple[tuple[str, str], ...]] = {
+    "candles_1d": (
+        ("open_time", "q"),
+        ("close_time", "q"),
+        ("open", "d"),
+        ("high", "d"),
+        ("low", "d"),
+        ("close", "d"),
+        ("volume", "d"),
+    ),
+    "funding": (("ts", "q"), ("funding_rate", "d"), ("mark_price", "d")),
+    "open_interest": (("ts", "q"), ("open_interest", "d")),
+    "fear_greed": (("ts", "q"), ("value", "q")),
+}
+
+_SUFFIXES = {"q": ".i64", "d": ".f64"}
+_DTYPES = {"q": "<i8", "d": "<f8"}
+_WIDTH = 8
+
+
+class LakeTable:
+    """Fixed-width column files sharing one row count, one file per column."""
+
+    def __init__(self, directory: str, columns: tuple[tuple[str, str], ...]) -> None:
+        self.directory = directory
+        self.columns = columns
+        self.key = columns[0][0]
+        self._paths = {name: str(Path(directory) / f"{name}{_SUFFIXES[code]}") for name, code in columns}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        # A crash between column writes can leave some columns a row ahead;
+        # only rows present in every column count.
+        return min(_size(path) for path in self._paths.values()) // _WIDTH
+
+    def append(self, rows: Mapping[str, Sequence[Any]]) -> int:
+        """Append rows whose key is newer than the stored tail; returns rows written.
+
+        Rows keyed before the last stored row are already on disk and skipped. A
+        row with the same key replaces the last row (e.g. a still-open candle).
+        """
+        missing = [name for name, _ in self.columns if name not in rows]
+        if missing:
+            raise ValueError(f"Missing lake columns: {', '.join(missing)}")
+        sizes = {len(rows[name]) for name, _ in self.columns}
+        if len(sizes) != 1:
+            raise ValueError("Lake columns must have the same length")
+        keys = [int(key) for key in rows[self.key]]
+        if any(later < earlier for earlier, later in zip(keys, keys[1:])):
+            raise ValueError(f"Lake rows must be sorted by {self.key}")
+
+        with self._lock:
+            Path(self.directory).mkdir(parents=True, exist_ok=True)
+            count = self._repair()
+            last = self._key_at(count - 1) if count else None
+            start = 0 if last is None else bisect.bisect_left(keys, last)
+            if start == len(keys):
+                return 0
+            offset = count - 1 if last is not None and keys[start] == last else count
+            for name, code in self.columns:
+                with open(self._paths[name], "r+b") as handle:
+                    handle.seek(offset * _WIDTH)
+                    handle.write(_pack(code, rows[name][start:]))
+            return len(keys) - start
+
+    def read(self, start: int | None = None, end: int | None = None) -> dict[str, Any]:
+        """Zero-copy views of the rows with ``start <= key < end``.
+
+        Views are numpy arrays when numpy is installed and typed memoryviews
+        otherwise. Rows appended afterwards are not visible through them.
+        """
+        count = len(self)
+        views = {name: _map(self._paths[name], code, count) for name, code in self.columns}
+        keys = views[self.key]
+        lo = 0 if start is None else bisect.bisect_left(keys, start)
+        hi = count if end is None else bisect.bisect_left(keys, end)
+        hi = max(lo, hi)
+        return {name: view[lo:hi] for name, view in views.items()}
+
+    def _repair(self) -> int:
+        count = len(self)
+        for path in self._paths.values():
+            if not os.path.exists(path):
+                open(path, "wb").close()
+            elif _size(path) != count * _WIDTH:
+                os.truncate(path, count * _WIDTH)
+        return count
+
+    def _key_at(self, index: int) -> int:
+        with open(self._paths[self.key], "rb") as handle:
+            handle.seek(index * _WIDTH)
+            return struct.unpack("<q", handle.read(_WIDTH))[0]
+
+
+def _size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+def _pack(code: str, values: Sequence[Any]) -> bytes:
+    if np is not None:
+        return np.asarray(values, dtype=_DTYPES[code]).tobytes()
+    if code == "d":
+        values = [float("nan") if value is None else float(value) for value in values]
+    return struct.pack(f"<{len(values)}{code}", *values)
+
+
+def _map(path: str, code: str, count: int) -> Any:
+    if count == 0:
+        return np.empty(0, dtype=_DTYPES[code]) if np is not None else memoryview(b"").cast(code)
+    with open(path, "rb") as handle:
+        mapped = mmap.mmap(handle.fileno(), count * _WIDTH, access=mmap.ACCESS_READ)
+    # The returned view keeps the mapping alive; it is unmapped once the last
+    # view referencing it is garbage collected.
+    if np is not None:
+        return np.frombuffer(mapped, dtype=_DTYPES[code], count=count)
+    return memoryview(mapped).cast(code)
+
+
+class DataLake:
+    """Columnar history under ``<directory>/<SYMBOL>/<table>/<column>.{i64,f64}``."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        self._tables: dict[tuple[str, str], LakeTable] = {}
+        self._lock = threading.Lock()
+
+    def table(self, symbol: str, name: str) -> LakeTable:
+        if name not in TABLES:
+            raise ValueError(f"Unknown lake table {name!r}; expected one of {tuple(TABLES)}")
+        key = (symbol.upper(), name)
+        with self._lock:
+            table = self._tables.get(key)
+            if table is None:
+                table = LakeTable(str(Path(self.directory) / key[0] / name), TABLES[name])
+                self._tables[key] = table
+        return table
+
+    def append(self, symbol: str, name: str, rows: Mapping[str, Sequence[Any]]) -> int:
+        return self.table(symbol, name).append(rows)
+
+    def record(self, symbol: str, name: str, rows: Mapping[str, Sequence[Any]]) -> bool:
+        """``append`` for fetch paths: a failed write is logged rather than failing the input."""
+        try:
+            self.append(symbol, name, rows)
+        except (OSError, ValueError) as exc:
+            logger.warning("Could not append %s/%s to the data lake: %s", symbol, name, exc)
+            return False
+        return True
+
+    def read(self, symbol: str, name: str, start: int | None = None, end: int | None = None) -> dict[str, Any]:
+        return self.table(symbol, name).read(start, end)
+
+    def symbols(self) -> list[str]:
+        return sorted(path.name for path in Path(self.directory).iterdir() if path.is_dir())
+
+
+def asof(
+    keys: Sequence[int],
+    values: Sequence[Any],
+    at: Sequence[int],
+    *,
+    tolerance: int | None = None,
+) -> list[Any]:
+    """For each of ``at``, the value of the last row keyed at or before it.
+
+    None where no such row exists, the row is older than ``tolerance`` or the
+    stored value is NaN.
+    """
+    out: list[Any] = []
+    for point in at:
+        index = bisect.bisect_right(keys, point) - 1
+        if index < 0 or (tolerance is not None and keys[index] < point - tolerance):
+            out.append(None)
+            continue
+        value = values[index]
+        if hasattr(value, "item"):
+            value = value.item()
+        out.append(None if value != value else value)
+    return out
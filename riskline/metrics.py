@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+import bisect
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterator, Sequence
+
+from riskline.state import atomic_write_text
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+
+logger = logging.getLogger("riskline.metrics")
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abstractmethod
+    def snapshot(self) -> list[list[Any]]:
+        """Values as JSON-friendly ``[label values, value]`` rows."""
+
+    @abstractmethod
+    def restore(self, data: list[list[Any]]) -> None:
+        """Replace the values with rows from ``snapshot``."""
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def snapshot(self) -> list[list[Any]]:
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+    def restore(self, data: list[list[Any]]) -> None:
+        with self._lock:
+            self._values = {tuple(key): float(value) for key, value in data}
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[LabelValues, list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            # Layout: one slot per bucket, then +Inf, then sum.
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            series[bisect.bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return int(sum(series[:-1])) if series else 0
+
+    def snapshot(self) -> list[list[Any]]:
+        with self._lock:
+            return [[list(key), list(series)] for key, series in self._series.items()]
+
+    def restore(self, data: list[list[Any]]) -> None:
+        size = len(self.buckets) + 2
+        with self._lock:
+            self._series = {
+                tuple(key): [float(value) for value in series]
+                for key, series in data
+                if len(series) == size
+            }
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0.0
+                for bound, hits in zip((*self.buckets, float("inf")), series[:-1]):
+                    cumulative += hits
+                    labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                    lines.append(f"{self.name}_bucket{labels} {_format_value(cumulative)}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(series[-1])}")
+                lines.append(f"{self.name}_count{labels} {_format_value(cumulative)}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def save_snapshot(self, path: str) -> None:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        data = {metric.name: metric.snapshot() for metric in metrics}
+        atomic_write_text(path, json.dumps(data, separators=(",", ":")))
+
+    def load_snapshot(self, path: str) -> None:
+        # Lets short-lived processes keep accumulating counters and histograms
+        # across runs instead of exporting a single tick each time.
+        p = Path(path)
+        if not p.exists():
+            return
+        with self._lock:
+            metrics = dict(self._metrics)
+        try:
+            data: dict[str, Any] = json.loads(p.read_text())
+            for name, values in data.items():
+                if name in metrics:
+                    metrics[name].restore(values)
+        except (OSError, ValueError, TypeError) as exc:
+            # A torn or stale snapshot only costs history, never the run.
+            logger.warning("Ignoring unreadable metrics snapshot %s: %s", path, exc)
+            for metric in metrics.values():
+                metric.restore([])
+
+    def write_textfile(self, path: str) -> None:
+        # Written atomically so the textfile collector never reads a partial file.
+        # Readable by the exporter, which usually runs as another user.
+        atomic_write_text(path, self.render(), mode=0o644)
+
+
+REGISTRY = MetricsRegistry()
+
+TICK_SECONDS = REGISTRY.histogram(
+    "riskline_tick_duration_seconds",
+    "Wall-clock duration of a full run_once tick.",
+    ("outcome",),
+)
+STAGE_SECONDS = REGISTRY.histogram(
+    "riskline_stage_duration_seconds",
+    "Duration of each run_once stage.",
+    ("stage",),
+)
+FETCH_SECONDS = REGISTRY.histogram(
+    "riskline_fetch_duration_seconds",
+    "Duration of each source fetch inside the fan-out stage.",
+    ("source", "symbol", "outcome"),
+)
+HTTP_ATTEMPT_SECONDS = REGISTRY.histogram(
+    "riskline_http_attempt_duration_seconds",
+    "Duration of every individual HTTP attempt.",
+    ("host", "outcome"),
+)
+HTTP_RETRIES = REGISTRY.counter(
+    "riskline_http_retries_total",
+    "HTTP attempts that were retried.",
+    ("host",),
+)
+HTTP_BACKOFF_SECONDS = REGISTRY.counter(
+    "riskline_http_backoff_seconds_total",
+    "Seconds slept in retry backoff.",
+    ("host",),
+)
+
+HTTP_CIRCUIT_REJECTIONS = REGISTRY.counter(
+    "riskline_http_circuit_rejections_total",
+    "HTTP calls rejected by an open circuit breaker.",
+    ("host",),
+)
+HTTP_BUDGET_EXHAUSTED = REGISTRY.counter(
+    "riskline_http_retry_budget_exhausted_total",
+    "Retries abandoned because the per-tick retry budget ran out.",
+    ("host",),
+)
+CACHE_LOOKUPS = REGISTRY.counter(
+    "riskline_cache_lookups_total",
+    "Response cache lookups by outcome (hit, miss, stale).",
+    ("source", "outcome"),
+)
+NOTIFY_MESSAGES = REGISTRY.counter(
+    "riskline_notify_messages_total",
+    "Outbound notification messages by channel and outcome (sent, retried, dead_letter).",
+    ("channel", "outcome"),
+)
+HTTP_THROTTLE_SECONDS = REGISTRY.counter(
+    "riskline_http_throttle_seconds_total",
+    "Seconds waited for Binance request weight before sending.",
+    ("host",),
+)
+
+
+def serve_metrics(
+    port: int,
+    *,
+    host: str = "127.0.0.1",
+    registry: MetricsRegistry = REGISTRY,
+) -> ThreadingHTTPServer:
+    # Imported here so one-shot runs never pay for http.server.
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+            return
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name="riskline-metrics", daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Sequence
+
+import requests
+
+from riskline.config import ConfigError
+from riskline.http import parse_retry_after
+from riskline.notify.telegram import (
+    NotificationError,
+    NotificationRateLimited,
+    NotificationRejected,
+    send_telegram_alert,
+)
+
+
+class Notifier(ABC):
+    """One outbound channel; ``send`` must give up within ``timeout_seconds``."""
+
+    kind = ""
+
+    def __init__(
+        self,
+        *,
+        name: str | None = None,
+        timeout_seconds: float = 10.0,
+        session: requests.Session | None = None,
+    ) -> None:
+        self.name = name or self.kind
+        self.timeout_seconds = float(timeout_seconds)
+        self.session = session
+
+    @abstractmethod
+    def send(self, text: str) -> None:
+        """Deliver ``text`` or raise NotificationError."""
+
+
+NOTIFIER_TYPES: dict[str, type[Notifier]] = {}
+
+
+def register_notifier(cls: type[Notifier]) -> type[Notifier]:
+    NOTIFIER_TYPES[cls.kind] = cls
+    return cls
+
+
+def create_notifier(kind: str, **options: Any) -> Notifier:
+    cls = NOTIFIER_TYPES.get(kind)
+    if cls is None:
+        raise ConfigError(f"Unknown notification channel type: {kind}")
+    try:
+        return cls(**options)
+    except TypeError as exc:
+        raise ConfigError(f"Invalid options for {kind} channel: {exc}") from exc
+
+
+@register_notifier
+class TelegramNotifier(Notifier):
+    kind = "telegram"
+
+    def __init__(
+        self,
+        *,
+        bot_token: str,
+        chat_id: str,
+        dry_run: bool = False,
+        send: Callable[..., None] = send_telegram_alert,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.bot_token = bot_token
+        self.chat_id = chat_id
+        self.dry_run = dry_run
+        self._send = send
+
+    def send(self, text: str) -> None:
+        self._send(
+            text=text,
+            bot_token=self.bot_token,
+            chat_id=self.chat_id,
+            timeout_seconds=self.timeout_seconds,
+            dry_run=self.dry_run,
+            session=self.session,
+        )
+
+
+@register_notifier
+class WebhookNotifier(Notifier):
+    """POSTs ``{"text": ...}`` as JSON to ``url``."""
+
+    kind = "webhook"
+
+    def __init__(
+        self,
+        *,
+        url: str,
+        headers: dict[str, str] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.url = url
+        self.headers = dict(headers or {})
+
+    def payload(self, text: str) -> dict[str, Any]:
+        return {"text": text}
+
+    def send(self, text: str) -> None:
+        client = self.session if self.session is not None else requests
+        response = client.post(self.url, json=self.payload(text), headers=self.headers, timeout=self.timeout_seconds)
+        if response.status_code == 429:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            raise NotificationRateLimited(f"{self.name} rate limit hit", retry_after if retry_after is not None else 1.0)
+        if 400 <= response.status_code < 500 and response.status_code != 408:
+            raise NotificationRejected(f"{self.name} rejected the message: HTTP {response.status_code}")
+        if response.status_code >= 400:
+            raise NotificationError(f"{self.name} returned HTTP {response.status_code}")
+
+
+@register_notifier
+class SlackNotifier(WebhookNotifier):
+    """Slack-compatible incoming webhook (also Mattermost, Rocket.Chat)."""
+
+    kind = "slack"
+
+    def payload(self, text: str) -> dict[str, Any]:
+        # Code block keeps the aligned alert layout intact.
+        return {"text": f"```{text}```"}
+
+
+@register_notifier
+class SmtpNotifier(Notifier):
+    kind = "smtp"
+
+    def __init__(
+        self,
+        *,
+        to: Sequence[str] | str,
+        host: str = "localhost",
+        port: int = 25,
+        sender: str = "riskline@localhost",
+        subject: str = "Riskline alert",
+        starttls: bool = False,
+        username: str = "",
+        password_env: str = "",
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.recipients = [to] if isinstance(to, str) else list(to)
+        self.host = host
+        self.port = int(port)
+        self.sender = sender
+        self.subject = subject
+        self.starttls = starttls
+        self.username = username
+        self.password_env = password_env
+
+    def send(self, text: str) -> None:
+        import smtplib
+        from email.message import EmailMessage
+
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = ", ".join(self.recipients)
+        message["Subject"] = self.subject
+        message.set_content(text)
+        try:
+            with smtplib.SMTP(self.host, self.port, timeout=self.timeout_seconds) as smtp:
+                if self.starttls:
+                    smtp.starttls()
+                if self.username:
+                    smtp.login(self.username, os.getenv(self.password_env, ""))
+                smtp.send_message(message)
+        except (OSError, smtplib.SMTPException) as exc:
+            raise NotificationError(f"{self.name} delivery failed: {exc}") from exc
+
+
+@register_notifier
+class FileNotifier(Notifier):
+    """Appends alerts to ``path``; ``-`` writes to stdout."""
+
+    kind = "file"
+
+    def __init__(self, *, path: str = "-", **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, text: str) -> None:
+        with self._lock:
+            if self.path == "-":
+                sys.stdout.write(f"{text}\n\n")
+                sys.stdout.flush()
+                return
+            with open(self.path, "a") as handle:
+                handle.write(f"{text}\n\n")
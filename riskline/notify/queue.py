@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import logging
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from riskline.metrics import NOTIFY_MESSAGES
+from riskline.state import atomic_write_text
+
+
+logger = logging.getLogger("riskline.notify")
+
+# Telegram rejects messages longer than this.
+MAX_MESSAGE_CHARS = 4096
+
+
+@dataclass
+class OutboundMessage:
+    text: str
+    created_at: float
+    attempts: int = 0
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    # Set once ``max_attempts`` sends failed; the message stays in the spool.
+    dead: bool = False
+    # Later queues that gave a dead letter a fresh set of attempts.
+    revivals: int = 0
+    # Never retried again: rejected by the channel or out of revivals.
+    permanent: bool = False
+
+
+class DeliveryQueue:
+    """Delivers messages on background workers so callers never wait on the network.
+
+    Undelivered messages are spooled to ``spool_path`` and resent by the next
+    queue that opens the same spool. Failed sends are retried with exponential
+    backoff, or after ``retry_after`` when the exception carries one. A message
+    that fails ``max_attempts`` times is kept in the spool as a dead letter and
+    gets a fresh set of attempts from each of the next ``max_revivals`` queues,
+    so an alert whose state was already saved survives an outage. A failure
+    marked ``permanent`` (a 4xx rejection) is never retried. Dead letters older
+    than ``dead_letter_max_age_seconds`` are no longer retried and are dropped
+    from the spool.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str], None],
+        *,
+        spool_path: str = "",
+        workers: int = 2,
+        max_attempts: int = 5,
+        backoff_seconds: float = 2.0,
+        merge: bool = False,
+        channel: str = "telegram",
+        max_revivals: int = 3,
+        dead_letter_max_age_seconds: float = 86400.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._send = send
+        self.spool_path = spool_path
+        self.max_attempts = max(1, max_attempts)
+        self.max_revivals = max(0, max_revivals)
+        self.dead_letter_max_age_seconds = dead_letter_max_age_seconds
+        self.backoff_seconds = backoff_seconds
+        self.merge = merge
+        self.channel = channel
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._ready: list[tuple[float, int, OutboundMessage]] = []
+        self._seq = itertools.count()
+        self._pending: dict[str, OutboundMessage] = {}
+        self._dead: dict[str, OutboundMessage] = {}
+        self._in_flight = 0
+        self._closed = False
+        self._spool_lock = threading.Lock()
+        revived = expired = 0
+        now = time.time()
+        for message in self._load_spool():
+            if not message.dead:
+                self._push(message, 0.0)
+            elif now - message.created_at > self.dead_letter_max_age_seconds:
+                expired += 1
+            elif message.permanent or message.revivals >= self.max_revivals:
+                message.permanent = True
+                self._dead[message.id] = message
+            else:
+                message.dead, message.attempts = False, 0
+                message.revivals += 1
+                revived += 1
+                self._push(message, 0.0)
+        if revived:
+            logger.info("Retrying %d dead-lettered %s message(s) from the spool", revived, channel)
+        if expired:
+            logger.warning("Dropped %d expired dead-lettered %s message(s) from the spool", expired, channel)
+        self._workers = [
+            threading.Thread(target=self._work, name=f"riskline-{channel}-{idx}", daemon=True)
+            for idx in range(max(1, workers))
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, text: str) -> None:
+        message = OutboundMessage(text=text, created_at=time.time())
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Delivery queue is closed")
+            self._push(message, 0.0)
+            self._cond.notify()
+        self._save_spool()
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def dead_letters(self) -> int:
+        with self._cond:
+            return len(self._dead)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        deadline = None if timeout is None else self._clock() + timeout
+        with self._cond:
+            while self._pending:
+                remaining = None if deadline is None else deadline - self._clock()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def close(self, timeout: float | None = None) -> bool:
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        # Workers stuck in a slow send are daemon threads; don't wait on them.
+        for worker in self._workers:
+            worker.join(timeout=1.0 if flushed else 0.0)
+        if not flushed:
+            logger.warning("%d %s message(s) left in the spool for the next run", self.pending(), self.channel)
+        return flushed
+
+    def _push(self, message: OutboundMessage, ready_at: float) -> None:
+        self._pending[message.id] = message
+        heapq.heappush(self._ready, (ready_at, next(self._seq), message))
+
+    def _next_batch(self) -> list[OutboundMessage] | None:
+        with self._cond:
+            while True:
+                if self._closed:
+                    return None
+                now = self._clock()
+                if self._ready and self._ready[0][0] <= now:
+                    break
+                self._cond.wait(self._ready[0][0] - now if self._ready else None)
+            batch = [heapq.heappop(self._ready)[2]]
+            if self.merge:
+                size = len(batch[0].text)
+                while self._ready and self._ready[0][0] <= now:
+                    candidate = self._ready[0][2]
+                    if size + 2 + len(candidate.text) > MAX_MESSAGE_CHARS:
+                        break
+                    heapq.heappop(self._ready)
+                    batch.append(candidate)
+                    size += 2 + len(candidate.text)
+            self._in_flight += 1
+            return batch
+
+    def _work(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                self._send("\n\n".join(message.text for message in batch))
+            except Exception as exc:  # noqa: BLE001 - any failure is retried
+                self._retry(batch, exc)
+            else:
+                NOTIFY_MESSAGES.inc(len(batch), channel=self.channel, outcome="sent")
+                with self._cond:
+                    for message in batch:
+                        self._pending.pop(message.id, None)
+            finally:
+                with self._cond:
+                    self._in_flight -= 1
+                    self._cond.notify_all()
+                self._save_spool()
+
+    def _retry(self, batch: list[OutboundMessage], exc: Exception) -> None:
+        retry_after = getattr(exc, "retry_after", None)
+        permanent = getattr(exc, "permanent", False)
+        with self._cond:
+            for message in batch:
+                message.attempts += 1
+                if permanent or message.attempts >= self.max_attempts:
+                    self._pending.pop(message.id, None)
+                    message.dead = True
+                    message.permanent = permanent or message.revivals >= self.max_revivals
+                    self._dead[message.id] = message
+                    NOTIFY_MESSAGES.inc(channel=self.channel, outcome="dead_letter")
+                    logger.error(
+                        "Giving up on %s message after %d attempts (%s): %s",
+                        self.channel,
+                        message.attempts,
+                        "not retried again" if message.permanent else "retried by the next run",
+                        exc,
+                    )
+                    continue
+                delay = retry_after if retry_after is not None else self.backoff_seconds * 2 ** (message.attempts - 1)
+                NOTIFY_MESSAGES.inc(channel=self.channel, outcome="retried")
+                logger.warning("%s delivery failed (%s); retrying in %.1fs", self.channel, exc, delay)
+                self._push(message, self._clock() + delay)
+
+    def _load_spool(self) -> list[OutboundMessage]:
+        if not self.spool_path or not Path(self.spool_path).exists():
+            return []
+        try:
+            rows = json.loads(Path(self.spool_path).read_text())
+            return [OutboundMessage(**row) for row in rows]
+        except (OSError, ValueError, TypeError) as exc:
+            logger.warning("Ignoring unreadable spool %s: %s", self.spool_path, exc)
+            return []
+
+    def _save_spool(self) -> None:
+        if not self.spool_path:
+            return
+        with self._spool_lock:
+            with self._cond:
+                rows = [asdict(message) for message in (*self._pending.values(), *self._dead.values())]
+            atomic_write_text(self.spool_path, json.dumps(rows))
+
+
+class Fanout:
+    """Submits every message to one DeliveryQueue per channel.
+
+    Each channel has its own workers, retries and spool, so a slow or failing
+    channel never holds up the others.
+    """
+
+    def __init__(self, queues: dict[str, DeliveryQueue]) -> None:
+        self.queues = queues
+
+    def submit(self, text: str) -> None:
+        for queue in self.queues.values():
+            queue.submit(text)
+
+    def pending(self) -> int:
+        return sum(queue.pending() for queue in self.queues.values())
+
+    def dead_letters(self) -> int:
+        return sum(queue.dead_letters() for queue in self.queues.values())
+
+    def flush(self, timeout: float | None = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        flushed = True
+        for queue in self.queues.values():
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            flushed = queue.flush(remaining) and flushed
+        return flushed
+
+    def close(self, timeout: float | None = None) -> bool:
+        flushed = self.flush(timeout)
+        for queue in self.queues.values():
+            queue.close(timeout=0.0)
+        return flushed
+
+
+def channel_spool_path(spool_file: str, channel: str) -> str:
+    if not spool_file:
+        return ""
+    path = Path(spool_file)
+    return str(path.with_name(f"{path.stem}.{channel}{path.suffix}"))
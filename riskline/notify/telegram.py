@@ -3,10 +3,27 @@ from __future__ import annotations
 import requests
 
 
+TELEGRAM_API_URL = "https://api.telegram.org"
+
+
 class NotificationError(RuntimeError):
     """Raised when Telegram notification fails."""
 
 
+class NotificationRejected(NotificationError):
+    """Raised on a 4xx other than 429 (bad token, unknown chat): resending cannot succeed."""
+
+    permanent = True
+
+
+class NotificationRateLimited(NotificationError):
+    """Raised on HTTP 429; ``retry_after`` is the wait Telegram asked for."""
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 def send_telegram_alert(
     *,
     text: str,
@@ -14,19 +31,38 @@ def send_telegram_alert(
     chat_id: str,
     timeout_seconds: int = 12,
     dry_run: bool = False,
+    session: requests.Session | None = None,
 ) -> None:
     if dry_run:
         print("[DRY RUN] Telegram message:")
         print(text)
         return
 
-    url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-    response = requests.post(
+    url = f"{TELEGRAM_API_URL}/bot{bot_token}/sendMessage"
+    client = session if session is not None else requests
+    response = client.post(
         url,
         json={"chat_id": chat_id, "text": text},
         timeout=timeout_seconds,
     )
+    if response.status_code == 429:
+        raise NotificationRateLimited("Telegram rate limit hit", _retry_after(response))
+    if 400 <= response.status_code < 500:
+        raise NotificationRejected(f"Telegram rejected the message: HTTP {response.status_code} {response.text[:200]}")
     response.raise_for_status()
     data = response.json()
     if not data.get("ok"):
         raise NotificationError(f"Telegram API returned error payload: {data}")
+
+
+def _retry_after(response: requests.Response) -> float:
+    try:
+        retry_after = response.json().get("parameters", {}).get("retry_after")
+    except ValueError:
+        retry_after = None
+    if retry_after is None:
+        retry_after = response.headers.get("Retry-After")
+    try:
+        return max(0.0, float(retry_after))
+    except (TypeError, ValueError):
+        return 1.0
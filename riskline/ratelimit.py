@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Mapping
+from urllib.parse import urlsplit
+
+
+# Binance IP request-weight limits per rolling minute.
+BINANCE_WEIGHT_LIMITS = {
+    "api.binance.com": 6000,
+    "fapi.binance.com": 2400,
+}
+USED_WEIGHT_HEADER = "X-MBX-USED-WEIGHT-1m"
+
+
+class RateLimitError(RuntimeError):
+    """Raised when a request would have to wait longer than allowed for weight."""
+
+
+def _klines_weight(limit: int) -> int:
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+def request_weight(host: str, path: str, params: Mapping[str, Any] | None = None) -> int:
+    params = params or {}
+    if host == "fapi.binance.com":
+        if path == "/fapi/v1/premiumIndex":
+            return 1 if "symbol" in params else 10
+        if path == "/fapi/v1/forceOrders":
+            return 20 if "symbol" in params else 50
+        if path == "/fapi/v1/klines":
+            return _klines_weight(int(params.get("limit", 500)))
+        return 1
+    if host == "api.binance.com" and path == "/api/v3/klines":
+        return 2
+    return 1
+
+
+class TokenBucket:
+    """Continuously refilling bucket; callers reserve tokens and sleep off any debt."""
+
+    def __init__(
+        self,
+        *,
+        capacity: float,
+        refill_per_second: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def reserve(self, weight: float, *, max_wait_seconds: float) -> float:
+        with self._lock:
+            self._refill()
+            wait = max(0.0, (weight - self._tokens) / self.refill_per_second)
+            if wait > max_wait_seconds:
+                raise RateLimitError(f"Request weight {weight} needs a {wait:.1f}s wait")
+            self._tokens -= weight
+            return wait
+
+    def sync_used(self, used: float) -> None:
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, self.capacity - used)
+
+
+class WeightLimiter:
+    """Throttles requests per host against Binance request-weight limits.
+
+    ``safety`` keeps that fraction of the published limit as usable capacity,
+    and the used-weight header reported by Binance pulls the local bucket down
+    whenever the server has seen more weight than we accounted for.
+    """
+
+    def __init__(
+        self,
+        limits: Mapping[str, int] = BINANCE_WEIGHT_LIMITS,
+        *,
+        safety: float = 0.8,
+        max_wait_seconds: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] | None = None,
+    ) -> None:
+        self.safety = safety
+        self.max_wait_seconds = max_wait_seconds
+        self._sleep = sleep
+        self._buckets = {
+            host: TokenBucket(capacity=limit * safety, refill_per_second=limit * safety / 60.0, clock=clock)
+            for host, limit in limits.items()
+        }
+
+    def bucket(self, host: str) -> TokenBucket | None:
+        return self._buckets.get(host)
+
+    def acquire(self, url: str, params: Mapping[str, Any] | None = None) -> float:
+        parts = urlsplit(url)
+        bucket = self._buckets.get(parts.netloc)
+        if bucket is None:
+            return 0.0
+        wait = bucket.reserve(
+            request_weight(parts.netloc, parts.path, params),
+            max_wait_seconds=self.max_wait_seconds,
+        )
+        if wait > 0:
+            (self._sleep or time.sleep)(wait)
+        return wait
+
+    def observe(self, url: str, headers: Mapping[str, str]) -> None:
+        bucket = self._buckets.get(urlsplit(url).netloc)
+        used = headers.get(USED_WEIGHT_HEADER) if bucket is not None else None
+        if used is None:
+            return
+        try:
+            used_weight = float(used)
+        except ValueError:
+            return
+        bucket.sync_used(used_weight)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Callable
+
+from riskline.config import AppConfig, ConfigError
+
+
+logger = logging.getLogger("riskline.reload")
+
+
+def _load_errors() -> tuple[type[Exception], ...]:
+    # Evaluated only once a load has raised, so yaml stays lazily imported.
+    import yaml
+
+    return (ConfigError, OSError, ValueError, TypeError, yaml.YAMLError)
+
+
+def _fingerprint(path: str) -> str:
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return ""
+
+
+class ConfigWatcher:
+    """Polls ``load`` in a daemon thread and passes each changed config to ``on_change``."""
+
+    def __init__(
+        self,
+        load: Callable[[], AppConfig],
+        current: AppConfig,
+        on_change: Callable[[AppConfig], None],
+        *,
+        interval_seconds: float = 5.0,
+        path: str = "config.yaml",
+    ) -> None:
+        self._load = load
+        self._path = path
+        self._on_change = on_change
+        self.current = current
+        self.interval_seconds = interval_seconds
+        self.reloads = 0
+        self._last_error: tuple[str, str] | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def check(self) -> bool:
+        try:
+            config = self._load()
+        except _load_errors() as exc:
+            # A half-written config.yaml fails until the write lands; keep the
+            # last good config and warn once per failing version of the file.
+            error = (_fingerprint(self._path), f"{type(exc).__name__}: {exc}")
+            if error != self._last_error:
+                self._last_error = error
+                logger.warning("Config reload failed; keeping the current config: %s", error[1])
+            return False
+        self._last_error = None
+        if config == self.current:
+            return False
+        self._on_change(config)
+        self.current = config
+        self.reloads += 1
+        return True
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="riskline-config", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Applying the reloaded config failed")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
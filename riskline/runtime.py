@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # Annotation-only: importing these eagerly would pull requests, asyncio
+    # and sqlite3 into every cold start.
+    from riskline.config import AppConfig
+    from riskline.engine.incremental import IncrementalScorer
+    from riskline.history import HistoryStore
+    from riskline.http import HttpSession
+    from riskline.indicators.rolling import RollingIndicators
+    from riskline.kline_store import KlineStore
+    from riskline.lake import DataLake
+    from riskline.notify.queue import Fanout
+    from riskline.sources.binance_stream import LiveMarket
+    from riskline.state import RiskState
+    from riskline.state_store import StateStore
+
+
+@dataclass(frozen=True)
+class SymbolInputs:
+    """Scoring inputs for one symbol, kept so live updates can re-score without refetching."""
+
+    fear_greed: dict | None
+    funding_rate: float | None
+    price: float | None
+    ma: float | None
+    volatility_pct: float | None
+    oi_delta_pct: float | None
+    liquidations_proxy: str | None
+
+
+@dataclass
+class Runtime:
+    """Everything a tick needs that can outlive a single tick."""
+
+    config: AppConfig
+    session: HttpSession
+    states: dict[str, RiskState]
+    state_store: StateStore
+    kline_store: KlineStore
+    indicators: dict[str, RollingIndicators]
+    outbox: Fanout
+    history: HistoryStore | None = None
+    lake: DataLake | None = None
+    live: LiveMarket | None = None
+    last_inputs: dict[str, SymbolInputs] = field(default_factory=dict)
+    scorers: dict[str, IncrementalScorer] = field(default_factory=dict)
+    # Serialises scheduled ticks and live re-scoring, which share states.
+    lock: threading.RLock = field(default_factory=threading.RLock)
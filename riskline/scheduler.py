@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable
+
+
+logger = logging.getLogger("riskline.scheduler")
+
+
+class Scheduler:
+    """Runs a task on a fixed interval until stopped."""
+
+    def __init__(
+        self,
+        task: Callable[[], Any],
+        *,
+        interval_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be positive")
+        self._task = task
+        self._interval = interval_seconds
+        self._clock = clock
+        self._stop = threading.Event()
+        self._tick_lock = threading.Lock()
+        self.ticks_run = 0
+        self.ticks_skipped = 0
+
+    @property
+    def interval_seconds(self) -> float:
+        return self._interval
+
+    @interval_seconds.setter
+    def interval_seconds(self, value: float) -> None:
+        # Takes effect from the next slot; used when a reloaded config changes the interval.
+        if value <= 0:
+            raise ValueError("interval_seconds must be positive")
+        self._interval = value
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def run(self) -> None:
+        next_run = self._clock()
+        while not self._stop.is_set():
+            delay = next_run - self._clock()
+            if delay > 0 and self._stop.wait(delay):
+                break
+
+            self.run_tick()
+
+            # Slots are anchored to the first tick so tick duration never
+            # accumulates as drift; slots a slow tick overran are dropped
+            # instead of being fired back-to-back.
+            next_run += self._interval
+            now = self._clock()
+            if next_run <= now:
+                missed = int((now - next_run) // self._interval) + 1
+                next_run += missed * self._interval
+                self.ticks_skipped += missed
+                logger.warning("Tick overran its slot; skipped %d scheduled tick(s)", missed)
+
+    def run_tick(self) -> bool:
+        if not self._tick_lock.acquire(blocking=False):
+            logger.warning("Previous tick still running; skipping")
+            self.ticks_skipped += 1
+            return False
+        try:
+            self._task()
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Tick failed: %s", exc)
+        finally:
+            self.ticks_run += 1
+            self._tick_lock.release()
+        return True
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import time
+from typing import TYPE_CHECKING, Any, Sequence
+
 from riskline.config import HttpConfig
-from riskline.http import get_json
+from riskline.http import HttpSession, get_json
+
+if TYPE_CHECKING:
+    from riskline.lake import DataLake
 
 
 BINANCE_FUTURES_PREMIUM_INDEX_URL = "https://fapi.binance.com/fapi/v1/premiumIndex"
@@ -17,11 +23,37 @@ def _classify_liquidation_proxy(order_count: int) -> str:
     return "Low"
 
 
-def fetch_futures_snapshot(
+def _parse_premium(premium: dict[str, Any]) -> dict:
+    return {
+        "funding_rate": float(premium["lastFundingRate"]),
+        "mark_price": float(premium["markPrice"]) if "markPrice" in premium else None,
+    }
+
+
+def _payload_ts(payload: dict[str, Any]) -> int:
+    # Binance stamps these payloads in milliseconds; a cached response keeps its
+    # original stamp, so re-recording it only rewrites the same lake row.
+    stamp = payload.get("time")
+    return int(stamp) // 1000 if stamp else int(time.time())
+
+
+def _record_premium(lake: DataLake | None, symbol: str, premium: dict[str, Any], parsed: dict) -> None:
+    if lake is None:
+        return
+    columns = {
+        "ts": [_payload_ts(premium)],
+        "funding_rate": [parsed["funding_rate"]],
+        "mark_price": [parsed["mark_price"]],
+    }
+    lake.record(symbol, "funding", columns)
+
+
+def fetch_premium_index(
     *,
     symbol: str = "BTCUSDT",
     http: HttpConfig,
-    include_liquidations_proxy: bool = False,
+    session: HttpSession | None = None,
+    lake: DataLake | None = None,
 ) -> dict:
     premium = get_json(
         BINANCE_FUTURES_PREMIUM_INDEX_URL,
@@ -29,33 +61,101 @@ def fetch_futures_snapshot(
         timeout_seconds=http.timeout_seconds,
         max_retries=http.max_retries,
         backoff_seconds=http.backoff_seconds,
+        session=session,
+        cache_source="premium_index",
     )
+    parsed = _parse_premium(premium)
+    _record_premium(lake, symbol, premium, parsed)
+    return parsed
+
+
+def fetch_premium_indexes(
+    *,
+    symbols: Sequence[str] | None = None,
+    http: HttpConfig,
+    session: HttpSession | None = None,
+    lake: DataLake | None = None,
+) -> dict[str, dict]:
+    # Without ``symbol`` Binance returns every perpetual in one response.
+    payload = get_json(
+        BINANCE_FUTURES_PREMIUM_INDEX_URL,
+        timeout_seconds=http.timeout_seconds,
+        max_retries=http.max_retries,
+        backoff_seconds=http.backoff_seconds,
+        session=session,
+        cache_source="premium_index",
+    )
+    wanted = set(symbols) if symbols is not None else None
+    premiums: dict[str, dict] = {}
+    for row in payload:
+        if wanted is None or row.get("symbol") in wanted:
+            parsed = _parse_premium(row)
+            _record_premium(lake, row["symbol"], row, parsed)
+            premiums[row["symbol"]] = parsed
+    return premiums
+
+
+def fetch_open_interest(
+    *,
+    symbol: str = "BTCUSDT",
+    http: HttpConfig,
+    session: HttpSession | None = None,
+    lake: DataLake | None = None,
+) -> float:
     oi = get_json(
         BINANCE_FUTURES_OI_URL,
         params={"symbol": symbol},
         timeout_seconds=http.timeout_seconds,
         max_retries=http.max_retries,
         backoff_seconds=http.backoff_seconds,
+        session=session,
+        cache_source="open_interest",
     )
-
-    funding_rate = float(premium["lastFundingRate"])
     open_interest = float(oi["openInterest"])
-    mark_price = float(premium["markPrice"]) if "markPrice" in premium else None
+    if lake is not None:
+        lake.record(symbol, "open_interest", {"ts": [_payload_ts(oi)], "open_interest": [open_interest]})
+    return open_interest
+
+
+def fetch_liquidations_proxy(
+    *,
+    symbol: str = "BTCUSDT",
+    http: HttpConfig,
+    session: HttpSession | None = None,
+) -> str:
+    force_orders = get_json(
+        BINANCE_FUTURES_FORCE_ORDERS_URL,
+        params={"symbol": symbol, "limit": 50},
+        timeout_seconds=http.timeout_seconds,
+        max_retries=http.max_retries,
+        backoff_seconds=http.backoff_seconds,
+        session=session,
+        cache_source="liquidations",
+    )
+    return _classify_liquidation_proxy(len(force_orders))
+
+
+def fetch_futures_snapshot(
+    *,
+    symbol: str = "BTCUSDT",
+    http: HttpConfig,
+    include_liquidations_proxy: bool = False,
+    session: HttpSession | None = None,
+) -> dict:
+    premium = fetch_premium_index(symbol=symbol, http=http, session=session)
+    open_interest = fetch_open_interest(symbol=symbol, http=http, session=session)
 
     liquidations_proxy = None
     if include_liquidations_proxy:
-        force_orders = get_json(
-            BINANCE_FUTURES_FORCE_ORDERS_URL,
-            params={"symbol": symbol, "limit": 50},
-            timeout_seconds=http.timeout_seconds,
-            max_retries=http.max_retries,
-            backoff_seconds=http.backoff_seconds,
+        liquidations_proxy = fetch_liquidations_proxy(
+            symbol=symbol,
+            http=http,
+            session=session,
         )
-        liquidations_proxy = _classify_liquidation_proxy(len(force_orders))
 
     return {
-        "funding_rate": funding_rate,
+        "funding_rate": premium["funding_rate"],
         "open_interest": open_interest,
-        "mark_price": mark_price,
+        "mark_price": premium["mark_price"],
         "liquidations_proxy": liquidations_proxy,
     }
@@ -1,29 +1,80 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING, Sequence
+
 from riskline.config import HttpConfig
-from riskline.http import get_json
+from riskline.http import HttpSession, get_json
+from riskline.kline_store import Kline, KlineStore
+
+if TYPE_CHECKING:
+    from riskline.lake import DataLake
 
 
 BINANCE_SPOT_KLINES_URL = "https://api.binance.com/api/v3/klines"
+BINANCE_KLINES_MAX_LIMIT = 1000
 
 
-def fetch_daily_klines(
+def fetch_daily_candles(
     *,
     symbol: str = "BTCUSDT",
     limit: int = 300,
     http: HttpConfig,
-) -> list[float]:
+    session: HttpSession | None = None,
+    store: KlineStore | None = None,
+    lake: DataLake | None = None,
+) -> list[Kline]:
+    params: dict[str, object] = {"symbol": symbol, "interval": "1d", "limit": limit}
+    last_open_time = store.last_open_time(symbol, "1d") if store is not None else None
+    if last_open_time is not None:
+        # Only the last stored candle (still open) and anything newer is requested.
+        params["startTime"] = last_open_time
+        params["limit"] = BINANCE_KLINES_MAX_LIMIT
+
     payload = get_json(
         BINANCE_SPOT_KLINES_URL,
-        params={"symbol": symbol, "interval": "1d", "limit": limit},
+        params=params,
         timeout_seconds=http.timeout_seconds,
         max_retries=http.max_retries,
         backoff_seconds=http.backoff_seconds,
+        session=session,
     )
-    closes: list[float] = []
-    for row in payload:
-        # Binance kline format: [open_time, open, high, low, close, ...]
-        closes.append(float(row[4]))
-    if not closes:
+    klines = [Kline.from_row(row) for row in payload]
+    if lake is not None and klines:
+        lake.record(symbol, "candles_1d", _candle_columns(klines))
+
+    if store is not None:
+        store.merge(symbol, "1d", klines)
+        klines = store.get(symbol, "1d")[-limit:]
+    if not klines:
         raise ValueError("No daily closes returned from Binance spot klines")
-    return closes
+    return klines
+
+
+def _candle_columns(klines: Sequence[Kline]) -> dict[str, list]:
+    return {
+        "open_time": [kline.open_time for kline in klines],
+        "close_time": [kline.close_time for kline in klines],
+        "open": [kline.open for kline in klines],
+        "high": [kline.high for kline in klines],
+        "low": [kline.low for kline in klines],
+        "close": [kline.close for kline in klines],
+        "volume": [kline.volume for kline in klines],
+    }
+
+
+def fetch_daily_klines(
+    *,
+    symbol: str = "BTCUSDT",
+    limit: int = 300,
+    http: HttpConfig,
+    session: HttpSession | None = None,
+    store: KlineStore | None = None,
+) -> list[float]:
+    candles = fetch_daily_candles(
+        symbol=symbol,
+        limit=limit,
+        http=http,
+        session=session,
+        store=store,
+    )
+    return [candle.close for candle in candles]
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Sequence
+
+try:
+    import websockets
+except ImportError:  # pragma: no cover - optional dependency
+    websockets = None
+
+
+BINANCE_FUTURES_STREAM_URL = "wss://fstream.binance.com/stream"
+
+logger = logging.getLogger("riskline.stream")
+
+
+def stream_url(symbols: Sequence[str], base_url: str = BINANCE_FUTURES_STREAM_URL) -> str:
+    streams = []
+    for symbol in symbols:
+        name = symbol.lower()
+        streams.extend((f"{name}@markPrice@1s", f"{name}@forceOrder"))
+    return f"{base_url}?streams={'/'.join(streams)}"
+
+
+def _usd(value: float) -> str:
+    if value >= 1_000_000:
+        return f"${value / 1_000_000:.1f}M"
+    if value >= 1_000:
+        return f"${value / 1_000:.0f}K"
+    return f"${value:.0f}"
+
+
+@dataclass(frozen=True)
+class LiveSnapshot:
+    funding_rate: float | None
+    mark_price: float | None
+    long_liquidations: float
+    short_liquidations: float
+    updated_at: float
+
+    def liquidations_label(self) -> str:
+        return f"longs {_usd(self.long_liquidations)} / shorts {_usd(self.short_liquidations)}"
+
+
+class LiveMarket:
+    """Latest mark price and funding plus rolling liquidation notional per symbol."""
+
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        *,
+        liquidation_window_seconds: float = 300.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.symbols = {symbol.upper() for symbol in symbols}
+        self.liquidation_window_seconds = liquidation_window_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._marks: dict[str, tuple[float | None, float, float]] = {}
+        self._liquidations: dict[str, deque[tuple[float, str, float]]] = {
+            symbol: deque() for symbol in self.symbols
+        }
+
+    def apply(self, message: dict[str, Any]) -> str | None:
+        # Combined streams wrap each event as {"stream": ..., "data": {...}}.
+        data = message.get("data", message)
+        event = data.get("e")
+        now = self._clock()
+        if event == "markPriceUpdate":
+            symbol = str(data.get("s", "")).upper()
+            if symbol not in self.symbols:
+                return None
+            funding = data.get("r")
+            with self._lock:
+                self._marks[symbol] = (float(funding) if funding not in (None, "") else None, float(data["p"]), now)
+            return symbol
+        if event == "forceOrder":
+            order = data.get("o", {})
+            symbol = str(order.get("s", "")).upper()
+            if symbol not in self.symbols:
+                return None
+            quantity = float(order.get("z") or order["q"])
+            price = float(order.get("ap") or order["p"])
+            with self._lock:
+                window = self._liquidations[symbol]
+                window.append((now, str(order.get("S", "")), quantity * price))
+                self._evict(window, now)
+            return symbol
+        return None
+
+    def snapshot(self, symbol: str, *, max_age_seconds: float | None = None) -> LiveSnapshot | None:
+        symbol = symbol.upper()
+        now = self._clock()
+        with self._lock:
+            mark = self._marks.get(symbol)
+            if mark is None:
+                return None
+            funding_rate, mark_price, updated_at = mark
+            if max_age_seconds is not None and now - updated_at > max_age_seconds:
+                return None
+            window = self._liquidations[symbol]
+            self._evict(window, now)
+            # A SELL force order closes a long position, a BUY closes a short.
+            longs = sum(notional for _, side, notional in window if side == "SELL")
+            shorts = sum(notional for _, side, notional in window if side == "BUY")
+        return LiveSnapshot(
+            funding_rate=funding_rate,
+            mark_price=mark_price,
+            long_liquidations=longs,
+            short_liquidations=shorts,
+            updated_at=updated_at,
+        )
+
+    def _evict(self, window: deque[tuple[float, str, float]], now: float) -> None:
+        while window and now - window[0][0] > self.liquidation_window_seconds:
+            window.popleft()
+
+
+async def run_stream(
+    url: str,
+    market: LiveMarket,
+    *,
+    on_update: Callable[[str], None] | None = None,
+    reconnect_seconds: float = 1.0,
+    max_reconnect_seconds: float = 60.0,
+) -> None:
+    if websockets is None:
+        raise RuntimeError("Streaming requires the optional 'websockets' package")
+    delay = reconnect_seconds
+    while True:
+        try:
+            async with websockets.connect(url) as connection:
+                delay = reconnect_seconds
+                async for raw in connection:
+                    try:
+                        symbol = market.apply(json.loads(raw))
+                    except (ValueError, KeyError, TypeError, AttributeError) as exc:
+                        # One bad event must not drop the connection for the rest.
+                        logger.warning("Skipping malformed stream message (%r): %.200s", exc, raw)
+                        continue
+                    if symbol is not None and on_update is not None:
+                        try:
+                            on_update(symbol)
+                        except Exception:
+                            logger.exception("Live update handler failed for %s", symbol)
+            logger.info("Stream closed by server; reconnecting")
+        except (OSError, ValueError, websockets.WebSocketException) as exc:
+            logger.warning("Stream error: %s; reconnecting in %.1fs", exc, delay)
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_reconnect_seconds)
+
+
+class MarketStream:
+    """Runs ``run_stream`` on its own event loop in a daemon thread."""
+
+    def __init__(
+        self,
+        url: str,
+        market: LiveMarket,
+        *,
+        on_update: Callable[[str], None] | None = None,
+    ) -> None:
+        self.url = url
+        self.market = market
+        self.on_update = on_update
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._thread: threading.Thread | None = None
+        self._started = threading.Event()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="riskline-stream", daemon=True)
+        self._thread.start()
+        self._started.wait()
+
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        self._task = loop.create_task(run_stream(self.url, self.market, on_update=self.on_update))
+        self._started.set()
+        try:
+            loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            logger.exception("Stream stopped")
+        finally:
+            loop.close()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if self._loop is not None and self._task is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._task.cancel)
+            except RuntimeError:
+                pass  # loop already closed
+        if self._thread is not None:
+            self._thread.join(timeout)
@@ -1,19 +1,34 @@
 from __future__ import annotations
 
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
 from riskline.config import HttpConfig
-from riskline.http import get_json
+from riskline.http import HttpSession, get_json
+
+if TYPE_CHECKING:
+    from riskline.lake import DataLake
 
 
 CMC_FNG_URL = "https://pro-api.coinmarketcap.com/v3/fear-and-greed/latest"
 
 
-def fetch_fear_greed(*, api_key: str, http: HttpConfig) -> dict:
+def fetch_fear_greed(
+    *,
+    api_key: str,
+    http: HttpConfig,
+    session: HttpSession | None = None,
+    lake: DataLake | None = None,
+) -> dict:
     payload = get_json(
         CMC_FNG_URL,
         headers={"X-CMC_PRO_API_KEY": api_key},
         timeout_seconds=http.timeout_seconds,
         max_retries=http.max_retries,
         backoff_seconds=http.backoff_seconds,
+        session=session,
+        cache_source="fear_greed",
     )
     data = payload.get("data", {})
     value = data.get("value")
@@ -23,8 +38,24 @@ def fetch_fear_greed(*, api_key: str, http: HttpConfig) -> dict:
     if value is None:
         raise ValueError("CoinMarketCap fear & greed payload missing value")
 
+    if lake is not None:
+        from riskline.lake import MARKET
+
+        lake.record(MARKET, "fear_greed", {"ts": [_timestamp_seconds(timestamp)], "value": [int(value)]})
     return {
         "value": int(value),
         "label": str(label),
         "timestamp": timestamp,
     }
+
+
+def _timestamp_seconds(timestamp: Any) -> int:
+    # CMC reports ``update_time`` as ISO 8601; older payloads used Unix seconds.
+    try:
+        return int(timestamp)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return int(datetime.fromisoformat(str(timestamp).replace("Z", "+00:00")).timestamp())
+    except ValueError:
+        return int(time.time())
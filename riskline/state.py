@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import json
+import os
+import tempfile
 import time
 from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Sequence
 
 
 @dataclass
@@ -13,13 +15,10 @@ class RiskState:
     last_regime: str = ""
     prev_oi: float | None = None
     prev_daily_close: float | None = None
+    indicators: dict[str, Any] | None = None
 
 
-def load_state(path: str) -> RiskState:
-    p = Path(path)
-    if not p.exists():
-        return RiskState()
-    data: dict[str, Any] = json.loads(p.read_text())
+def _state_from_dict(data: dict[str, Any]) -> RiskState:
     return RiskState(
         last_alert_ts=int(data.get("last_alert_ts", 0)),
         last_regime=str(data.get("last_regime", "")),
@@ -29,11 +28,73 @@ def load_state(path: str) -> RiskState:
             if data.get("prev_daily_close") is not None
             else None
         ),
+        indicators=data.get("indicators"),
     )
 
 
+def atomic_write_text(path: str, text: str, *, mode: int = 0o600) -> None:
+    """Replace ``path`` with ``text`` so a crash leaves the old or the new file, never a torn one.
+
+    Writes an fsynced sibling temp file with ``mode`` and renames it over ``path``.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as handle:
+            handle.write(text)
+            handle.flush()
+            if mode != 0o600:
+                os.fchmod(handle.fileno(), mode)
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def load_state(path: str) -> RiskState:
+    p = Path(path)
+    if not p.exists():
+        return RiskState()
+    data: dict[str, Any] = json.loads(p.read_text())
+    return _state_from_dict(data)
+
+
 def save_state(path: str, state: RiskState) -> None:
-    Path(path).write_text(json.dumps(asdict(state), indent=2))
+    atomic_write_text(path, json.dumps(asdict(state), indent=2))
+
+
+def load_states(
+    path: str,
+    symbols: Sequence[str],
+    *,
+    legacy_symbol: str | None = None,
+) -> dict[str, RiskState]:
+    """Per-symbol states from ``path``; symbols missing from the file start fresh.
+
+    A legacy single-symbol file does not record whose state it is, so it is only
+    migrated to ``legacy_symbol`` (the symbol it was written for) when that
+    symbol is requested.
+    """
+    states = {symbol: RiskState() for symbol in symbols}
+    p = Path(path)
+    if not p.exists() or not symbols:
+        return states
+    data: dict[str, Any] = json.loads(p.read_text())
+    if "symbols" in data:
+        for symbol in symbols:
+            if symbol in data["symbols"]:
+                states[symbol] = _state_from_dict(data["symbols"][symbol])
+    elif legacy_symbol in states:
+        states[legacy_symbol] = _state_from_dict(data)
+    return states
+
+
+def save_states(path: str, states: dict[str, RiskState]) -> None:
+    # Always keyed by symbol, even for one symbol, so a later load for a
+    # different or reordered watchlist never inherits another symbol's state.
+    payload = {"symbols": {symbol: asdict(state) for symbol, state in states.items()}}
+    atomic_write_text(path, json.dumps(payload, indent=2))
 
 
 def compute_oi_delta_pct(prev_oi: float | None, current_oi: float | None) -> float | None:
@@ -48,11 +109,19 @@ def should_send_alert(
     current_regime: str,
     cooldown_hours: int,
     now_ts: int | None = None,
+    partial: bool = False,
 ) -> tuple[bool, str]:
+    """Whether to alert, and why.
+
+    ``partial`` marks a regime scored with a fetched input missing; it never
+    counts as a flip, so the last confirmed regime is kept until the input is back.
+    """
     now_ts = now_ts or int(time.time())
     if not state.last_regime:
         return True, "first_alert"
     if state.last_regime != current_regime:
+        if partial:
+            return False, "partial_inputs"
         return True, "regime_flip"
 
     elapsed_seconds = now_ts - state.last_alert_ts
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Sequence
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+from riskline.state import RiskState, _state_from_dict, load_states, save_states
+
+
+logger = logging.getLogger("riskline.state")
+
+STATE_BACKENDS = ("json", "sqlite")
+
+
+class StateLockError(RuntimeError):
+    """Raised when another run holds the state lock for too long."""
+
+
+class StateStore(ABC):
+    """Loads and saves the per-symbol RiskState map."""
+
+    @abstractmethod
+    def load(self, symbols: Sequence[str]) -> dict[str, RiskState]:
+        """States for ``symbols``; symbols without a saved state start fresh."""
+
+    @abstractmethod
+    def save(self, states: dict[str, RiskState]) -> None:
+        """Persist ``states``, keyed by symbol."""
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> StateStore:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class JsonStateStore(StateStore):
+    """The state file layout, written atomically through a temp file and rename."""
+
+    def __init__(self, path: str, *, legacy_symbol: str | None = None) -> None:
+        self.path = path
+        self.legacy_symbol = legacy_symbol
+
+    def load(self, symbols: Sequence[str]) -> dict[str, RiskState]:
+        return load_states(self.path, symbols, legacy_symbol=self.legacy_symbol)
+
+    def save(self, states: dict[str, RiskState]) -> None:
+        save_states(self.path, states)
+
+
+class SqliteStateStore(StateStore):
+    """One row per symbol in a WAL-mode SQLite database; only changed rows are written.
+
+    A database without rows is seeded from the JSON state file ``import_from``
+    when one exists, so switching backends keeps cooldowns and OI baselines.
+    """
+
+    def __init__(self, path: str, *, import_from: str = "", legacy_symbol: str | None = None) -> None:
+        import sqlite3
+
+        self.path = path
+        # Ticks and live updates may run on different threads; Runtime.lock
+        # serialises them, so sharing the connection is safe.
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS risk_state (
+                symbol TEXT PRIMARY KEY,
+                last_alert_ts INTEGER NOT NULL,
+                last_regime TEXT NOT NULL,
+                prev_oi REAL,
+                prev_daily_close REAL,
+                indicators TEXT
+            )
+            """
+        )
+        self._conn.commit()
+        self._saved: dict[str, tuple] = {}
+        if import_from and Path(import_from).exists() and self._is_empty():
+            self._import_json(import_from, legacy_symbol)
+
+    def _is_empty(self) -> bool:
+        return self._conn.execute("SELECT 1 FROM risk_state LIMIT 1").fetchone() is None
+
+    def _import_json(self, path: str, legacy_symbol: str | None) -> None:
+        try:
+            data = json.loads(Path(path).read_text())
+            if isinstance(data.get("symbols"), dict):
+                symbols = list(data["symbols"])
+            else:
+                symbols = [legacy_symbol] if legacy_symbol else []
+            states = load_states(path, symbols, legacy_symbol=legacy_symbol)
+        except (OSError, ValueError, TypeError, AttributeError) as exc:
+            logger.warning("Not importing unreadable state file %s: %s", path, exc)
+            return
+        self.save(states)
+        logger.info("Imported state for %d symbol(s) from %s into %s", len(states), path, self.path)
+
+    def load(self, symbols: Sequence[str]) -> dict[str, RiskState]:
+        states = {symbol: RiskState() for symbol in symbols}
+        if not symbols:
+            return states
+        placeholders = ",".join("?" for _ in symbols)
+        rows = self._conn.execute(
+            "SELECT symbol, last_alert_ts, last_regime, prev_oi, prev_daily_close, indicators "
+            f"FROM risk_state WHERE symbol IN ({placeholders})",
+            list(symbols),
+        )
+        for symbol, last_alert_ts, last_regime, prev_oi, prev_daily_close, indicators in rows:
+            states[symbol] = _state_from_dict(
+                {
+                    "last_alert_ts": last_alert_ts,
+                    "last_regime": last_regime,
+                    "prev_oi": prev_oi,
+                    "prev_daily_close": prev_daily_close,
+                    "indicators": json.loads(indicators) if indicators else None,
+                }
+            )
+            self._saved[symbol] = _row(symbol, states[symbol])
+        return states
+
+    def save(self, states: dict[str, RiskState]) -> None:
+        rows = [_row(symbol, state) for symbol, state in states.items()]
+        changed = [row for row in rows if self._saved.get(row[0]) != row]
+        if not changed:
+            return
+        with self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO risk_state
+                    (symbol, last_alert_ts, last_regime, prev_oi, prev_daily_close, indicators)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(symbol) DO UPDATE SET
+                    last_alert_ts = excluded.last_alert_ts,
+                    last_regime = excluded.last_regime,
+                    prev_oi = excluded.prev_oi,
+                    prev_daily_close = excluded.prev_daily_close,
+                    indicators = excluded.indicators
+                """,
+                changed,
+            )
+        for row in changed:
+            self._saved[row[0]] = row
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _row(symbol: str, state: RiskState) -> tuple:
+    indicators = json.dumps(state.indicators, separators=(",", ":")) if state.indicators else None
+    return (symbol, state.last_alert_ts, state.last_regime, state.prev_oi, state.prev_daily_close, indicators)
+
+
+def sqlite_state_path(state_file: str) -> str:
+    """The database for ``state_file``, never ``state_file`` itself (that is the JSON state).
+
+    A ``.json`` name maps to its ``.sqlite`` sibling; any other name gets ``.sqlite`` appended.
+    """
+    path = Path(state_file)
+    return str(path.with_suffix(".sqlite")) if path.suffix == ".json" else f"{state_file}.sqlite"
+
+
+def create_state_store(backend: str, path: str, *, legacy_symbol: str | None = None) -> StateStore:
+    if backend == "sqlite":
+        return SqliteStateStore(sqlite_state_path(path), import_from=path, legacy_symbol=legacy_symbol)
+    if backend == "json":
+        return JsonStateStore(path, legacy_symbol=legacy_symbol)
+    raise ValueError(f"Unknown state backend: {backend}")
+
+
+@contextmanager
+def state_lock(path: str, *, timeout_seconds: float = 60.0, poll_seconds: float = 0.1) -> Iterator[None]:
+    """Hold an exclusive advisory lock on ``<path>.lock`` for the whole block."""
+    if fcntl is None:
+        yield
+        return
+    with open(f"{path}.lock", "a") as handle:
+        deadline = time.monotonic() + timeout_seconds
+        while True:
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    raise StateLockError(f"State file {path} is locked by another run") from None
+                time.sleep(poll_seconds)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
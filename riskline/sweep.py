@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Iterable, Iterator, Sequence
+
+from riskline.backtest import BacktestInputs, load_series, precompute_inputs, simulate
+from riskline.config import DEFAULT_SCORING, ConfigError, ScoringRules, Thresholds, load_config
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    thresholds: Thresholds
+    alerts: int
+    alerts_by_symbol: dict[str, int]
+    regimes: dict[str, int]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "thresholds": asdict(self.thresholds),
+            "alerts": self.alerts,
+            "alerts_by_symbol": self.alerts_by_symbol,
+            "regimes": self.regimes,
+        }
+
+
+def _validate_space(space: dict[str, Sequence[Any]]) -> None:
+    known = {field.name for field in fields(Thresholds)}
+    unknown = set(space) - known
+    if unknown:
+        raise ValueError(f"Unknown threshold fields: {', '.join(sorted(unknown))}")
+    empty = [name for name, values in space.items() if not values]
+    if empty:
+        raise ValueError(f"No values given for: {', '.join(sorted(empty))}")
+
+
+def grid(space: dict[str, Sequence[Any]], base: Thresholds) -> Iterator[Thresholds]:
+    _validate_space(space)
+    names = list(space)
+    for values in itertools.product(*(space[name] for name in names)):
+        yield base.replace_from(dict(zip(names, values)))
+
+
+def random_samples(
+    space: dict[str, Sequence[Any]],
+    base: Thresholds,
+    *,
+    count: int,
+    seed: int | None = None,
+) -> Iterator[Thresholds]:
+    _validate_space(space)
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield base.replace_from({name: rng.choice(list(values)) for name, values in space.items()})
+
+
+_WORKER_INPUTS: Sequence[BacktestInputs] = ()
+_WORKER_COOLDOWN_HOURS = 0
+_WORKER_RULES: ScoringRules = DEFAULT_SCORING
+_WORKER_BACKEND = "auto"
+
+
+def _init_worker(
+    inputs: Sequence[BacktestInputs],
+    cooldown_hours: int,
+    rules: ScoringRules = DEFAULT_SCORING,
+    backend: str = "auto",
+) -> None:
+    global _WORKER_INPUTS, _WORKER_COOLDOWN_HOURS, _WORKER_RULES, _WORKER_BACKEND
+    _WORKER_INPUTS = inputs
+    _WORKER_COOLDOWN_HOURS = cooldown_hours
+    _WORKER_RULES = rules
+    _WORKER_BACKEND = backend
+
+
+def _evaluate(thresholds: Thresholds) -> SweepResult:
+    alerts_by_symbol: dict[str, int] = {}
+    regimes: Counter[str] = Counter()
+    for inputs in _WORKER_INPUTS:
+        result = simulate(
+            inputs,
+            thresholds,
+            cooldown_hours=_WORKER_COOLDOWN_HOURS,
+            rules=_WORKER_RULES,
+            record_bars=False,
+            backend=_WORKER_BACKEND,
+        )
+        alerts_by_symbol[inputs.symbol] = result.alert_count
+        regimes.update(result.regime_totals)
+    return SweepResult(
+        thresholds=thresholds,
+        alerts=sum(alerts_by_symbol.values()),
+        alerts_by_symbol=alerts_by_symbol,
+        regimes=dict(regimes),
+    )
+
+
+def run_sweep(
+    inputs: Sequence[BacktestInputs],
+    candidates: Iterable[Thresholds],
+    *,
+    cooldown_hours: int,
+    rules: ScoringRules = DEFAULT_SCORING,
+    workers: int | None = None,
+    chunksize: int = 64,
+    backend: str = "auto",
+) -> list[SweepResult]:
+    """Score every candidate against indicator inputs computed once up front.
+
+    ``workers=1`` evaluates in-process; otherwise each pool worker receives the
+    precomputed inputs once through its initializer.
+    """
+    if workers == 1:
+        _init_worker(inputs, cooldown_hours, rules, backend)
+        return [_evaluate(thresholds) for thresholds in candidates]
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(tuple(inputs), cooldown_hours, rules, backend),
+    ) as executor:
+        return list(executor.map(_evaluate, candidates, chunksize=chunksize))
+
+
+def _parse_param(spec: str) -> tuple[str, list[str]]:
+    name, sep, values = spec.partition("=")
+    if not sep or not values:
+        raise argparse.ArgumentTypeError(f"expected NAME=V1,V2,... but got {spec!r}")
+    return name.strip(), [value.strip() for value in values.split(",") if value.strip()]
+
+
+def _parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Sweep Riskline thresholds over historical data")
+    parser.add_argument(
+        "files",
+        nargs="+",
+        help="CSV, history .bin files or lake_dir/<SYMBOL> directories, one per symbol",
+    )
+    parser.add_argument(
+        "--param",
+        action="append",
+        type=_parse_param,
+        default=[],
+        help="threshold values to try, e.g. fear_greed_buy=10,15,20 (repeatable)",
+    )
+    parser.add_argument("--samples", type=int, default=0, help="random samples instead of the full grid")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count)")
+    parser.add_argument("--config", default="config.yaml", help="config providing base thresholds")
+    parser.add_argument(
+        "--backend",
+        default="auto",
+        choices=("auto", "python", "numpy"),
+        help="indicator and scoring backend",
+    )
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = _parse_args(argv)
+    config = load_config(path=args.config, require_secrets=False)
+    space = dict(args.param)
+    try:
+        if args.samples:
+            candidates = list(random_samples(space, config.thresholds, count=args.samples, seed=args.seed))
+        else:
+            candidates = list(grid(space, config.thresholds))
+    except (ValueError, ConfigError) as exc:
+        raise SystemExit(f"Invalid sweep parameters: {exc}") from exc
+
+    inputs = [precompute_inputs(load_series(path), backend=args.backend) for path in args.files]
+    results = run_sweep(
+        inputs,
+        candidates,
+        cooldown_hours=config.alert_cooldown_hours,
+        rules=config.scoring,
+        workers=args.workers,
+        backend=args.backend,
+    )
+    if args.json:
+        print(json.dumps([result.to_dict() for result in results], indent=2))
+        return
+    for result in results:
+        varied = ", ".join(f"{name}={getattr(result.thresholds, name)}" for name in space)
+        regimes = ", ".join(f"{name}={count}" for name, count in sorted(result.regimes.items()))
+        print(f"{varied or 'base'}: alerts={result.alerts} {regimes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import json
+
+from riskline.backtest import (
+    HistoricalSeries,
+    load_series_csv,
+    main,
+    precompute_inputs,
+    run_backtest,
+    simulate,
+)
+from riskline.config import DEFAULT_THRESHOLDS
+from riskline.engine.score import compute_score
+from riskline.indicators.trend import ma200, pct_distance_from_ma
+from riskline.indicators.volatility import daily_return_volatility_pct
+
+DAY = 86_400
+
+
+def _series(count: int = 260, symbol: str = "BTCUSDT") -> HistoricalSeries:
+    closes = [100.0 + ((i * 13) % 17) - i * 0.05 for i in range(count)]
+    return HistoricalSeries(
+        symbol=symbol,
+        timestamps=[i * DAY for i in range(count)],
+        closes=closes,
+        funding_rates=[(-0.0002, 0.0, 0.0003)[i % 3] for i in range(count)],
+        open_interest=[1000.0 + (i % 9) * 40 if i % 11 else None for i in range(count)],
+        fear_greed=[(i * 7) % 100 for i in range(count)],
+    )
+
+
+def test_simulate_matches_scalar_scoring_per_bar() -> None:
+    series = _series()
+    result = simulate(precompute_inputs(series), DEFAULT_THRESHOLDS, cooldown_hours=6)
+
+    prev_oi = None
+    for idx in range(len(series.closes)):
+        closes = series.closes[: idx + 1]
+        current_oi = series.open_interest[idx]
+        oi_delta = None if prev_oi is None or current_oi is None else (current_oi - prev_oi) / prev_oi * 100.0
+        if current_oi is not None:
+            prev_oi = current_oi
+        expected = compute_score(
+            fear_greed_value=series.fear_greed[idx],
+            trend_pct_vs_200d=pct_distance_from_ma(closes[-1], ma200(closes)),
+            funding_rate=series.funding_rates[idx],
+            oi_delta_pct=oi_delta,
+            volatility_pct=daily_return_volatility_pct(closes),
+            thresholds=DEFAULT_THRESHOLDS,
+        )
+        assert result.scores[idx] == expected.score
+        assert result.regimes[idx] == expected.regime
+
+
+def test_simulate_counts_alerts_through_the_alert_gate() -> None:
+    series = _series(count=10)
+    flat = HistoricalSeries(
+        symbol="FLAT",
+        timestamps=[i * 3600 for i in range(10)],
+        closes=[100.0] * 10,
+        funding_rates=[0.0] * 10,
+        open_interest=[None] * 10,
+        fear_greed=[50] * 10,
+    )
+    result = simulate(precompute_inputs(flat), DEFAULT_THRESHOLDS, cooldown_hours=6)
+
+    assert result.alerts == [(0, "first_alert"), (6 * 3600, "cooldown_elapsed")]
+    assert result.regime_counts() == {"NEUTRAL": 10}
+    assert run_backtest([series], DEFAULT_THRESHOLDS, cooldown_hours=6)["BTCUSDT"].bars == 10
+
+
+def test_simulate_applies_the_partial_inputs_rule() -> None:
+    def _flat(fear_greed: list) -> HistoricalSeries:
+        count = len(fear_greed)
+        return HistoricalSeries(
+            symbol="FLAT",
+            timestamps=[i * 3600 for i in range(count)],
+            closes=[100.0] * count,
+            funding_rates=[0.0] * count,
+            open_interest=[1000.0] * count,
+            fear_greed=fear_greed,
+        )
+
+    # A Fear & Greed gap would read NEUTRAL, but it is not a flip.
+    gap = simulate(precompute_inputs(_flat([10, 10, None, None, 10])), DEFAULT_THRESHOLDS, cooldown_hours=6)
+    assert gap.alerts == [(0, "first_alert")]
+
+    # Too little history for a 200-day trend is not a gap: the flip still fires.
+    short = simulate(precompute_inputs(_flat([50, 50, 10])), DEFAULT_THRESHOLDS, cooldown_hours=6)
+    assert short.alerts == [(0, "first_alert"), (2 * 3600, "regime_flip")]
+
+
+def test_simulate_without_bar_records_keeps_totals() -> None:
+    inputs = precompute_inputs(_series())
+    full = simulate(inputs, DEFAULT_THRESHOLDS, cooldown_hours=6)
+    lean = simulate(inputs, DEFAULT_THRESHOLDS, cooldown_hours=6, record_bars=False)
+
+    assert lean.scores == []
+    assert lean.regime_counts() == full.regime_counts()
+    assert lean.alert_count == full.alert_count
+
+
+def test_load_series_csv_and_cli(tmp_path, capsys) -> None:
+    csv_path = tmp_path / "ethusdt.csv"
+    csv_path.write_text(
+        "timestamp,close,funding_rate,open_interest,fear_greed\n"
+        "0,100,0.0001,10,50\n"
+        "86400,101,,,\n"
+        "172800,99,-0.0002,12,15\n"
+    )
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("alert_cooldown_hours: 6\n")
+
+    series = load_series_csv(str(csv_path))
+    assert series.symbol == "ETHUSDT"
+    assert series.funding_rates == [0.0001, None, -0.0002]
+    assert series.fear_greed == [50, None, 15]
+
+    main([str(csv_path), "--config", str(config_path), "--json", "--backend", "python"])
+    summary = json.loads(capsys.readouterr().out)[0]
+    assert summary["bars"] == 3
+    assert summary["alerts"] == 3
@@ -0,0 +1,142 @@
+import math
+import random
+
+import pytest
+
+from riskline.config import DEFAULT_THRESHOLDS, Comparison, Outcome, ScoringRules, Signal, SignalRule
+from riskline.engine.batch import score_batch
+from riskline.engine.decision import decide_action
+from riskline.engine.score import compute_score
+
+
+def _columns(rows: int, seed: int = 7) -> dict[str, list]:
+    rng = random.Random(seed)
+    t = DEFAULT_THRESHOLDS
+
+    def column(edges, low, high):
+        # Mix exact threshold values, random values and gaps.
+        return [
+            None if rng.random() < 0.1 else rng.choice((*edges, rng.uniform(low, high)))
+            for _ in range(rows)
+        ]
+
+    return {
+        "fear_greed": [None if rng.random() < 0.1 else rng.randint(0, 100) for _ in range(rows)],
+        "trend_pct": column((t.trend_risk_off_pct,), -5.0, 5.0),
+        "funding": column((t.funding_short_crowded, t.funding_long_crowded), -3e-4, 3e-4),
+        "oi_delta": column((t.oi_deleveraging_pct, t.oi_leverage_build_pct), -5.0, 5.0),
+        "volatility": column((t.high_volatility_pct,), 0.0, 6.0),
+    }
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_score_batch_matches_scalar_path(backend) -> None:
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    columns = _columns(3000)
+
+    batch = score_batch(**columns, thresholds=DEFAULT_THRESHOLDS, backend=backend)
+
+    assert len(batch) == 3000
+    actions = batch.action_labels()
+    for index in range(3000):
+        expected = compute_score(
+            fear_greed_value=columns["fear_greed"][index],
+            trend_pct_vs_200d=columns["trend_pct"][index],
+            funding_rate=columns["funding"][index],
+            oi_delta_pct=columns["oi_delta"][index],
+            volatility_pct=columns["volatility"][index],
+            thresholds=DEFAULT_THRESHOLDS,
+        )
+        assert batch.result(index) == expected
+        assert actions[index] == decide_action(expected.score).action
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_score_batch_returns_integer_codes(backend) -> None:
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+
+    batch = score_batch(
+        fear_greed=[10, math.nan],
+        trend_pct=[-2.0, None],
+        funding=[-0.0002, None],
+        oi_delta=[-3.0, None],
+        volatility=[1.0, None],
+        thresholds=DEFAULT_THRESHOLDS,
+        backend=backend,
+    )
+
+    assert [int(code) for code in batch.diagnostics["fear_greed"]] == [1, 0]
+    assert batch.regime_labels() == ["EXTREME_FEAR_RISK_OFF", "NEUTRAL"]
+    assert batch.diagnostics_at(1) == {
+        "fear_greed": "No sentiment data",
+        "trend": "Risk-on/neutral",
+        "funding": "No funding data",
+        "oi": "No prior OI baseline",
+        "volatility": "No price history",
+    }
+
+CUSTOM_RULES = ScoringRules(
+    signals=(
+        Signal(
+            name="trend",
+            input="trend_pct",
+            rules=(SignalRule("<", 0.0, 20, "Below MA"), SignalRule(">", 2.5, -15, "Well above MA")),
+            default_label="Near MA",
+            missing_label="No trend",
+            missing_weight=5,
+        ),
+        Signal(
+            name="volatility",
+            input="volatility",
+            rules=(SignalRule(">=", "high_volatility_pct", 10, "High"),),
+            default_label="Normal",
+            default_weight=-3,
+        ),
+    ),
+    regimes=(
+        Outcome(name="STRESS", when=(Comparison("volatility", ">", 4.0), Comparison("trend_pct", "<", 0.0))),
+        Outcome(name="RISK_ON_EUPHORIA", min_score=60),
+        Outcome(name="NEUTRAL"),
+    ),
+    actions=(Outcome(name="TRIM", min_score=60, guidance="Trim"), Outcome(name="HOLD", guidance="Hold")),
+    base_score=40,
+)
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_score_batch_matches_scalar_path_with_custom_rules(backend) -> None:
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    columns = _columns(2000, seed=11)
+
+    batch = score_batch(**columns, thresholds=DEFAULT_THRESHOLDS, rules=CUSTOM_RULES, backend=backend)
+
+    actions = batch.action_labels()
+    for index in range(2000):
+        expected = compute_score(
+            fear_greed_value=columns["fear_greed"][index],
+            trend_pct_vs_200d=columns["trend_pct"][index],
+            funding_rate=columns["funding"][index],
+            oi_delta_pct=columns["oi_delta"][index],
+            volatility_pct=columns["volatility"][index],
+            thresholds=DEFAULT_THRESHOLDS,
+            rules=CUSTOM_RULES,
+        )
+        assert batch.result(index) == expected
+        assert actions[index] == decide_action(expected.score, CUSTOM_RULES).action
+    assert {"STRESS", "RISK_ON_EUPHORIA", "NEUTRAL"} <= set(batch.regime_labels())
+
+
+def test_score_batch_rejects_ragged_columns() -> None:
+    with pytest.raises(ValueError, match="same length"):
+        score_batch(
+            fear_greed=[1, 2],
+            trend_pct=[0.0],
+            funding=[0.0],
+            oi_delta=[0.0],
+            volatility=[0.0],
+            thresholds=DEFAULT_THRESHOLDS,
+            backend="python",
+        )
@@ -0,0 +1,27 @@
+from benchmarks.bench_hot_path import compare, kline_payload, run_benchmarks
+
+
+def test_benchmarks_produce_comparable_json() -> None:
+    report = run_benchmarks(iterations=2, tick_iterations=1, latency_ms=0.0)
+
+    assert {
+        "load_config",
+        "load_config_no_snapshot",
+        "load_state",
+        "save_state",
+        "fetch_daily_klines_parse_300",
+        "ma200",
+        "daily_return_volatility_pct",
+        "compute_score",
+        "format_alert",
+        "run_once_stub_http",
+    } <= set(report["results"])
+    assert all(stats["median_s"] >= 0 for stats in report["results"].values())
+    assert len(compare(report, report)) == len(report["results"])
+
+
+def test_kline_payload_matches_binance_shape() -> None:
+    payload = kline_payload()
+    assert len(payload) == 300
+    assert len(payload[0]) == 12
+    assert payload[1][0] - payload[0][0] == 86_400_000
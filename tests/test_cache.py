@@ -0,0 +1,89 @@
+import pytest
+import responses
+
+from riskline.cache import CacheEntry, DiskBackend, MemoryBackend, ResponseCache, create_response_cache
+from riskline.config import CacheConfig, HttpConfig
+from riskline.http import HttpRequestError, HttpSession
+from riskline.sources.cmc_fear_greed import CMC_FNG_URL, fetch_fear_greed
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+HTTP = HttpConfig(timeout_seconds=1, max_retries=0, backoff_seconds=0.0)
+FNG_PAYLOAD = {"data": {"value": 42, "value_classification": "Fear"}}
+
+
+def _session(clock: _Clock) -> HttpSession:
+    cache = ResponseCache(MemoryBackend(), ttl_seconds={"fear_greed": 3600}, max_stale_seconds=7200, clock=clock)
+    return HttpSession(response_cache=cache)
+
+
+def test_memory_backend_evicts_least_recently_used() -> None:
+    backend = MemoryBackend(max_entries=2)
+    backend.set("a", CacheEntry(0.0, 1))
+    backend.set("b", CacheEntry(0.0, 2))
+    assert backend.get("a").payload == 1
+    backend.set("c", CacheEntry(0.0, 3))
+
+    assert backend.get("b") is None
+    assert backend.get("a").payload == 1
+    assert len(backend) == 2
+
+
+def test_disk_backend_round_trips_entries(tmp_path) -> None:
+    path = str(tmp_path / "cache.json")
+    DiskBackend(path).set("k", CacheEntry(5.0, {"x": [1, 2]}))
+
+    entry = DiskBackend(path).get("k")
+    assert entry == CacheEntry(5.0, {"x": [1, 2]})
+
+
+def test_cache_key_ignores_param_order() -> None:
+    assert ResponseCache.key("u", {"b": 1, "a": 2}) == ResponseCache.key("u", {"a": 2, "b": 1})
+
+
+@responses.activate
+def test_fear_greed_served_from_cache_within_ttl() -> None:
+    responses.add(responses.GET, CMC_FNG_URL, json=FNG_PAYLOAD, status=200)
+    clock = _Clock()
+    session = _session(clock)
+
+    assert fetch_fear_greed(api_key="k", http=HTTP, session=session)["value"] == 42
+    clock.now += 3599
+    assert fetch_fear_greed(api_key="k", http=HTTP, session=session)["value"] == 42
+    assert len(responses.calls) == 1
+
+    clock.now += 1
+    fetch_fear_greed(api_key="k", http=HTTP, session=session)
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_stale_entry_served_when_upstream_fails() -> None:
+    responses.add(responses.GET, CMC_FNG_URL, json=FNG_PAYLOAD, status=200)
+    responses.add(responses.GET, CMC_FNG_URL, status=503)
+    responses.add(responses.GET, CMC_FNG_URL, status=503)
+    clock = _Clock()
+    session = _session(clock)
+    fetch_fear_greed(api_key="k", http=HTTP, session=session)
+
+    clock.now += 4000
+    assert fetch_fear_greed(api_key="k", http=HTTP, session=session)["value"] == 42
+
+    clock.now += 4000
+    with pytest.raises(HttpRequestError):
+        fetch_fear_greed(api_key="k", http=HTTP, session=session)
+
+
+def test_create_response_cache_respects_backend(tmp_path) -> None:
+    assert create_response_cache(CacheConfig(backend="none")) is None
+    cache = create_response_cache(CacheConfig(backend="disk", file=str(tmp_path / "c.json")))
+    assert isinstance(cache.backend, DiskBackend)
+    assert cache.ttl_for("fear_greed") == 3600
+    assert cache.ttl_for("open_interest") == 0
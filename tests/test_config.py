@@ -1,8 +1,9 @@
+import json
 import textwrap
 
 import pytest
 
-from riskline.config import ConfigError, load_config
+from riskline.config import DEFAULT_THRESHOLDS, ConfigError, load_config
 
 
 def _write_yaml(path, content: str) -> None:
@@ -110,3 +111,242 @@ def test_load_config_raises_on_missing_required_env(tmp_path, monkeypatch) -> No
 
     with pytest.raises(ConfigError, match="TELEGRAM_CHAT_ID"):
         load_config(path=str(config_path), env_path=str(env_path))
+
+
+def test_load_config_parses_symbol_list_with_overrides(tmp_path, monkeypatch) -> None:
+    monkeypatch.delenv("RISKLINE_DRY_RUN", raising=False)
+    config_path = tmp_path / "config.yaml"
+    env_path = tmp_path / ".env"
+
+    _write_yaml(
+        config_path,
+        """
+        thresholds:
+          high_volatility_pct: 3.5
+        symbols:
+          - futures: BTCUSDT
+            spot: BTCUSDT
+          - futures: ETHUSDT
+            spot: ETHUSDT
+            thresholds:
+              high_volatility_pct: 5.0
+              fear_greed_buy: 15
+          - SOLUSDT
+        """,
+    )
+    env_path.write_text("CMC_API_KEY=a\nTELEGRAM_BOT_TOKEN=b\nTELEGRAM_CHAT_ID=c\n")
+
+    cfg = load_config(path=str(config_path), env_path=str(env_path))
+
+    watched = cfg.watched_symbols()
+    assert [symbols.futures for symbols in watched] == ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+    assert cfg.symbols == watched[0]
+    assert watched[2].spot == "SOLUSDT"
+    assert cfg.thresholds_for(watched[0]).high_volatility_pct == 3.5
+    eth = cfg.thresholds_for(watched[1])
+    assert eth.high_volatility_pct == 5.0
+    assert eth.fear_greed_buy == 15
+    assert eth.fear_greed_sell == 70
+
+
+def test_load_config_rejects_duplicate_symbols(tmp_path, monkeypatch) -> None:
+    config_path = tmp_path / "config.yaml"
+    env_path = tmp_path / ".env"
+    _write_yaml(config_path, "symbols: [BTCUSDT, BTCUSDT]")
+    env_path.write_text("CMC_API_KEY=a\nTELEGRAM_BOT_TOKEN=b\nTELEGRAM_CHAT_ID=c\n")
+
+    with pytest.raises(ConfigError, match="duplicate"):
+        load_config(path=str(config_path), env_path=str(env_path))
+
+
+def test_load_config_parses_cache_ttls(tmp_path) -> None:
+    config_path = tmp_path / "config.yaml"
+    env_path = tmp_path / ".env"
+    _write_yaml(
+        config_path,
+        """
+        cache:
+          backend: memory
+          max_entries: 32
+          ttl_seconds:
+            premium_index: 120
+            open_interest: 60
+        """,
+    )
+    env_path.write_text("CMC_API_KEY=a\nTELEGRAM_BOT_TOKEN=b\nTELEGRAM_CHAT_ID=c\n")
+
+    cfg = load_config(path=str(config_path), env_path=str(env_path))
+
+    assert cfg.cache.backend == "memory"
+    assert cfg.cache.max_entries == 32
+    assert cfg.cache.ttl_for("premium_index") == 120
+    assert cfg.cache.ttl_for("open_interest") == 60
+    assert cfg.cache.ttl_for("fear_greed") == 3600
+    assert cfg.cache.ttl_for("liquidations") == 0
+
+
+def test_load_config_parses_notify_channels(tmp_path) -> None:
+    config_path = tmp_path / "config.yaml"
+    env_path = tmp_path / ".env"
+    env_path.write_text("CMC_API_KEY=a\nTELEGRAM_BOT_TOKEN=b\nTELEGRAM_CHAT_ID=c\n")
+    _write_yaml(
+        config_path,
+        """
+        notify:
+          channels:
+            - type: slack
+              url: https://hooks.example/x
+              timeout_seconds: 3
+            - type: smtp
+              name: oncall
+              to: [a@example.com, b@example.com]
+        """,
+    )
+
+    channels = load_config(path=str(config_path), env_path=str(env_path)).notify.channels
+
+    assert [(c.kind, c.name) for c in channels] == [("slack", "slack"), ("smtp", "oncall")]
+    assert dict(channels[0].options) == {"url": "https://hooks.example/x", "timeout_seconds": 3}
+    assert dict(channels[1].options)["to"] == ("a@example.com", "b@example.com")
+
+    _write_yaml(config_path, "notify:\n  channels:\n    - type: file\n    - type: file\n")
+    with pytest.raises(ConfigError, match="Duplicate notify channel"):
+        load_config(path=str(config_path), env_path=str(env_path))
+
+
+def test_load_config_snapshot_tracks_file_changes(tmp_path, monkeypatch) -> None:
+    for name in ("CMC_API_KEY", "TELEGRAM_BOT_TOKEN", "TELEGRAM_CHAT_ID", "RISKLINE_DRY_RUN"):
+        monkeypatch.delenv(name, raising=False)
+    config_path = tmp_path / "config.yaml"
+    env_path = tmp_path / ".env"
+    config_path.write_text("poll_interval_minutes: 5\n")
+    env_path.write_text("CMC_API_KEY=a\nTELEGRAM_BOT_TOKEN=b\nTELEGRAM_CHAT_ID=c\n")
+
+    assert load_config(path=str(config_path), env_path=str(env_path)).poll_interval_minutes == 5
+    snapshot = tmp_path / ".config.yaml.snapshot"
+    assert json.loads(snapshot.read_text())["raw"] == {"poll_interval_minutes": 5}
+    assert b"CMC_API_KEY" not in snapshot.read_bytes()
+
+    # Served from the cache: .env values still reach the environment.
+    monkeypatch.delenv("CMC_API_KEY")
+    assert load_config(path=str(config_path), env_path=str(env_path)).cmc_api_key == "a"
+
+    config_path.write_text("poll_interval_minutes: 7\n")
+    monkeypatch.setenv("CMC_API_KEY", "from-env")
+    cfg = load_config(path=str(config_path), env_path=str(env_path))
+
+    assert cfg.poll_interval_minutes == 7
+    assert cfg.cmc_api_key == "from-env"
+
+    snapshot.write_bytes(b"not json")
+    assert load_config(path=str(config_path), env_path=str(env_path)).poll_interval_minutes == 7
+
+
+def test_reload_picks_up_rotated_dotenv_secrets(tmp_path, monkeypatch) -> None:
+    for name in ("CMC_API_KEY", "TELEGRAM_BOT_TOKEN", "TELEGRAM_CHAT_ID", "RISKLINE_DRY_RUN"):
+        monkeypatch.delenv(name, raising=False)
+    config_path = tmp_path / "config.yaml"
+    env_path = tmp_path / ".env"
+    config_path.write_text("poll_interval_minutes: 5\n")
+    env_path.write_text("CMC_API_KEY=old\nTELEGRAM_BOT_TOKEN=b\nTELEGRAM_CHAT_ID=c\n")
+    assert load_config(path=str(config_path), env_path=str(env_path)).cmc_api_key == "old"
+
+    env_path.write_text("CMC_API_KEY=new\nTELEGRAM_BOT_TOKEN=b\n")
+    cfg = load_config(path=str(config_path), env_path=str(env_path), require_secrets=False)
+
+    assert cfg.cmc_api_key == "new"
+    assert cfg.telegram_chat_id == ""
+
+    # The real environment still wins over .env.
+    monkeypatch.setenv("CMC_API_KEY", "from-env")
+    env_path.write_text("CMC_API_KEY=newer\nTELEGRAM_BOT_TOKEN=b\nTELEGRAM_CHAT_ID=c\n")
+    assert load_config(path=str(config_path), env_path=str(env_path)).cmc_api_key == "from-env"
+
+
+def test_load_config_rebuilds_only_when_content_changes(tmp_path, monkeypatch) -> None:
+    import os
+
+    import riskline.config as config_module
+
+    config_path = tmp_path / "config.yaml"
+    env_path = tmp_path / ".env"
+    config_path.write_text("alert_cooldown_hours: 2\n")
+    env_path.write_text("CMC_API_KEY=a\nTELEGRAM_BOT_TOKEN=b\nTELEGRAM_CHAT_ID=c\n")
+    first = load_config(path=str(config_path), env_path=str(env_path))
+
+    builds = []
+    build = config_module._build_config
+    monkeypatch.setattr(config_module, "_build_config", lambda raw: builds.append(raw) or build(raw))
+
+    os.utime(config_path, ns=(1_000_000_000, 1_000_000_000))
+    assert load_config(path=str(config_path), env_path=str(env_path)) == first
+    assert builds == []
+
+    config_path.write_text("alert_cooldown_hours: 3\n")
+    assert load_config(path=str(config_path), env_path=str(env_path)).alert_cooldown_hours == 3
+    assert builds == [{"alert_cooldown_hours": 3}]
+
+    config_path.write_text("alert_cooldown_hours: [\n")
+    with pytest.raises(ConfigError, match="Invalid YAML"):
+        load_config(path=str(config_path), env_path=str(env_path))
+
+
+def test_load_config_parses_scoring_rules(tmp_path) -> None:
+    config_path = tmp_path / "config.yaml"
+    env_path = tmp_path / ".env"
+    env_path.write_text("CMC_API_KEY=a\nTELEGRAM_BOT_TOKEN=b\nTELEGRAM_CHAT_ID=c\n")
+    _write_yaml(
+        config_path,
+        """
+        scoring:
+          base_score: 40
+          signals:
+            - name: funding
+              input: funding
+              rules:
+                - {op: ">=", threshold: funding_long_crowded, weight: 25, label: Long crowded}
+              default: {label: Balanced, weight: -5}
+              missing: No funding data
+          actions:
+            - {name: SELL, min_score: 60, guidance: Sell}
+            - {name: WAIT, guidance: Wait}
+        """,
+    )
+
+    scoring = load_config(path=str(config_path), env_path=str(env_path)).scoring
+
+    assert scoring.base_score == 40
+    assert [signal.name for signal in scoring.signals] == ["funding"]
+    assert scoring.signals[0].rules[0].threshold == "funding_long_crowded"
+    assert (scoring.signals[0].default_label, scoring.signals[0].default_weight) == ("Balanced", -5)
+    assert [action.name for action in scoring.actions] == ["SELL", "WAIT"]
+    assert scoring.regimes[-1].name == "NEUTRAL"
+
+
+@pytest.mark.parametrize(
+    ("scoring", "message"),
+    [
+        ("signals: [{name: x, input: price, default: y}]", "input must be one of"),
+        ("signals: [{name: x, input: funding, rules: [{op: '~', threshold: 1}], default: y}]", "unknown op"),
+        ("signals: [{name: x, input: funding, rules: [{op: '>', threshold: nope}], default: y}]", "thresholds key"),
+        ("signals: [{name: x, input: funding}]", "default label"),
+        ("actions: [{name: BUY, max_score: 30}]", "unconditional"),
+        ("actions: [{name: A, when: [{input: funding, op: '>', threshold: 0}]}, {name: B}]", "min_score/max_score"),
+    ],
+)
+def test_load_config_rejects_invalid_scoring_rules(tmp_path, scoring, message) -> None:
+    config_path = tmp_path / "config.yaml"
+    env_path = tmp_path / ".env"
+    env_path.write_text("CMC_API_KEY=a\nTELEGRAM_BOT_TOKEN=b\nTELEGRAM_CHAT_ID=c\n")
+    _write_yaml(config_path, "scoring:\n  " + scoring)
+
+    with pytest.raises(ConfigError, match=message):
+        load_config(path=str(config_path), env_path=str(env_path))
+
+
+def test_thresholds_replace_from_casts_known_fields() -> None:
+    updated = DEFAULT_THRESHOLDS.replace_from({"fear_greed_buy": "15", "high_volatility_pct": 4, "unknown": 1})
+
+    assert updated.fear_greed_buy == 15
+    assert updated.high_volatility_pct == 4.0
+    assert updated.fear_greed_sell == DEFAULT_THRESHOLDS.fear_greed_sell
@@ -0,0 +1,68 @@
+import threading
+import time
+
+from riskline.fetch import fetch_concurrently
+
+
+def test_fetch_concurrently_runs_tasks_in_parallel() -> None:
+    def _slow(value):
+        def _task():
+            time.sleep(0.2)
+            return value
+
+        return _task
+
+    started = time.monotonic()
+    result = fetch_concurrently(
+        {"a": _slow(1), "b": _slow(2), "c": _slow(3)},
+        deadline_seconds=5.0,
+    )
+    elapsed = time.monotonic() - started
+
+    assert result.values == {"a": 1, "b": 2, "c": 3}
+    assert elapsed < 0.5
+
+
+def test_fetch_concurrently_collects_errors_and_deadline_misses() -> None:
+    def _boom():
+        raise ValueError("bad payload")
+
+    def _hang():
+        time.sleep(1.0)
+        return "late"
+
+    started = time.monotonic()
+    result = fetch_concurrently(
+        {"ok": lambda: 42, "boom": _boom, "hang": _hang},
+        deadline_seconds=0.1,
+    )
+
+    assert time.monotonic() - started < 0.5
+    assert result.values == {"ok": 42}
+    assert isinstance(result.errors["boom"], ValueError)
+    assert result.timed_out == ["hang"]
+
+
+def test_fetch_concurrently_handles_empty_task_set() -> None:
+    result = fetch_concurrently({}, deadline_seconds=1.0)
+    assert result.values == {}
+    assert result.errors == {}
+
+
+def test_fetch_concurrently_caps_worker_threads() -> None:
+    lock = threading.Lock()
+    running = {"now": 0, "peak": 0}
+
+    def _task():
+        with lock:
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+        time.sleep(0.02)
+        with lock:
+            running["now"] -= 1
+        return True
+
+    result = fetch_concurrently({str(idx): _task for idx in range(12)}, deadline_seconds=5.0, max_workers=3)
+
+    assert len(result.values) == 12
+    assert running["peak"] <= 3
@@ -23,3 +23,20 @@ def test_format_alert_contains_critical_sections() -> None:
     assert "RISKLINE ALERT" in text
     assert "F&G: 5 (Extreme Fear)" in text
     assert "Action: DCA-BUY (3 tranches) / Reduce leverage" in text
+
+
+def test_format_alert_uses_scorer_labels() -> None:
+    text = format_alert(
+        fear_greed_value=40,
+        fear_greed_label="Fear",
+        btc_price=70753.0,
+        trend_pct_vs_200d=1.0,
+        funding_rate=0.0002,
+        oi_delta_pct=None,
+        liquidations_proxy=None,
+        score=ScoreResult(score=60, regime="NEUTRAL", diagnostics={"funding": "Long crowded", "oi": "Stable"}),
+        decision=Decision(action="HOLD", guidance="Hold spot / Avoid overtrading"),
+        send_reason="first_alert",
+    )
+    assert "Funding: 0.0200%/8h (Long crowded)" in text
+    assert "OI 24h proxy: n/a (n/a)" in text
@@ -0,0 +1,106 @@
+from dataclasses import replace
+
+import pytest
+
+from riskline.backtest import load_series_history, precompute_inputs
+from riskline.history import RECORD, HistoryFile, HistoryRecord, HistoryStore
+
+
+def _record(ts: int, oi: float | None = 100.0, price: float | None = 70000.0) -> HistoryRecord:
+    return HistoryRecord(
+        ts=ts,
+        funding_rate=0.0001,
+        open_interest=oi,
+        price=price,
+        trend_pct=None,
+        volatility_pct=2.5,
+        fear_greed=40,
+        score=45,
+        regime="NEUTRAL",
+    )
+
+
+def test_records_round_trip_with_missing_values(tmp_path) -> None:
+    store = HistoryStore(str(tmp_path))
+    record = HistoryRecord(0, None, None, None, None, None, None, None, "")
+    store.append("BTCUSDT", record)
+    store.append("BTCUSDT", _record(10))
+
+    assert store.range("BTCUSDT") == [record, _record(10)]
+    assert store.symbols() == ["BTCUSDT"]
+
+
+def test_configured_regime_names_round_trip(tmp_path) -> None:
+    store = HistoryStore(str(tmp_path))
+    store.append("BTCUSDT", replace(_record(0), regime="CAPITULATION"))
+    store.append("ETHUSDT", replace(_record(0), regime="NEUTRAL"))
+    store.append("ETHUSDT", replace(_record(10), regime="MELT_UP"))
+
+    reopened = HistoryStore(str(tmp_path))
+    assert [r.regime for r in reopened.range("BTCUSDT")] == ["CAPITULATION"]
+    assert [r.regime for r in reopened.range("ETHUSDT")] == ["NEUTRAL", "MELT_UP"]
+    # A standalone file (e.g. a backtest) reads the table next to it.
+    assert HistoryFile(store.file("BTCUSDT").path).last().regime == "CAPITULATION"
+
+
+def test_lookups_and_range_scans_use_timestamps(tmp_path) -> None:
+    store = HistoryStore(str(tmp_path))
+    for ts in range(0, 1000, 100):
+        store.append("BTCUSDT", _record(ts, oi=float(ts)))
+
+    assert store.at_or_before("BTCUSDT", -1) is None
+    assert store.at_or_before("BTCUSDT", 250).ts == 200
+    assert store.at_or_before("BTCUSDT", 300).ts == 300
+    assert [r.ts for r in store.range("BTCUSDT", 250, 500)] == [300, 400]
+    assert store.range("BTCUSDT", 2000) == []
+    assert store.range("ETHUSDT") == []
+
+
+def test_append_rejects_out_of_order_and_ignores_torn_tail(tmp_path) -> None:
+    store = HistoryStore(str(tmp_path))
+    store.append("BTCUSDT", _record(100))
+    with pytest.raises(ValueError):
+        store.append("BTCUSDT", _record(50))
+
+    with open(store.file("BTCUSDT").path, "ab") as handle:
+        handle.write(b"\x00" * (RECORD.size // 2))
+    assert [r.ts for r in store.range("BTCUSDT")] == [100]
+
+
+def test_oi_delta_uses_record_from_a_day_ago(tmp_path) -> None:
+    store = HistoryStore(str(tmp_path))
+    day = 86400
+    store.append("BTCUSDT", _record(0, oi=100.0))
+    store.append("BTCUSDT", _record(day - 1800, oi=150.0))
+
+    assert store.oi_delta_pct("BTCUSDT", 110.0, now_ts=day) == pytest.approx(10.0)
+    assert store.oi_delta_pct("BTCUSDT", 110.0, now_ts=day - 10) is None
+    assert store.oi_delta_pct("BTCUSDT", 110.0, now_ts=3 * day) is None
+
+
+def test_backtest_reads_history_files(tmp_path) -> None:
+    store = HistoryStore(str(tmp_path))
+    store.append("BTCUSDT", _record(0, price=None))
+    store.append("BTCUSDT", _record(60, price=1.0))
+    store.append("BTCUSDT", _record(120, price=2.0))
+
+    series = load_series_history(store.file("BTCUSDT").path, start_ts=0, end_ts=120)
+    assert series.symbol == "BTCUSDT"
+    assert series.timestamps == [60]
+    assert series.closes == [1.0]
+    assert series.fear_greed == [40]
+
+
+def test_backtest_resamples_tick_history_to_daily_bars(tmp_path) -> None:
+    store = HistoryStore(str(tmp_path))
+    day = 86400
+    ticks = [(0, 1.0, 100.0), (1800, 2.0, None), (day, 3.0, 110.0), (day + 1800, 4.0, 120.0), (2 * day, 5.0, None)]
+    for ts, price, oi in ticks:
+        store.append("BTCUSDT", _record(ts, oi=oi, price=price))
+
+    series = load_series_history(store.file("BTCUSDT").path)
+
+    assert series.timestamps == [1800, day + 1800, 2 * day]
+    assert series.closes == [2.0, 4.0, 5.0]
+    assert series.open_interest == [100.0, 120.0, None]
+    assert precompute_inputs(series).oi_delta_pct[1] == pytest.approx(20.0)
@@ -0,0 +1,158 @@
+import pytest
+import responses
+
+from riskline.http import (
+    CircuitBreaker,
+    CircuitOpenError,
+    HttpRequestError,
+    HttpSession,
+    get_json,
+    parse_retry_after,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list[float]:
+    recorded: list[float] = []
+    monkeypatch.setattr("riskline.http.time.sleep", recorded.append)
+    return recorded
+
+
+def test_circuit_breaker_opens_then_half_opens_for_one_probe() -> None:
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_seconds=30, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow() is False
+
+    clock.now = 31
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow() is True
+    assert breaker.allow() is False
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now = 62
+    assert breaker.allow() is True
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow() is True
+
+
+@responses.activate
+def test_open_circuit_fails_fast_without_calling_upstream(sleeps) -> None:
+    url = "https://down.example.test/x"
+    responses.get(url, status=503)
+    session = HttpSession(breaker_failure_threshold=2, retry_budget=10, retry_budget_seconds=10)
+
+    with pytest.raises(HttpRequestError):
+        get_json(url, max_retries=3, backoff_seconds=0.0, session=session)
+    calls_before = len(responses.calls)
+    assert calls_before == 2
+
+    with pytest.raises(CircuitOpenError):
+        get_json(url, max_retries=3, backoff_seconds=0.0, session=session)
+    assert len(responses.calls) == calls_before
+
+
+@responses.activate
+def test_retry_after_is_honored_on_429(sleeps) -> None:
+    url = "https://limited.example.test/x"
+    responses.get(url, status=429, headers={"Retry-After": "2"})
+    responses.get(url, json={"ok": True})
+
+    payload = get_json(url, max_retries=1, backoff_seconds=5.0, session=HttpSession())
+    assert payload == {"ok": True}
+    assert sleeps == [2.0]
+
+
+@responses.activate
+def test_retry_budget_is_shared_across_calls(sleeps) -> None:
+    url = "https://flaky.example.test/x"
+    responses.get(url, status=500)
+    session = HttpSession(retry_budget=1, retry_budget_seconds=10, breaker_failure_threshold=100)
+
+    with pytest.raises(HttpRequestError):
+        get_json(url, max_retries=3, backoff_seconds=0.0, session=session)
+    assert len(responses.calls) == 2
+
+    with pytest.raises(HttpRequestError):
+        get_json(url, max_retries=3, backoff_seconds=0.0, session=session)
+    assert len(responses.calls) == 3
+
+    session.reset_retry_budget()
+    with pytest.raises(HttpRequestError):
+        get_json(url, max_retries=3, backoff_seconds=0.0, session=session)
+    assert len(responses.calls) == 5
+
+
+@responses.activate
+def test_retry_after_beyond_budget_fails_fast(sleeps) -> None:
+    url = "https://banned.example.test/x"
+    responses.get(url, status=429, headers={"Retry-After": "120"})
+
+    with pytest.raises(HttpRequestError):
+        get_json(url, max_retries=3, backoff_seconds=0.0, session=HttpSession(retry_budget_seconds=10))
+    assert sleeps == []
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_client_errors_are_not_retried(sleeps) -> None:
+    url = "https://bad.example.test/x"
+    responses.get(url, status=400)
+
+    with pytest.raises(HttpRequestError):
+        get_json(url, max_retries=3, backoff_seconds=0.0)
+    assert len(responses.calls) == 1
+
+
+def test_jittered_backoff_stays_within_exponential_cap(monkeypatch) -> None:
+    from riskline import http as http_module
+
+    draws: list[tuple[float, float]] = []
+    monkeypatch.setattr(http_module.random, "uniform", lambda low, high: draws.append((low, high)) or high / 2)
+    assert http_module._backoff_delay(1.0, 3, None) == 4.0
+    assert draws == [(0.0, 8.0)]
+
+
+def test_parse_retry_after_accepts_seconds_and_dates() -> None:
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("garbage") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+@responses.activate
+def test_rate_limit_rejection_during_half_open_probe_frees_the_probe(monkeypatch, sleeps) -> None:
+    from riskline.ratelimit import RateLimitError
+
+    url = "https://fapi.binance.com/fapi/v1/premiumIndex"
+    responses.get(url, json={"ok": True})
+    session = HttpSession(breaker_failure_threshold=1, breaker_reset_seconds=0)
+    breaker = session.breaker_for("fapi.binance.com")
+    breaker.record_failure()
+
+    def _reject(*args, **kwargs):
+        raise RateLimitError("weight exhausted")
+
+    monkeypatch.setattr(session.rate_limiter, "acquire", _reject)
+    with pytest.raises(HttpRequestError, match="Rate limit"):
+        get_json(url, max_retries=0, backoff_seconds=0.0, session=session)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert len(responses.calls) == 0
+
+    monkeypatch.setattr(session.rate_limiter, "acquire", lambda *args, **kwargs: 0.0)
+    assert get_json(url, max_retries=0, backoff_seconds=0.0, session=session) == {"ok": True}
+    assert breaker.state == CircuitBreaker.CLOSED
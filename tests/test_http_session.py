@@ -0,0 +1,46 @@
+import responses
+
+from riskline.config import HttpConfig
+from riskline.http import HttpSession, create_session, get_json
+from riskline.sources.binance_futures import fetch_open_interest
+from riskline.sources.binance_spot import fetch_daily_klines
+
+
+def _http(**overrides) -> HttpConfig:
+    values = {"timeout_seconds": 1, "max_retries": 0, "backoff_seconds": 0.0}
+    values.update(overrides)
+    return HttpConfig(**values)
+
+
+def test_create_session_applies_pool_settings() -> None:
+    session = create_session(_http(pool_connections=4, pool_maxsize=16))
+
+    adapter = session.get_adapter("https://fapi.binance.com")
+    assert isinstance(session, HttpSession)
+    assert adapter._pool_connections == 4
+    assert adapter._pool_maxsize == 16
+    assert session.headers["Connection"] == "keep-alive"
+
+
+def test_create_session_can_disable_keep_alive() -> None:
+    session = create_session(_http(keep_alive=False))
+    assert session.headers["Connection"] == "close"
+
+
+@responses.activate
+def test_sources_reuse_injected_session() -> None:
+    responses.get("https://fapi.binance.com/fapi/v1/openInterest", json={"openInterest": "7"})
+    responses.get("https://api.binance.com/api/v3/klines", json=[[0, "1", "1", "1", "5", "0"]])
+
+    calls: list[str] = []
+
+    class _RecordingSession(HttpSession):
+        def get(self, url, **kwargs):
+            calls.append(url)
+            return super().get(url, **kwargs)
+
+    session = _RecordingSession()
+    assert fetch_open_interest(symbol="BTCUSDT", http=_http(), session=session) == 7.0
+    assert fetch_daily_klines(symbol="BTCUSDT", http=_http(), session=session) == [5.0]
+    assert get_json("https://api.binance.com/api/v3/klines", session=session) == [[0, "1", "1", "1", "5", "0"]]
+    assert len(calls) == 3
@@ -0,0 +1,49 @@
+import random
+
+from riskline.config import DEFAULT_THRESHOLDS
+from riskline.engine.incremental import IncrementalScorer, input_bands
+from riskline.engine.score import compute_score
+
+
+def _random_inputs(rng: random.Random) -> dict:
+    def maybe(value):
+        return None if rng.random() < 0.1 else value
+
+    return {
+        "fear_greed_value": maybe(rng.randint(0, 100)),
+        "trend_pct_vs_200d": maybe(rng.uniform(-30, 30)),
+        "funding_rate": maybe(rng.uniform(-0.0005, 0.0005)),
+        "oi_delta_pct": maybe(rng.uniform(-10, 10)),
+        "volatility_pct": maybe(rng.uniform(0, 8)),
+    }
+
+
+def test_equal_bands_always_give_equal_scores() -> None:
+    rng = random.Random(7)
+    seen: dict[tuple, object] = {}
+    for _ in range(5000):
+        inputs = _random_inputs(rng)
+        bands = input_bands(thresholds=DEFAULT_THRESHOLDS, **inputs)
+        result = compute_score(thresholds=DEFAULT_THRESHOLDS, **inputs)
+        assert seen.setdefault(bands, result) == result
+
+
+def test_scorer_skips_moves_within_a_band() -> None:
+    scorer = IncrementalScorer(DEFAULT_THRESHOLDS)
+    inputs = {
+        "fear_greed_value": 50,
+        "trend_pct_vs_200d": 5.0,
+        "funding_rate": 0.00001,
+        "oi_delta_pct": 0.5,
+        "volatility_pct": 1.0,
+    }
+
+    first = scorer.score(**inputs)
+    assert first is not None
+    assert scorer.score(**{**inputs, "funding_rate": 0.00002, "trend_pct_vs_200d": 6.0}) is None
+    assert scorer.score(**{**inputs, "funding_rate": 0.00002}, force=True) == first
+
+    crossed = scorer.score(**{**inputs, "funding_rate": DEFAULT_THRESHOLDS.funding_long_crowded})
+    assert crossed is not None
+    assert crossed.score == first.score + 10
+    assert (scorer.rescored, scorer.skipped) == (2, 2)
@@ -1,3 +1,9 @@
+import math
+
+import pytest
+
+from riskline.indicators.rolling import RollingIndicators
+from riskline.indicators.series import resolve_backend, rolling_ma, rolling_volatility_pct
 from riskline.indicators.trend import is_risk_off, ma200, pct_distance_from_ma
 from riskline.indicators.volatility import daily_return_volatility_pct
 
@@ -21,3 +27,72 @@ def test_pct_distance_and_risk_off() -> None:
 def test_daily_return_volatility_pct_non_negative() -> None:
     closes = [100, 101, 99, 100, 102, 98, 101]
     assert daily_return_volatility_pct(closes) >= 0.0
+
+
+def _rolling(closes) -> RollingIndicators:
+    indicators = RollingIndicators()
+    for key, close in enumerate(closes):
+        indicators.update(key, close)
+    return indicators
+
+
+def test_rolling_ma_matches_ma200() -> None:
+    assert _rolling([1.0] * 50).ma() is None
+    closes = list(range(1, 301))
+    assert _rolling(closes).ma() == ma200(closes)
+
+
+def test_rolling_volatility_matches_batch_function() -> None:
+    closes = [100, 101, 99, 100, 102, 98, 101, 0, 97, 103, 100, 99, 104, 101, 98, 102, 100]
+    for end in range(1, len(closes) + 1):
+        expected = daily_return_volatility_pct(closes[:end])
+        assert _rolling(closes[:end]).volatility_pct() == pytest.approx(expected, abs=1e-12)
+
+
+def test_rolling_update_revises_open_candle() -> None:
+    closes = [float(100 + (i % 7)) for i in range(220)]
+    indicators = _rolling(closes)
+    indicators.update(219, 130.0)
+    closes[-1] = 130.0
+
+    assert indicators.ma() == pytest.approx(ma200(closes))
+    assert indicators.volatility_pct() == pytest.approx(daily_return_volatility_pct(closes))
+
+
+def test_rolling_state_round_trip() -> None:
+    indicators = _rolling([float(100 + (i % 5)) for i in range(250)])
+    restored = RollingIndicators.from_dict(indicators.to_dict())
+
+    assert restored.last_key == 249
+    assert restored.ma() == pytest.approx(indicators.ma())
+    assert restored.volatility_pct() == pytest.approx(indicators.volatility_pct())
+
+
+def _sample_closes(count: int) -> list[float]:
+    return [100.0 + ((i * 37) % 23) - (i % 5) * 1.5 + i * 0.1 for i in range(count)]
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_series_backends_match_scalar_functions(backend) -> None:
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    closes = _sample_closes(260)
+    closes[120] = 0.0
+
+    mas = list(rolling_ma(closes, backend=backend))
+    vols = list(rolling_volatility_pct(closes, backend=backend))
+
+    for end in range(1, len(closes) + 1):
+        expected_ma = ma200(closes[:end])
+        if expected_ma is None:
+            assert mas[end - 1] is None or math.isnan(mas[end - 1])
+        else:
+            assert mas[end - 1] == pytest.approx(expected_ma, rel=1e-12)
+        expected_vol = daily_return_volatility_pct(closes[:end])
+        assert vols[end - 1] == pytest.approx(expected_vol, abs=1e-9)
+
+
+def test_resolve_backend_validates_name() -> None:
+    assert resolve_backend("python") == "python"
+    with pytest.raises(ValueError, match="Unknown indicator backend"):
+        resolve_backend("fortran")
@@ -0,0 +1,90 @@
+import pytest
+import responses
+from responses import matchers
+
+from riskline.config import HttpConfig
+from riskline.kline_store import Kline, KlineStore
+from riskline.sources.binance_spot import fetch_daily_candles, fetch_daily_klines
+
+KLINES_URL = "https://api.binance.com/api/v3/klines"
+DAY_MS = 86_400_000
+
+
+def _row(day: int, close: float) -> list:
+    open_time = day * DAY_MS
+    return [open_time, "1", "2", "0.5", str(close), "10", open_time + DAY_MS - 1, "0", 0, "0", "0", "0"]
+
+
+def _http() -> HttpConfig:
+    return HttpConfig(timeout_seconds=1, max_retries=0, backoff_seconds=0.0)
+
+
+def test_merge_replaces_open_candle_and_appends_newer() -> None:
+    store = KlineStore(max_rows=3)
+    store.merge("BTCUSDT", "1d", [Kline.from_row(_row(day, 100 + day)) for day in range(3)])
+    store.merge("BTCUSDT", "1d", [Kline.from_row(_row(2, 150)), Kline.from_row(_row(3, 160))])
+
+    closes = [kline.close for kline in store.get("BTCUSDT", "1d")]
+    assert closes == [101.0, 150.0, 160.0]
+    assert store.last_open_time("BTCUSDT", "1d") == 3 * DAY_MS
+    assert store.get("ETHUSDT", "1d") == []
+
+
+def test_store_round_trips_full_ohlcv(tmp_path) -> None:
+    path = tmp_path / "klines.json"
+    store = KlineStore(str(path))
+    store.merge("BTCUSDT", "1d", [Kline.from_row(_row(1, 100))])
+    store.save()
+
+    restored = KlineStore.load(str(path))
+    assert restored.get("BTCUSDT", "1d") == store.get("BTCUSDT", "1d")
+    assert restored.get("BTCUSDT", "1d")[0].volume == 10.0
+
+
+def test_torn_cache_file_loads_empty_and_is_rewritten(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "klines.json"
+    path.write_text('{"BTCUSDT:1d": [[1, 100.0')
+
+    store = KlineStore.load(str(path))
+    assert store.get("BTCUSDT", "1d") == []
+
+    store.merge("BTCUSDT", "1d", [Kline.from_row(_row(1, 100))])
+
+    def _crash(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("riskline.state.os.replace", _crash)
+    with pytest.raises(OSError):
+        store.save()
+    monkeypatch.undo()
+    # The failed save left the old file as it was and no temp file behind.
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["klines.json"]
+    store.save()
+    assert KlineStore.load(str(path)).get("BTCUSDT", "1d") == store.get("BTCUSDT", "1d")
+
+
+@responses.activate
+def test_fetch_daily_candles_only_requests_new_candles(tmp_path) -> None:
+    responses.get(
+        KLINES_URL,
+        json=[_row(day, 100 + day) for day in range(300)],
+        match=[matchers.query_param_matcher({"symbol": "BTCUSDT", "interval": "1d", "limit": "300"})],
+    )
+    responses.get(
+        KLINES_URL,
+        json=[_row(299, 500), _row(300, 510)],
+        match=[
+            matchers.query_param_matcher(
+                {"symbol": "BTCUSDT", "interval": "1d", "limit": "1000", "startTime": str(299 * DAY_MS)}
+            )
+        ],
+    )
+    store = KlineStore(str(tmp_path / "klines.json"))
+
+    first = fetch_daily_klines(symbol="BTCUSDT", http=_http(), store=store)
+    second = fetch_daily_candles(symbol="BTCUSDT", http=_http(), store=store)
+
+    assert len(first) == 300
+    assert len(second) == 300
+    assert second[0].close == 101.0
+    assert [candle.close for candle in second[-2:]] == [500.0, 510.0]
@@ -0,0 +1,106 @@
+import math
+
+import pytest
+
+from riskline.backtest import load_series, precompute_inputs
+from riskline.indicators.series import rolling_ma
+from riskline.lake import MARKET, DataLake, asof
+
+
+def _candles(days: range, close=lambda day: 100.0 + day) -> dict[str, list]:
+    day_ms = 86_400_000
+    return {
+        "open_time": [day * day_ms for day in days],
+        "close_time": [(day + 1) * day_ms - 1 for day in days],
+        "open": [close(day) for day in days],
+        "high": [close(day) for day in days],
+        "low": [close(day) for day in days],
+        "close": [close(day) for day in days],
+        "volume": [1.0 for _ in days],
+    }
+
+
+def test_append_skips_stored_rows_and_replaces_the_last_one(tmp_path) -> None:
+    lake = DataLake(str(tmp_path))
+
+    assert lake.append("btcusdt", "open_interest", {"ts": [10, 20, 30], "open_interest": [1.0, None, 3.0]}) == 3
+    assert lake.append("BTCUSDT", "open_interest", {"ts": [20, 30, 40], "open_interest": [9.0, 3.5, 4.0]}) == 2
+    assert lake.append("BTCUSDT", "open_interest", {"ts": [5], "open_interest": [0.0]}) == 0
+
+    frame = lake.read("BTCUSDT", "open_interest")
+    assert list(frame["ts"]) == [10, 20, 30, 40]
+    assert math.isnan(frame["open_interest"][1])
+    assert list(frame["open_interest"][2:]) == [3.5, 4.0]
+    assert lake.symbols() == ["BTCUSDT"]
+    assert len(lake.read("ETHUSDT", "funding")["ts"]) == 0
+
+
+def test_append_validates_rows(tmp_path) -> None:
+    lake = DataLake(str(tmp_path))
+
+    with pytest.raises(ValueError, match="Missing lake columns"):
+        lake.append("BTCUSDT", "funding", {"ts": [1], "funding_rate": [0.0]})
+    with pytest.raises(ValueError, match="same length"):
+        lake.append("BTCUSDT", "open_interest", {"ts": [1, 2], "open_interest": [0.0]})
+    with pytest.raises(ValueError, match="sorted"):
+        lake.append("BTCUSDT", "open_interest", {"ts": [2, 1], "open_interest": [0.0, 1.0]})
+    with pytest.raises(ValueError, match="Unknown lake table"):
+        lake.table("BTCUSDT", "trades")
+    assert lake.record("BTCUSDT", "open_interest", {"ts": [2, 1], "open_interest": [0.0, 1.0]}) is False
+
+
+def test_torn_column_write_is_ignored_then_repaired(tmp_path) -> None:
+    lake = DataLake(str(tmp_path))
+    lake.append("BTCUSDT", "funding", {"ts": [1, 2], "funding_rate": [0.1, 0.2], "mark_price": [1.0, 2.0]})
+    table = lake.table("BTCUSDT", "funding")
+    # Simulate a crash after only the key column received a third row.
+    with open(table._paths["ts"], "ab") as handle:
+        handle.write((3).to_bytes(8, "little"))
+
+    assert len(table) == 2
+    assert list(lake.read("BTCUSDT", "funding")["ts"]) == [1, 2]
+    lake.append("BTCUSDT", "funding", {"ts": [4], "funding_rate": [0.4], "mark_price": [4.0]})
+    assert list(lake.read("BTCUSDT", "funding")["ts"]) == [1, 2, 4]
+    assert list(lake.read("BTCUSDT", "funding")["funding_rate"]) == [0.1, 0.2, 0.4]
+
+
+def test_reads_are_key_ranges_of_mapped_views(tmp_path) -> None:
+    lake = DataLake(str(tmp_path))
+    lake.append("BTCUSDT", "candles_1d", _candles(range(300)))
+
+    closes = lake.read("BTCUSDT", "candles_1d")["close"]
+    window = lake.read("BTCUSDT", "candles_1d", 10 * 86_400_000, 20 * 86_400_000)
+
+    assert list(window["close"]) == [100.0 + day for day in range(10, 20)]
+    assert lake.read("BTCUSDT", "candles_1d", 400 * 86_400_000)["close"].tolist() == []
+    if hasattr(closes, "flags"):
+        assert not closes.flags.writeable
+        assert not closes.flags.owndata
+    expected = rolling_ma([100.0 + day for day in range(300)], backend="python")
+    assert list(rolling_ma(closes, backend="python")) == expected
+
+
+def test_asof_respects_tolerance_and_missing_values() -> None:
+    keys = [10, 20, 30]
+    values = [1.0, math.nan, 3.0]
+
+    assert asof(keys, values, [5, 10, 25, 35, 100], tolerance=10) == [None, 1.0, None, 3.0, None]
+    assert asof(keys, values, [100]) == [3.0]
+
+
+def test_backtest_loads_a_lake_symbol_directory(tmp_path) -> None:
+    lake = DataLake(str(tmp_path))
+    lake.append("BTCUSDT", "candles_1d", _candles(range(3)))
+    lake.append("BTCUSDT", "funding", {"ts": [0, 100_000], "funding_rate": [0.0001, -0.0002], "mark_price": [1.0, 2.0]})
+    lake.append("BTCUSDT", "open_interest", {"ts": [80_000, 170_000], "open_interest": [100.0, 110.0]})
+    lake.append(MARKET, "fear_greed", {"ts": [0], "value": [25]})
+
+    series = load_series(str(tmp_path / "BTCUSDT"))
+
+    assert series.symbol == "BTCUSDT"
+    assert series.timestamps == [86_399, 172_799, 259_199]
+    assert list(series.closes) == [100.0, 101.0, 102.0]
+    assert series.funding_rates == [0.0001, -0.0002, -0.0002]
+    assert series.open_interest == [100.0, 110.0, 110.0]
+    assert series.fear_greed == [25, 25, None]
+    assert precompute_inputs(series).oi_delta_pct[1] == pytest.approx(10.0)
@@ -11,14 +11,14 @@ from riskline.sources.cmc_fear_greed import fetch_fear_greed
 def test_main_exits_with_code_2_on_config_error(monkeypatch) -> None:
     monkeypatch.setattr(app_main, "run_once", lambda: (_ for _ in ()).throw(ConfigError("bad cfg")))
     with pytest.raises(SystemExit) as exc:
-        app_main.main()
+        app_main.main([])
     assert exc.value.code == 2
 
 
 def test_main_exits_with_code_1_on_unexpected_error(monkeypatch) -> None:
     monkeypatch.setattr(app_main, "run_once", lambda: (_ for _ in ()).throw(RuntimeError("boom")))
     with pytest.raises(SystemExit) as exc:
-        app_main.main()
+        app_main.main([])
     assert exc.value.code == 1
 
 
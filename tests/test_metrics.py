@@ -0,0 +1,86 @@
+import urllib.request
+
+import responses
+
+from riskline.http import get_json
+from riskline.metrics import HTTP_ATTEMPT_SECONDS, HTTP_RETRIES, MetricsRegistry, serve_metrics
+
+
+def test_histogram_renders_cumulative_prometheus_buckets() -> None:
+    registry = MetricsRegistry()
+    histogram = registry.histogram("demo_seconds", "Demo.", ("stage",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, stage="fetch")
+    histogram.observe(0.1, stage="fetch")
+    histogram.observe(3.0, stage="fetch")
+
+    text = registry.render()
+    assert "# TYPE demo_seconds histogram" in text
+    assert 'demo_seconds_bucket{stage="fetch",le="0.1"} 2' in text
+    assert 'demo_seconds_bucket{stage="fetch",le="1"} 2' in text
+    assert 'demo_seconds_bucket{stage="fetch",le="+Inf"} 3' in text
+    assert 'demo_seconds_count{stage="fetch"} 3' in text
+    assert histogram.count(stage="fetch") == 3
+
+
+def test_counter_escapes_labels_and_snapshot_round_trips(tmp_path) -> None:
+    registry = MetricsRegistry()
+    counter = registry.counter("demo_total", "Demo.", ("host",))
+    histogram = registry.histogram("demo_seconds", "Demo.", buckets=(1.0,))
+    counter.inc(2, host='a"b')
+    histogram.observe(0.5)
+    assert 'demo_total{host="a\\"b"} 2' in registry.render()
+
+    snapshot = str(tmp_path / "metrics.state.json")
+    registry.save_snapshot(snapshot)
+    restored = MetricsRegistry()
+    restored_counter = restored.counter("demo_total", "Demo.", ("host",))
+    restored_histogram = restored.histogram("demo_seconds", "Demo.", buckets=(1.0,))
+    restored.load_snapshot(snapshot)
+    assert restored_counter.value(host='a"b') == 2
+    assert restored_histogram.count() == 1
+
+
+def test_torn_snapshot_starts_empty_metrics(tmp_path) -> None:
+    snapshot = tmp_path / "metrics.state.json"
+    snapshot.write_text('{"demo_total": [[["a"], 2.0]], "demo_seconds": [[[], [1.0')
+    registry = MetricsRegistry()
+    counter = registry.counter("demo_total", "Demo.", ("host",))
+
+    registry.load_snapshot(str(snapshot))
+    assert counter.value(host="a") == 0
+
+    snapshot.write_text('{"demo_total": 5}')
+    registry.load_snapshot(str(snapshot))
+    assert counter.value(host="a") == 0
+
+
+def test_textfile_and_http_endpoint_export(tmp_path) -> None:
+    registry = MetricsRegistry()
+    registry.counter("demo_total", "Demo.").inc()
+    textfile = tmp_path / "riskline.prom"
+    registry.write_textfile(str(textfile))
+    assert "demo_total 1" in textfile.read_text()
+    assert textfile.stat().st_mode & 0o777 == 0o644
+
+    server = serve_metrics(0, registry=registry)
+    try:
+        port = server.server_address[1]
+        body = urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=2).read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert "demo_total 1" in body
+
+
+@responses.activate
+def test_get_json_records_attempts_and_retries() -> None:
+    url = "https://metrics.example.test/retry"
+    responses.get(url, status=503)
+    responses.get(url, json={"ok": True}, status=200)
+
+    get_json(url, timeout_seconds=1, max_retries=1, backoff_seconds=0.0)
+
+    host = "metrics.example.test"
+    assert HTTP_RETRIES.value(host=host) == 1
+    assert HTTP_ATTEMPT_SECONDS.count(host=host, outcome="5xx") == 1
+    assert HTTP_ATTEMPT_SECONDS.count(host=host, outcome="2xx") == 1
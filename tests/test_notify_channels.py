@@ -0,0 +1,164 @@
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from riskline.config import ConfigError
+from riskline.notify.channels import FileNotifier, SlackNotifier, SmtpNotifier, WebhookNotifier, create_notifier
+from riskline.notify.queue import DeliveryQueue, Fanout
+from riskline.notify.telegram import NotificationRateLimited, NotificationRejected
+
+
+class _WebhookStandIn:
+    def __init__(self, status: int = 200, headers: dict | None = None) -> None:
+        self.bodies: list[dict] = []
+        stand_in = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # noqa: N802
+                length = int(self.headers["Content-Length"])
+                stand_in.bodies.append(json.loads(self.rfile.read(length)))
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"ok")
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/hook"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class _SmtpStandIn(threading.Thread):
+    def __init__(self) -> None:
+        super().__init__(daemon=True)
+        self.sock = socket.socket()
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(1)
+        self.port = self.sock.getsockname()[1]
+        self.envelopes: list[str] = []
+        self.messages: list[str] = []
+
+    def run(self) -> None:
+        conn, _ = self.sock.accept()
+        stream = conn.makefile("rwb")
+
+        def reply(line: str) -> None:
+            stream.write(f"{line}\r\n".encode())
+            stream.flush()
+
+        reply("220 stand-in")
+        in_data, lines = False, []
+        for raw in stream:
+            line = raw.decode().rstrip("\r\n")
+            if in_data:
+                if line == ".":
+                    in_data = False
+                    self.messages.append("\n".join(lines))
+                    reply("250 queued")
+                else:
+                    lines.append(line)
+                continue
+            command = line[:4].upper()
+            if command in ("MAIL", "RCPT"):
+                self.envelopes.append(line)
+            if command == "DATA":
+                in_data = True
+                reply("354 go ahead")
+            elif command == "QUIT":
+                reply("221 bye")
+                break
+            else:
+                reply("250 stand-in")
+        conn.close()
+        self.sock.close()
+
+
+def test_webhook_and_slack_post_json_payloads() -> None:
+    server = _WebhookStandIn()
+    try:
+        WebhookNotifier(url=server.url, timeout_seconds=2).send("hello")
+        SlackNotifier(url=server.url, timeout_seconds=2).send("hello")
+    finally:
+        server.close()
+    assert server.bodies == [{"text": "hello"}, {"text": "```hello```"}]
+
+
+def test_webhook_429_carries_retry_after() -> None:
+    server = _WebhookStandIn(status=429, headers={"Retry-After": "3"})
+    try:
+        with pytest.raises(NotificationRateLimited) as excinfo:
+            WebhookNotifier(url=server.url, timeout_seconds=2).send("hello")
+    finally:
+        server.close()
+    assert excinfo.value.retry_after == 3.0
+
+
+def test_webhook_4xx_is_a_permanent_rejection() -> None:
+    server = _WebhookStandIn(status=404)
+    try:
+        with pytest.raises(NotificationRejected):
+            WebhookNotifier(url=server.url, timeout_seconds=2).send("hello")
+    finally:
+        server.close()
+
+
+def test_smtp_delivers_to_local_server() -> None:
+    server = _SmtpStandIn()
+    server.start()
+    SmtpNotifier(host="127.0.0.1", port=server.port, to=["ops@example.com"], timeout_seconds=2).send("RISKLINE ALERT")
+    server.join(timeout=5)
+
+    assert any("ops@example.com" in line for line in server.envelopes)
+    assert "Subject: Riskline alert" in server.messages[0]
+    assert "RISKLINE ALERT" in server.messages[0]
+
+
+def test_file_notifier_appends_and_writes_stdout(tmp_path, capsys) -> None:
+    path = tmp_path / "alerts.log"
+    notifier = FileNotifier(path=str(path))
+    notifier.send("one")
+    notifier.send("two")
+    assert path.read_text() == "one\n\ntwo\n\n"
+
+    FileNotifier().send("three")
+    assert capsys.readouterr().out == "three\n\n"
+
+
+def test_create_notifier_validates_type_and_options() -> None:
+    notifier = create_notifier("file", name="audit", path="-")
+    assert (notifier.name, notifier.kind) == ("audit", "file")
+    with pytest.raises(ConfigError, match="Unknown notification channel"):
+        create_notifier("pager")
+    with pytest.raises(ConfigError, match="Invalid options"):
+        create_notifier("webhook", address="nowhere")
+
+
+def test_slow_channel_does_not_delay_the_others() -> None:
+    release = threading.Event()
+    fast: list[str] = []
+    fanout = Fanout(
+        {
+            "slow": DeliveryQueue(lambda text: release.wait(5), workers=1, channel="slow"),
+            "fast": DeliveryQueue(fast.append, workers=1, channel="fast"),
+        }
+    )
+
+    started = time.monotonic()
+    fanout.submit("alert")
+    assert fanout.queues["fast"].flush(timeout=2) is True
+    assert fast == ["alert"]
+    assert fanout.close(timeout=0.1) is False
+    assert time.monotonic() - started < 2
+    release.set()
@@ -0,0 +1,217 @@
+import json
+import threading
+
+import pytest
+import responses
+
+from riskline.notify import telegram
+from riskline.notify.queue import DeliveryQueue, Fanout
+from riskline.notify.telegram import (
+    NotificationError,
+    NotificationRateLimited,
+    NotificationRejected,
+    send_telegram_alert,
+)
+
+
+def test_submit_does_not_wait_for_delivery() -> None:
+    release = threading.Event()
+    sent: list[str] = []
+
+    def _send(text: str) -> None:
+        release.wait(5)
+        sent.append(text)
+
+    queue = DeliveryQueue(_send, workers=1)
+    queue.submit("hello")
+    assert sent == []
+    assert queue.pending() == 1
+
+    release.set()
+    assert queue.close(timeout=5) is True
+    assert sent == ["hello"]
+
+
+def test_rate_limited_send_is_retried_after_retry_after() -> None:
+    calls: list[str] = []
+
+    def _send(text: str) -> None:
+        calls.append(text)
+        if len(calls) == 1:
+            raise NotificationRateLimited("slow down", retry_after=0.05)
+
+    queue = DeliveryQueue(_send, workers=1, backoff_seconds=60)
+    queue.submit("alert")
+
+    assert queue.flush(timeout=5) is True
+    assert calls == ["alert", "alert"]
+    queue.close()
+
+
+def test_message_is_dead_lettered_after_max_attempts(tmp_path) -> None:
+    spool = str(tmp_path / "outbox.json")
+    calls: list[str] = []
+
+    def _send(text: str) -> None:
+        calls.append(text)
+        raise NotificationError("down")
+
+    queue = DeliveryQueue(_send, spool_path=spool, workers=1, max_attempts=3, backoff_seconds=0.01)
+    queue.submit("alert")
+
+    assert queue.flush(timeout=5) is True
+    assert len(calls) == 3
+    assert queue.dead_letters() == 1
+    queue.close()
+    assert [(row["text"], row["dead"]) for row in json.loads((tmp_path / "outbox.json").read_text())] == [
+        ("alert", True)
+    ]
+
+    # The next run gives the dead letter a fresh set of attempts.
+    sent: list[str] = []
+    second = DeliveryQueue(sent.append, spool_path=spool, workers=1)
+    assert second.close(timeout=5) is True
+    assert sent == ["alert"]
+    assert json.loads((tmp_path / "outbox.json").read_text()) == []
+
+
+def test_fanout_counts_dead_letters_across_channels() -> None:
+    sent: list[str] = []
+
+    def _down(text: str) -> None:
+        raise NotificationError("down")
+
+    fanout = Fanout(
+        {
+            "telegram": DeliveryQueue(sent.append, workers=1),
+            "webhook": DeliveryQueue(_down, workers=1, max_attempts=2, backoff_seconds=0.01),
+        }
+    )
+    fanout.submit("alert")
+
+    assert fanout.flush(timeout=5) is True
+    assert sent == ["alert"]
+    assert fanout.dead_letters() == 1
+    fanout.close()
+
+
+def test_dead_letters_are_revived_a_bounded_number_of_times(tmp_path) -> None:
+    spool = str(tmp_path / "outbox.json")
+    calls: list[str] = []
+
+    def _down(text: str) -> None:
+        calls.append(text)
+        raise NotificationError("down")
+
+    first = DeliveryQueue(_down, spool_path=spool, workers=1, max_attempts=1, max_revivals=2)
+    first.submit("alert")
+    assert first.close(timeout=5) is True
+    for _ in range(3):
+        queue = DeliveryQueue(_down, spool_path=spool, workers=1, max_attempts=1, max_revivals=2)
+        assert queue.close(timeout=5) is True
+
+    # One first run plus two revivals; the fourth queue leaves it alone.
+    assert calls == ["alert"] * 3
+    rows = json.loads((tmp_path / "outbox.json").read_text())
+    assert [(row["revivals"], row["permanent"]) for row in rows] == [(2, True)]
+
+
+def test_rejected_message_is_never_retried(tmp_path) -> None:
+    spool = str(tmp_path / "outbox.json")
+    calls: list[str] = []
+
+    def _rejected(text: str) -> None:
+        calls.append(text)
+        raise NotificationRejected("chat not found")
+
+    queue = DeliveryQueue(_rejected, spool_path=spool, workers=1, max_attempts=5, backoff_seconds=0.01)
+    queue.submit("alert")
+    assert queue.close(timeout=5) is True
+    second = DeliveryQueue(_rejected, spool_path=spool, workers=1)
+    assert second.close(timeout=5) is True
+
+    assert calls == ["alert"]
+    assert second.dead_letters() == 1
+
+
+def test_expired_dead_letters_leave_the_spool(tmp_path) -> None:
+    spool = tmp_path / "outbox.json"
+    spool.write_text(json.dumps([{"text": "old", "created_at": 0.0, "attempts": 5, "id": "a", "dead": True}]))
+    calls: list[str] = []
+
+    def _down(text: str) -> None:
+        calls.append(text)
+        raise NotificationError("down")
+
+    queue = DeliveryQueue(_down, spool_path=str(spool), workers=1, backoff_seconds=60)
+    queue.submit("new")
+    assert queue.close(timeout=0.2) is False
+
+    assert calls == ["new"]
+    assert [row["text"] for row in json.loads(spool.read_text())] == ["new"]
+
+
+@responses.activate
+def test_telegram_4xx_is_a_permanent_rejection(monkeypatch) -> None:
+    monkeypatch.setattr(telegram, "TELEGRAM_API_URL", "https://tg.test")
+    responses.add(
+        responses.POST,
+        "https://tg.test/botbot/sendMessage",
+        json={"ok": False, "error_code": 400, "description": "Bad Request: chat not found"},
+        status=400,
+    )
+
+    with pytest.raises(NotificationRejected):
+        send_telegram_alert(text="hello", bot_token="bot", chat_id="chat")
+
+
+def test_undelivered_messages_survive_in_the_spool(tmp_path) -> None:
+    spool = str(tmp_path / "outbox.json")
+
+    def _down(text: str) -> None:
+        raise NotificationError("down")
+
+    first = DeliveryQueue(_down, spool_path=spool, workers=1, backoff_seconds=60)
+    first.submit("alert 1")
+    assert first.close(timeout=0.2) is False
+    assert [row["text"] for row in json.loads((tmp_path / "outbox.json").read_text())] == ["alert 1"]
+
+    sent: list[str] = []
+    second = DeliveryQueue(sent.append, spool_path=spool, workers=1)
+    assert second.close(timeout=5) is True
+    assert sent == ["alert 1"]
+    assert json.loads((tmp_path / "outbox.json").read_text()) == []
+
+
+def test_merge_combines_messages_waiting_together() -> None:
+    release = threading.Event()
+    sent: list[str] = []
+
+    def _send(text: str) -> None:
+        release.wait(5)
+        sent.append(text)
+
+    queue = DeliveryQueue(_send, workers=1, merge=True)
+    queue.submit("BTC")
+    queue.submit("ETH")
+    queue.submit("SOL")
+    release.set()
+
+    assert queue.close(timeout=5) is True
+    assert "".join(sent).replace("\n\n", "") == "BTCETHSOL"
+    assert sent[-1].endswith("ETH\n\nSOL")
+
+
+@responses.activate
+def test_telegram_429_carries_retry_after(monkeypatch) -> None:
+    monkeypatch.setattr(telegram, "TELEGRAM_API_URL", "https://tg.test")
+    responses.add(
+        responses.POST,
+        "https://tg.test/botbot/sendMessage",
+        json={"ok": False, "error_code": 429, "parameters": {"retry_after": 7}},
+        status=429,
+    )
+
+    with pytest.raises(NotificationRateLimited) as excinfo:
+        send_telegram_alert(text="hello", bot_token="bot", chat_id="chat")
+    assert excinfo.value.retry_after == 7.0
@@ -1,8 +1,15 @@
+import time
+from dataclasses import replace
 from pathlib import Path
 
 import main as app_main
-from riskline.config import AppConfig, HttpConfig, Symbols, Thresholds
-from riskline.state import load_state
+from riskline.config import AppConfig, HttpConfig, MetricsConfig, Symbols, Thresholds
+from riskline.history import HistoryStore
+from riskline.http import HttpSession
+from riskline.kline_store import Kline
+from riskline.sources.binance_stream import LiveMarket
+from riskline.state import RiskState, load_states, save_states
+from riskline.state_store import state_lock
 
 
 def _config(state_path: Path) -> AppConfig:
@@ -40,18 +47,14 @@ def test_run_once_end_to_end_with_mocks(tmp_path, monkeypatch) -> None:
     )
     monkeypatch.setattr(
         app_main,
-        "fetch_futures_snapshot",
-        lambda **kwargs: {
-            "funding_rate": -0.0002,
-            "open_interest": 1000.0,
-            "mark_price": 70000.0,
-            "liquidations_proxy": None,
-        },
+        "fetch_premium_index",
+        lambda **kwargs: {"funding_rate": -0.0002, "mark_price": 70000.0},
     )
+    monkeypatch.setattr(app_main, "fetch_open_interest", lambda **kwargs: 1000.0)
     monkeypatch.setattr(
         app_main,
-        "fetch_daily_klines",
-        lambda **kwargs: [100.0] * 250,
+        "fetch_daily_candles",
+        lambda **kwargs: [Kline(day, 100.0, 100.0, 100.0, 100.0, 1.0, day) for day in range(250)],
     )
 
     calls = {"sent": 0}
@@ -66,6 +69,354 @@ def test_run_once_end_to_end_with_mocks(tmp_path, monkeypatch) -> None:
     assert result == 0
     assert calls["sent"] == 1
 
-    state = load_state(str(state_path))
+    state = load_states(str(state_path), ["BTCUSDT"])["BTCUSDT"]
     assert state.last_regime != ""
     assert state.prev_oi == 1000.0
+    assert state.indicators["last_key"] == 249
+
+
+def test_run_once_scores_with_partial_inputs(tmp_path, monkeypatch) -> None:
+    state_path = tmp_path / "state.json"
+    monkeypatch.setattr(app_main, "load_config", lambda: _config(state_path))
+
+    def _fail(**kwargs):
+        raise RuntimeError("upstream down")
+
+    monkeypatch.setattr(app_main, "fetch_fear_greed", _fail)
+    monkeypatch.setattr(app_main, "fetch_daily_candles", _fail)
+    monkeypatch.setattr(
+        app_main,
+        "fetch_premium_index",
+        lambda **kwargs: {"funding_rate": 0.0, "mark_price": 70000.0},
+    )
+    monkeypatch.setattr(app_main, "fetch_open_interest", lambda **kwargs: 1000.0)
+
+    sent: list[str] = []
+    monkeypatch.setattr(app_main, "send_telegram_alert", lambda **kwargs: sent.append(kwargs["text"]))
+
+    assert app_main.run_once() == 0
+    assert "F&G: n/a" in sent[0]
+    assert "BTC: 70,000.00" in sent[0]
+
+    state = load_states(str(state_path), ["BTCUSDT"])["BTCUSDT"]
+    assert state.prev_oi == 1000.0
+    assert state.prev_daily_close == 70000.0
+
+
+def test_missing_inputs_never_flip_the_regime(tmp_path, monkeypatch) -> None:
+    state_path = tmp_path / "state.json"
+    config = replace(_config(state_path), alert_cooldown_hours=0)
+    fear_greed = {"value": 10, "label": "Extreme Fear"}
+    monkeypatch.setattr(app_main, "fetch_fear_greed", lambda **kwargs: fear_greed)
+    monkeypatch.setattr(app_main, "fetch_premium_index", lambda **kwargs: {"funding_rate": 0.0, "mark_price": 100.0})
+    monkeypatch.setattr(app_main, "fetch_open_interest", lambda **kwargs: 1000.0)
+    monkeypatch.setattr(
+        app_main,
+        "fetch_daily_candles",
+        lambda **kwargs: [Kline(day, 100.0, 100.0, 100.0, 100.0, 1.0, day) for day in range(250)],
+    )
+    sent: list[str] = []
+    monkeypatch.setattr(app_main, "send_telegram_alert", lambda **kwargs: sent.append(kwargs["text"]))
+    runtime = app_main._build_runtime(config, HttpSession())
+
+    assert app_main.run_once(runtime) == 0
+    assert "Partial inputs: no oi_delta" in sent[0]
+    assert app_main.run_once(runtime) == 0
+    assert runtime.states["BTCUSDT"].last_regime == "RISK_OFF_BUY_ZONE"
+
+    # Sentiment is down: scored as neutral it would read NEUTRAL, but that is not a flip.
+    fear_greed = None
+    assert app_main.run_once(runtime) == 0
+    runtime.outbox.flush(timeout=5)
+    assert len(sent) == 2
+    assert not any("regime_flip" in text for text in sent)
+    assert runtime.states["BTCUSDT"].last_regime == "RISK_OFF_BUY_ZONE"
+
+
+def test_short_history_symbol_still_gets_regime_flips(tmp_path, monkeypatch) -> None:
+    config = replace(_config(tmp_path / "state.json"), alert_cooldown_hours=0)
+    fear_greed = {"value": 50, "label": "Neutral"}
+    monkeypatch.setattr(app_main, "fetch_fear_greed", lambda **kwargs: fear_greed)
+    monkeypatch.setattr(app_main, "fetch_premium_index", lambda **kwargs: {"funding_rate": 0.0, "mark_price": 100.0})
+    monkeypatch.setattr(app_main, "fetch_open_interest", lambda **kwargs: 1000.0)
+    # A newly listed symbol: far fewer than 200 daily candles, so no trend.
+    monkeypatch.setattr(
+        app_main,
+        "fetch_daily_candles",
+        lambda **kwargs: [Kline(day, 100.0, 100.0, 100.0, 100.0, 1.0, day) for day in range(30)],
+    )
+    sent: list[str] = []
+    monkeypatch.setattr(app_main, "send_telegram_alert", lambda **kwargs: sent.append(kwargs["text"]))
+    runtime = app_main._build_runtime(config, HttpSession())
+
+    assert app_main.run_once(runtime) == 0
+    assert app_main.run_once(runtime) == 0
+    fear_greed = {"value": 10, "label": "Extreme Fear"}
+    assert app_main.run_once(runtime) == 0
+    runtime.outbox.flush(timeout=5)
+
+    assert "Reason: regime_flip" in sent[-1]
+    assert "Partial inputs" not in sent[-1]
+    assert runtime.states["BTCUSDT"].last_regime == "RISK_OFF_BUY_ZONE"
+
+
+def test_run_daemon_reuses_runtime_across_ticks(tmp_path, monkeypatch) -> None:
+    state_path = tmp_path / "state.json"
+    monkeypatch.setattr(app_main, "load_config", lambda: _config(state_path))
+
+    runtimes: list[object] = []
+    monkeypatch.setattr(app_main, "run_once", lambda runtime: runtimes.append(runtime))
+
+    class _TwoTickScheduler(app_main.Scheduler):
+        def run(self) -> None:
+            self.run_tick()
+            self.run_tick()
+
+    monkeypatch.setattr(app_main, "Scheduler", _TwoTickScheduler)
+
+    assert app_main.run_daemon() == 0
+    assert len(runtimes) == 2
+    assert runtimes[0] is runtimes[1]
+
+
+def test_run_daemon_releases_state_lock_between_ticks(tmp_path, monkeypatch) -> None:
+    state_path = tmp_path / "state.json"
+    monkeypatch.setattr(app_main, "load_config", lambda: _config(state_path))
+    seen: list[str] = []
+    monkeypatch.setattr(app_main, "run_once", lambda runtime: seen.append(runtime.states["BTCUSDT"].last_regime))
+
+    class _OneShotBetweenTicks(app_main.Scheduler):
+        def run(self) -> None:
+            self.run_tick()
+            # A manual one-shot run gets the lock and saves while the daemon idles.
+            with state_lock(str(state_path), timeout_seconds=0.0):
+                save_states(str(state_path), {"BTCUSDT": RiskState(last_regime="RISK_OFF")})
+            self.run_tick()
+
+    monkeypatch.setattr(app_main, "Scheduler", _OneShotBetweenTicks)
+
+    assert app_main.run_daemon() == 0
+    assert seen == ["", "RISK_OFF"]
+
+
+def test_run_daemon_hot_reloads_config_between_ticks(tmp_path, monkeypatch) -> None:
+    state_path = tmp_path / "state.json"
+    initial = replace(_config(state_path), config_reload_seconds=0.01)
+    configs = [initial]
+    monkeypatch.setattr(app_main, "load_config", lambda: configs[-1])
+    seen: list[tuple[int, tuple[str, ...], str]] = []
+
+    def _tick(runtime) -> None:
+        config = runtime.config
+        symbols = tuple(s.futures for s in config.watched_symbols())
+        seen.append((config.alert_cooldown_hours, symbols, config.state_file))
+
+    monkeypatch.setattr(app_main, "run_once", _tick)
+
+    class _ReloadingScheduler(app_main.Scheduler):
+        def run(self) -> None:
+            self.run_tick()
+            configs.append(
+                replace(
+                    initial,
+                    poll_interval_minutes=15,
+                    alert_cooldown_hours=2,
+                    state_file=str(tmp_path / "other.json"),
+                    watchlist=(initial.symbols, Symbols(futures="ETHUSDT", spot="ETHUSDT")),
+                )
+            )
+            deadline = time.monotonic() + 5
+            while self.interval_seconds != 15 * 60 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.run_tick()
+
+    monkeypatch.setattr(app_main, "Scheduler", _ReloadingScheduler)
+
+    assert app_main.run_daemon() == 0
+    assert seen == [
+        (6, ("BTCUSDT",), str(state_path)),
+        # state_file is pinned until restart; the rest applies live.
+        (2, ("BTCUSDT", "ETHUSDT"), str(state_path)),
+    ]
+
+
+def test_apply_config_loads_added_symbols_and_drops_removed(tmp_path) -> None:
+    base = _config(tmp_path / "state.json")
+    config = replace(base, watchlist=(base.symbols, Symbols(futures="ETHUSDT", spot="ETHUSDT")))
+    runtime = app_main._build_runtime(config, HttpSession())
+    runtime.last_inputs["ETHUSDT"] = object()
+    try:
+        app_main._apply_config(runtime, replace(base, watchlist=(Symbols(futures="SOLUSDT", spot="SOLUSDT"),)))
+
+        assert set(runtime.states) == {"BTCUSDT", "ETHUSDT", "SOLUSDT"}
+        assert "SOLUSDT" in runtime.indicators
+        assert runtime.last_inputs == {}
+    finally:
+        runtime.outbox.close(timeout=1)
+
+
+def test_run_once_scores_every_watched_symbol(tmp_path, monkeypatch) -> None:
+    state_path = tmp_path / "state.json"
+    base = _config(state_path)
+    eth_thresholds = replace(base.thresholds, fear_greed_buy=5)
+    config = replace(
+        base,
+        watchlist=(
+            Symbols(futures="BTCUSDT", spot="BTCUSDT"),
+            Symbols(futures="ETHUSDT", spot="ETHUSDT", thresholds=eth_thresholds),
+        ),
+    )
+    monkeypatch.setattr(app_main, "load_config", lambda: config)
+    monkeypatch.setattr(app_main, "fetch_fear_greed", lambda **kwargs: {"value": 10, "label": "Extreme Fear"})
+
+    premium_calls: list[list[str]] = []
+
+    def _premiums(**kwargs):
+        premium_calls.append(kwargs["symbols"])
+        return {
+            "BTCUSDT": {"funding_rate": 0.0, "mark_price": 70000.0},
+            "ETHUSDT": {"funding_rate": 0.0, "mark_price": 3500.0},
+        }
+
+    monkeypatch.setattr(app_main, "fetch_premium_indexes", _premiums)
+    monkeypatch.setattr(
+        app_main,
+        "fetch_open_interest",
+        lambda **kwargs: {"BTCUSDT": 1000.0, "ETHUSDT": 500.0}[kwargs["symbol"]],
+    )
+    monkeypatch.setattr(
+        app_main,
+        "fetch_daily_candles",
+        lambda **kwargs: [Kline(0, 1.0, 1.0, 1.0, 3500.0 if kwargs["symbol"] == "ETHUSDT" else 70000.0, 1.0, 0)],
+    )
+
+    sent: list[str] = []
+    monkeypatch.setattr(app_main, "send_telegram_alert", lambda **kwargs: sent.append(kwargs["text"]))
+
+    assert app_main.run_once() == 0
+    assert premium_calls == [["BTCUSDT", "ETHUSDT"]]
+    assert len(sent) == 2
+    assert any("ETH: 3,500.00" in text for text in sent)
+
+    states = load_states(str(state_path), ["BTCUSDT", "ETHUSDT"])
+    assert states["BTCUSDT"].prev_oi == 1000.0
+    assert states["ETHUSDT"].prev_oi == 500.0
+    # F&G 10 is a buy signal for BTC (<=20) but not for ETH's override (<=5).
+    assert states["BTCUSDT"].last_regime == "RISK_OFF_BUY_ZONE"
+    assert states["ETHUSDT"].last_regime == "NEUTRAL"
+
+
+def test_watchlist_changes_never_reuse_another_symbols_state(tmp_path, monkeypatch) -> None:
+    state_path = tmp_path / "state.json"
+    btc_only = _config(state_path)
+    monkeypatch.setattr(app_main, "fetch_fear_greed", lambda **kwargs: {"value": 50, "label": "Neutral"})
+    monkeypatch.setattr(app_main, "fetch_premium_index", lambda **kwargs: {"funding_rate": 0.0, "mark_price": 1.0})
+    monkeypatch.setattr(app_main, "fetch_premium_indexes", lambda **kwargs: {})
+    monkeypatch.setattr(
+        app_main,
+        "fetch_open_interest",
+        lambda **kwargs: {"BTCUSDT": 1000.0, "ETHUSDT": 500.0}[kwargs["symbol"]],
+    )
+    monkeypatch.setattr(app_main, "fetch_daily_candles", lambda **kwargs: [Kline(0, 1.0, 1.0, 1.0, 2.0, 1.0, 0)])
+    sent: list[str] = []
+    monkeypatch.setattr(app_main, "send_telegram_alert", lambda **kwargs: sent.append(kwargs["text"]))
+
+    monkeypatch.setattr(app_main, "load_config", lambda: btc_only)
+    assert app_main.run_once() == 0
+    eth_first = replace(
+        btc_only,
+        symbols=Symbols(futures="ETHUSDT", spot="ETHUSDT"),
+        watchlist=(Symbols(futures="ETHUSDT", spot="ETHUSDT"), Symbols(futures="BTCUSDT", spot="BTCUSDT")),
+    )
+    monkeypatch.setattr(app_main, "load_config", lambda: eth_first)
+    assert app_main.run_once() == 0
+
+    # ETH starts fresh (first alert, no OI baseline); BTC is still in cooldown.
+    assert len(sent) == 2
+    assert "Reason: first_alert" in sent[1] and "ETH" in sent[1]
+    assert "OI 24h proxy: n/a" in sent[1]
+    states = load_states(str(state_path), ["ETHUSDT", "BTCUSDT"])
+    assert states["ETHUSDT"].prev_oi == 500.0
+    assert states["BTCUSDT"].prev_oi == 1000.0
+
+
+def test_run_once_exports_stage_metrics_to_textfile(tmp_path, monkeypatch) -> None:
+    textfile = tmp_path / "riskline.prom"
+    config = replace(_config(tmp_path / "state.json"), metrics=MetricsConfig(textfile=str(textfile)))
+    monkeypatch.setattr(app_main, "load_config", lambda: config)
+    monkeypatch.setattr(app_main, "fetch_fear_greed", lambda **kwargs: {"value": 50, "label": "Neutral"})
+    monkeypatch.setattr(app_main, "fetch_premium_index", lambda **kwargs: {"funding_rate": 0.0, "mark_price": 1.0})
+    monkeypatch.setattr(app_main, "fetch_open_interest", lambda **kwargs: 10.0)
+    monkeypatch.setattr(app_main, "fetch_daily_candles", lambda **kwargs: [Kline(0, 1.0, 1.0, 1.0, 1.0, 1.0, 0)])
+    monkeypatch.setattr(app_main, "send_telegram_alert", lambda **kwargs: None)
+
+    assert app_main.run_once() == 0
+
+    text = textfile.read_text()
+    for stage in ("fetch", "score", "notify", "persist"):
+        assert f'riskline_stage_duration_seconds_count{{stage="{stage}"}}' in text
+    assert 'riskline_fetch_duration_seconds_count{source="open_interest",symbol="BTCUSDT",outcome="ok"}' in text
+    assert 'riskline_tick_duration_seconds_count{outcome="ok"}' in text
+    assert (tmp_path / "riskline.prom.state.json").exists()
+
+
+def test_live_update_rescores_with_streamed_funding(tmp_path, monkeypatch) -> None:
+    state_path = tmp_path / "state.json"
+    config = _config(state_path)
+    monkeypatch.setattr(app_main, "fetch_fear_greed", lambda **kwargs: {"value": 50, "label": "Neutral"})
+    monkeypatch.setattr(app_main, "fetch_premium_index", lambda **kwargs: {"funding_rate": 0.0, "mark_price": 70000.0})
+    monkeypatch.setattr(app_main, "fetch_open_interest", lambda **kwargs: 1000.0)
+    monkeypatch.setattr(
+        app_main,
+        "fetch_daily_candles",
+        lambda **kwargs: [Kline(day, 1.0, 1.0, 1.0, 70000.0, 1.0, day) for day in range(250)],
+    )
+    sent: list[str] = []
+    monkeypatch.setattr(app_main, "send_telegram_alert", lambda **kwargs: sent.append(kwargs["text"]))
+
+    runtime = app_main._build_runtime(config, HttpSession())
+    runtime.live = LiveMarket(["BTCUSDT"])
+    app_main._on_live_update(runtime, "BTCUSDT")
+    assert sent == []
+
+    # The second tick has an OI baseline, so every regime input is present.
+    assert app_main.run_once(runtime) == 0
+    assert app_main.run_once(runtime) == 0
+    runtime.outbox.flush(timeout=5)
+    assert len(sent) == 1
+
+    runtime.live.apply({"e": "markPriceUpdate", "s": "BTCUSDT", "p": "70100", "r": "-0.0005"})
+    app_main._on_live_update(runtime, "BTCUSDT")
+
+    runtime.outbox.flush(timeout=5)
+    assert len(sent) == 2
+    assert "Reason: regime_flip" in sent[1]
+    assert "BTC: 70,100.00" in sent[1]
+    assert load_states(str(state_path), ["BTCUSDT"])["BTCUSDT"].last_regime == "RISK_OFF_BUY_ZONE"
+
+    # Still short crowded: same band, so nothing is re-scored or re-sent.
+    runtime.live.apply({"e": "markPriceUpdate", "s": "BTCUSDT", "p": "70200", "r": "-0.0006"})
+    app_main._on_live_update(runtime, "BTCUSDT")
+    runtime.outbox.flush(timeout=5)
+    assert len(sent) == 2
+    assert runtime.scorers["BTCUSDT"].skipped == 1
+
+
+def test_run_once_appends_tick_history(tmp_path, monkeypatch) -> None:
+    config = replace(_config(tmp_path / "state.json"), history_dir=str(tmp_path / "history"))
+    monkeypatch.setattr(app_main, "load_config", lambda: config)
+    monkeypatch.setattr(app_main, "fetch_fear_greed", lambda **kwargs: {"value": 50, "label": "Neutral"})
+    monkeypatch.setattr(app_main, "fetch_premium_index", lambda **kwargs: {"funding_rate": 0.0, "mark_price": 1.0})
+    monkeypatch.setattr(app_main, "fetch_open_interest", lambda **kwargs: 10.0)
+    monkeypatch.setattr(app_main, "fetch_daily_candles", lambda **kwargs: [Kline(0, 1.0, 1.0, 1.0, 2.0, 1.0, 0)])
+    monkeypatch.setattr(app_main, "send_telegram_alert", lambda **kwargs: None)
+
+    assert app_main.run_once() == 0
+    assert app_main.run_once() == 0
+
+    records = HistoryStore(config.history_dir).range("BTCUSDT")
+    assert len(records) == 2
+    assert records[0].open_interest == 10.0
+    assert records[0].price == 2.0
+    assert records[0].fear_greed == 50
+    assert records[1].regime == "NEUTRAL"
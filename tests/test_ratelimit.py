@@ -0,0 +1,80 @@
+import pytest
+import responses
+
+from riskline.http import HttpRequestError, HttpSession, get_json
+from riskline.ratelimit import RateLimitError, TokenBucket, WeightLimiter, request_weight
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_request_weight_follows_binance_endpoint_costs() -> None:
+    assert request_weight("api.binance.com", "/api/v3/klines", {"limit": 300}) == 2
+    assert request_weight("fapi.binance.com", "/fapi/v1/premiumIndex", {"symbol": "BTCUSDT"}) == 1
+    assert request_weight("fapi.binance.com", "/fapi/v1/premiumIndex", {}) == 10
+    assert request_weight("fapi.binance.com", "/fapi/v1/forceOrders", {"symbol": "BTCUSDT"}) == 20
+    assert request_weight("fapi.binance.com", "/fapi/v1/forceOrders", None) == 50
+    assert request_weight("fapi.binance.com", "/fapi/v1/klines", {"limit": 1500}) == 10
+    assert request_weight("fapi.binance.com", "/fapi/v1/openInterest", {"symbol": "BTCUSDT"}) == 1
+
+
+def test_token_bucket_reserves_debt_and_refills() -> None:
+    clock = _Clock()
+    bucket = TokenBucket(capacity=10, refill_per_second=1, clock=clock)
+
+    assert bucket.reserve(8, max_wait_seconds=5) == 0.0
+    assert bucket.reserve(5, max_wait_seconds=5) == pytest.approx(3.0)
+    assert bucket.tokens == pytest.approx(-3.0)
+    with pytest.raises(RateLimitError):
+        bucket.reserve(5, max_wait_seconds=5)
+
+    clock.now = 13
+    assert bucket.tokens == pytest.approx(10.0)
+
+
+def test_limiter_sleeps_when_bucket_is_drained_and_ignores_unknown_hosts() -> None:
+    clock = _Clock()
+    slept: list[float] = []
+    limiter = WeightLimiter({"fapi.binance.com": 60}, safety=1.0, clock=clock, sleep=slept.append)
+
+    for _ in range(7):
+        limiter.acquire("https://fapi.binance.com/fapi/v1/premiumIndex")
+    assert slept == [pytest.approx(10.0)]
+
+    assert limiter.acquire("https://example.com/anything") == 0.0
+    assert len(slept) == 1
+
+
+def test_used_weight_header_pulls_bucket_down() -> None:
+    clock = _Clock()
+    limiter = WeightLimiter({"api.binance.com": 6000}, safety=0.5, clock=clock)
+
+    limiter.observe("https://api.binance.com/api/v3/klines", {"X-MBX-USED-WEIGHT-1m": "2900"})
+    assert limiter.bucket("api.binance.com").tokens == pytest.approx(100.0)
+
+    limiter.observe("https://api.binance.com/api/v3/klines", {"X-MBX-USED-WEIGHT-1m": "garbage"})
+    assert limiter.bucket("api.binance.com").tokens == pytest.approx(100.0)
+
+
+@responses.activate
+def test_get_json_shares_limiter_and_fails_fast_past_max_wait() -> None:
+    url = "https://fapi.binance.com/fapi/v1/premiumIndex"
+    responses.add(
+        responses.GET,
+        url,
+        json=[],
+        headers={"x-mbx-used-weight-1m": "2420"},
+        status=200,
+    )
+    limiter = WeightLimiter(safety=1.0, max_wait_seconds=0.5, clock=_Clock())
+    session = HttpSession(rate_limiter=limiter)
+
+    assert get_json(url, session=session) == []
+    with pytest.raises(HttpRequestError, match="Rate limit for fapi.binance.com"):
+        get_json(url, session=session)
+    assert len(responses.calls) == 1
@@ -0,0 +1,100 @@
+import logging
+import threading
+from dataclasses import replace
+from pathlib import Path
+
+from riskline.config import DEFAULT_THRESHOLDS, AppConfig, ConfigError, HttpConfig, Symbols
+from riskline.reload import ConfigWatcher
+
+
+def _config() -> AppConfig:
+    return AppConfig(
+        poll_interval_minutes=30,
+        alert_cooldown_hours=6,
+        state_file="state.json",
+        thresholds=DEFAULT_THRESHOLDS,
+        symbols=Symbols(futures="BTCUSDT", spot="BTCUSDT"),
+        http=HttpConfig(timeout_seconds=1, max_retries=0, backoff_seconds=0.0),
+        cmc_api_key="x",
+        telegram_bot_token="y",
+        telegram_chat_id="z",
+        dry_run=False,
+        enable_liquidations_proxy=False,
+    )
+
+
+def test_watcher_applies_only_changed_configs() -> None:
+    current = _config()
+    loaded = [current]
+    applied: list[AppConfig] = []
+    watcher = ConfigWatcher(lambda: loaded[-1], current, applied.append)
+
+    assert watcher.check() is False
+
+    loaded.append(replace(current, alert_cooldown_hours=2))
+    assert watcher.check() is True
+    assert watcher.check() is False
+    assert applied == [loaded[-1]]
+    assert watcher.current == loaded[-1]
+    assert watcher.reloads == 1
+
+
+def test_watcher_keeps_last_good_config_and_logs_each_error_once(caplog) -> None:
+    current = _config()
+    applied: list[AppConfig] = []
+
+    def _broken() -> AppConfig:
+        raise ConfigError("Invalid YAML in config.yaml")
+
+    watcher = ConfigWatcher(_broken, current, applied.append)
+    with caplog.at_level(logging.WARNING, logger="riskline.reload"):
+        assert watcher.check() is False
+        assert watcher.check() is False
+
+    assert applied == []
+    assert watcher.current is current
+    assert len(caplog.records) == 1
+
+
+def test_watcher_survives_half_written_config_and_warns_once_per_version(tmp_path: Path, caplog) -> None:
+    path = tmp_path / "config.yaml"
+    current = _config()
+    applied: list[AppConfig] = []
+
+    def _load() -> AppConfig:
+        import yaml
+
+        raw = yaml.safe_load(path.read_text())
+        return replace(current, alert_cooldown_hours=int(raw["alert_cooldown_hours"]))
+
+    watcher = ConfigWatcher(_load, current, applied.append, path=str(path))
+    with caplog.at_level(logging.WARNING, logger="riskline.reload"):
+        path.write_text("alert_cooldown_hours: [2\n")  # torn mid-write: YAMLError
+        assert watcher.check() is False
+        assert watcher.check() is False
+        path.write_text("alert_cooldown_hours: two\n")  # ValueError from int()
+        assert watcher.check() is False
+        path.write_text("alert_cooldown_hours: 2\n")
+        assert watcher.check() is True
+
+    assert [record.levelno for record in caplog.records] == [logging.WARNING, logging.WARNING]
+    assert applied == [replace(current, alert_cooldown_hours=2)]
+
+
+def test_watcher_thread_picks_up_file_changes(tmp_path: Path) -> None:
+    path = tmp_path / "value.txt"
+    path.write_text("6")
+    current = _config()
+    changed = threading.Event()
+
+    def _load() -> AppConfig:
+        return replace(current, alert_cooldown_hours=int(path.read_text()))
+
+    watcher = ConfigWatcher(_load, current, lambda config: changed.set(), interval_seconds=0.01)
+    watcher.start()
+    try:
+        path.write_text("3")
+        assert changed.wait(5)
+    finally:
+        watcher.stop()
+    assert watcher.current.alert_cooldown_hours == 3
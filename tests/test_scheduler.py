@@ -0,0 +1,75 @@
+import threading
+import time
+
+import pytest
+
+from riskline.scheduler import Scheduler
+
+
+def test_scheduler_runs_until_stopped() -> None:
+    calls: list[float] = []
+    scheduler: Scheduler
+
+    def _task() -> None:
+        calls.append(time.monotonic())
+        if len(calls) == 3:
+            scheduler.stop()
+
+    scheduler = Scheduler(_task, interval_seconds=0.05)
+    scheduler.run()
+
+    assert len(calls) == 3
+    assert scheduler.ticks_run == 3
+    # Ticks are anchored to the first run, so spacing stays close to the interval.
+    assert calls[2] - calls[0] == pytest.approx(0.1, abs=0.04)
+
+
+def test_scheduler_drops_slots_overrun_by_slow_tick() -> None:
+    calls: list[int] = []
+    scheduler: Scheduler
+
+    def _task() -> None:
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.12)
+        else:
+            scheduler.stop()
+
+    scheduler = Scheduler(_task, interval_seconds=0.05)
+    scheduler.run()
+
+    assert len(calls) == 2
+    assert scheduler.ticks_skipped == 2
+
+
+def test_scheduler_survives_failing_tick() -> None:
+    calls: list[int] = []
+    scheduler: Scheduler
+
+    def _task() -> None:
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        scheduler.stop()
+
+    scheduler = Scheduler(_task, interval_seconds=0.01)
+    scheduler.run()
+    assert len(calls) == 2
+
+
+def test_scheduler_skips_overlapping_tick() -> None:
+    release = threading.Event()
+    scheduler = Scheduler(release.wait, interval_seconds=1.0)
+
+    worker = threading.Thread(target=scheduler.run_tick)
+    worker.start()
+    time.sleep(0.05)
+    assert scheduler.run_tick() is False
+    release.set()
+    worker.join()
+    assert scheduler.ticks_run == 1
+
+
+def test_scheduler_rejects_non_positive_interval() -> None:
+    with pytest.raises(ValueError):
+        Scheduler(lambda: None, interval_seconds=0)
@@ -1,5 +1,6 @@
-from riskline.config import Thresholds
-from riskline.engine.decision import decide_action
+from riskline.config import DEFAULT_SCORING, Outcome, ScoringRules, Signal, SignalRule, Thresholds
+from riskline.engine.decision import Decision, decide_action
+from riskline.engine.plan import compile_plan
 from riskline.engine.score import compute_score
 
 
@@ -46,3 +47,60 @@ def test_decide_action_thresholds() -> None:
     assert decide_action(30).action == "BUY"
     assert decide_action(50).action == "HOLD"
     assert decide_action(80).action == "REDUCE"
+
+
+def test_decide_action_uses_the_compiled_plan() -> None:
+    rules = ScoringRules(
+        signals=DEFAULT_SCORING.signals,
+        regimes=DEFAULT_SCORING.regimes,
+        actions=(Outcome(name="SELL", min_score=75, guidance="Sell"), Outcome(name="WAIT", guidance="Wait")),
+    )
+    plan = compile_plan(rules, _thresholds())
+
+    for score in range(0, 101):
+        decision = decide_action(score, plan=plan)
+        index = plan.action(score)
+        assert (decision.action, decision.guidance) == (plan.action_names[index], plan.action_guidance[index])
+        assert decision == decide_action(score, rules)
+    assert decide_action(75, plan=plan).action == "SELL"
+    assert decide_action(74, plan=plan) == decide_action(74, rules) == Decision(action="WAIT", guidance="Wait")
+
+
+def test_compute_score_skips_missing_inputs() -> None:
+    result = compute_score(
+        fear_greed_value=None,
+        trend_pct_vs_200d=None,
+        funding_rate=None,
+        oi_delta_pct=None,
+        volatility_pct=None,
+        thresholds=_thresholds(),
+    )
+    assert result.score == 45
+    assert result.regime == "NEUTRAL"
+    assert result.diagnostics["fear_greed"] == "No sentiment data"
+    assert result.diagnostics["funding"] == "No funding data"
+
+
+def test_compute_score_follows_configured_rules() -> None:
+    rules = ScoringRules(
+        signals=(
+            Signal(
+                name="funding",
+                input="funding",
+                rules=(SignalRule(">=", "funding_long_crowded", 30, "Long crowded"),),
+                default_label="Balanced",
+                missing_label="No funding data",
+            ),
+        ),
+        regimes=DEFAULT_SCORING.regimes,
+        actions=(Outcome(name="SELL", min_score=75, guidance="Sell"), Outcome(name="WAIT", guidance="Wait")),
+    )
+    kwargs = dict(fear_greed_value=10, trend_pct_vs_200d=3.0, oi_delta_pct=None, volatility_pct=None)
+
+    crowded = compute_score(**kwargs, funding_rate=0.0003, thresholds=_thresholds(), rules=rules)
+    balanced = compute_score(**kwargs, funding_rate=0.0, thresholds=_thresholds(), rules=rules)
+
+    assert (crowded.score, crowded.regime, crowded.diagnostics) == (80, "RISK_ON_EUPHORIA", {"funding": "Long crowded"})
+    assert (balanced.score, balanced.regime) == (50, "NEUTRAL")
+    assert decide_action(crowded.score, rules).action == "SELL"
+    assert decide_action(balanced.score, rules).guidance == "Wait"
@@ -1,8 +1,9 @@
 import responses
 
 from riskline.config import HttpConfig
-from riskline.sources.binance_futures import fetch_futures_snapshot
-from riskline.sources.binance_spot import fetch_daily_klines
+from riskline.lake import DataLake
+from riskline.sources.binance_futures import fetch_futures_snapshot, fetch_open_interest, fetch_premium_indexes
+from riskline.sources.binance_spot import fetch_daily_candles, fetch_daily_klines
 from riskline.sources.cmc_fear_greed import fetch_fear_greed
 
 
@@ -63,3 +64,52 @@ def test_fetch_futures_snapshot_parses_payloads() -> None:
     assert snapshot["funding_rate"] == -0.0002
     assert snapshot["open_interest"] == 12345.0
     assert snapshot["liquidations_proxy"] == "High"
+
+
+@responses.activate
+def test_fetch_premium_indexes_batches_all_symbols() -> None:
+    responses.get(
+        "https://fapi.binance.com/fapi/v1/premiumIndex",
+        json=[
+            {"symbol": "BTCUSDT", "lastFundingRate": "0.0001", "markPrice": "70000"},
+            {"symbol": "ETHUSDT", "lastFundingRate": "-0.0002", "markPrice": "3500"},
+            {"symbol": "XRPUSDT", "lastFundingRate": "0.0", "markPrice": "0.5"},
+        ],
+        status=200,
+    )
+    premiums = fetch_premium_indexes(
+        symbols=["BTCUSDT", "ETHUSDT"],
+        http=HttpConfig(timeout_seconds=1, max_retries=0, backoff_seconds=0),
+    )
+    assert set(premiums) == {"BTCUSDT", "ETHUSDT"}
+    assert premiums["ETHUSDT"]["funding_rate"] == -0.0002
+    assert len(responses.calls) == 1
+    assert "symbol" not in responses.calls[0].request.url
+
+
+@responses.activate
+def test_sources_append_fetched_rows_to_the_lake(tmp_path) -> None:
+    http = HttpConfig(timeout_seconds=1, max_retries=0, backoff_seconds=0)
+    lake = DataLake(str(tmp_path))
+    responses.get(
+        "https://api.binance.com/api/v3/klines",
+        json=[[0, "1", "1", "1", "100", "5", 999], [1000, "1", "1", "1", "101", "5", 1999]],
+    )
+    responses.get(
+        "https://api.binance.com/api/v3/klines",
+        json=[[1000, "1", "1", "1", "102", "5", 1999], [2000, "1", "1", "1", "103", "5", 2999]],
+    )
+    responses.get(
+        "https://fapi.binance.com/fapi/v1/openInterest",
+        json={"openInterest": "12345", "time": 1_700_000_000_500},
+    )
+
+    fetch_daily_candles(symbol="BTCUSDT", http=http, lake=lake)
+    fetch_daily_candles(symbol="BTCUSDT", http=http, lake=lake)
+    fetch_open_interest(symbol="BTCUSDT", http=http, lake=lake)
+
+    candles = lake.read("BTCUSDT", "candles_1d")
+    assert list(candles["open_time"]) == [0, 1000, 2000]
+    assert list(candles["close"]) == [100.0, 102.0, 103.0]
+    oi = lake.read("BTCUSDT", "open_interest")
+    assert (list(oi["ts"]), list(oi["open_interest"])) == ([1_700_000_000], [12345.0])
@@ -0,0 +1,62 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that only specific features need; none may load on a cold start.
+LAZY_MODULES = {
+    "requests",
+    "urllib3",
+    "yaml",
+    "dotenv",
+    "asyncio",
+    "websockets",
+    "sqlite3",
+    "smtplib",
+    "http.server",
+    "statistics",
+    "riskline.http",
+    "riskline.history",
+    "riskline.lake",
+    "riskline.notify.channels",
+    "riskline.notify.queue",
+    "riskline.sources.binance_stream",
+}
+
+
+def _imported_modules(code: str, cwd: Path = ROOT) -> set[str]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd,
+        env={"PYTHONPATH": str(ROOT)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return {
+        line.rsplit("|", 1)[1].strip()
+        for line in completed.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+
+
+def test_importing_main_defers_heavy_modules() -> None:
+    modules = _imported_modules("import main")
+
+    assert "main" in modules
+    assert not modules & LAZY_MODULES
+
+
+def test_warm_config_snapshot_skips_yaml(tmp_path) -> None:
+    (tmp_path / "config.yaml").write_text("poll_interval_minutes: 5\n")
+    (tmp_path / ".env").write_text("CMC_API_KEY=k\nTELEGRAM_BOT_TOKEN=t\nTELEGRAM_CHAT_ID=c\n")
+    code = "from riskline.config import load_config; print(load_config().poll_interval_minutes)"
+
+    cold = _imported_modules(code, cwd=tmp_path)
+    warm = _imported_modules(code, cwd=tmp_path)
+
+    assert {"yaml", "dotenv"} <= cold
+    # Secrets are never snapshotted, so .env is still read on every start.
+    assert "yaml" not in warm
+    assert b"CMC_API_KEY" not in (tmp_path / ".config.yaml.snapshot").read_bytes()
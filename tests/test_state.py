@@ -1,4 +1,11 @@
-from riskline.state import RiskState, compute_oi_delta_pct, should_send_alert
+from riskline.state import (
+    RiskState,
+    compute_oi_delta_pct,
+    load_states,
+    save_state,
+    save_states,
+    should_send_alert,
+)
 
 
 def test_compute_oi_delta_pct() -> None:
@@ -30,6 +37,19 @@ def test_should_send_on_regime_flip() -> None:
     assert reason == "regime_flip"
 
 
+def test_partial_inputs_never_flip_the_regime() -> None:
+    state = RiskState(last_alert_ts=1000, last_regime="RISK_OFF_BUY_ZONE")
+    send, reason = should_send_alert(
+        state=state,
+        current_regime="NEUTRAL",
+        cooldown_hours=6,
+        now_ts=2000,
+        partial=True,
+    )
+    assert send is False
+    assert reason == "partial_inputs"
+
+
 def test_should_respect_cooldown_when_regime_same() -> None:
     state = RiskState(last_alert_ts=1000, last_regime="NEUTRAL")
     send, reason = should_send_alert(
@@ -40,3 +60,35 @@ def test_should_respect_cooldown_when_regime_same() -> None:
     )
     assert send is False
     assert reason == "cooldown_active"
+
+
+def test_states_round_trip_per_symbol(tmp_path) -> None:
+    path = str(tmp_path / "state.json")
+    states = {
+        "BTCUSDT": RiskState(last_alert_ts=1, last_regime="NEUTRAL", prev_oi=10.0),
+        "ETHUSDT": RiskState(last_alert_ts=2, last_regime="RISK_ON_EUPHORIA"),
+    }
+    save_states(path, states)
+
+    restored = load_states(path, ["BTCUSDT", "ETHUSDT", "SOLUSDT"])
+    assert restored["BTCUSDT"] == states["BTCUSDT"]
+    assert restored["ETHUSDT"] == states["ETHUSDT"]
+    assert restored["SOLUSDT"] == RiskState()
+
+
+def test_legacy_single_symbol_file_migrates_only_to_its_symbol(tmp_path) -> None:
+    path = str(tmp_path / "state.json")
+    save_state(path, RiskState(last_regime="NEUTRAL", prev_oi=5.0))
+
+    assert load_states(path, ["ETHUSDT"], legacy_symbol="BTCUSDT") == {"ETHUSDT": RiskState()}
+    states = load_states(path, ["ETHUSDT", "BTCUSDT"], legacy_symbol="BTCUSDT")
+    assert states["BTCUSDT"].prev_oi == 5.0
+    assert states["ETHUSDT"] == RiskState()
+
+
+def test_single_symbol_states_are_saved_by_symbol(tmp_path) -> None:
+    path = str(tmp_path / "state.json")
+    save_states(path, {"BTCUSDT": RiskState(last_regime="NEUTRAL", prev_oi=5.0)})
+
+    assert load_states(path, ["ETHUSDT"]) == {"ETHUSDT": RiskState()}
+    assert load_states(path, ["ETHUSDT", "BTCUSDT"])["BTCUSDT"].prev_oi == 5.0
@@ -0,0 +1,99 @@
+import json
+import sqlite3
+
+import pytest
+
+from riskline.state import RiskState, load_state, save_state, save_states
+from riskline.state_store import (
+    JsonStateStore,
+    SqliteStateStore,
+    StateLockError,
+    create_state_store,
+    sqlite_state_path,
+    state_lock,
+)
+
+
+def test_json_save_is_atomic_when_rename_fails(tmp_path, monkeypatch) -> None:
+    path = str(tmp_path / "state.json")
+    save_state(path, RiskState(last_regime="NEUTRAL", prev_oi=1.0))
+
+    def _crash(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("riskline.state.os.replace", _crash)
+    with pytest.raises(OSError):
+        save_state(path, RiskState(last_regime="RISK_ON_EUPHORIA"))
+
+    assert load_state(path).last_regime == "NEUTRAL"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["state.json"]
+
+
+def test_json_store_round_trips_symbols(tmp_path) -> None:
+    store = JsonStateStore(str(tmp_path / "state.json"))
+    states = {"BTCUSDT": RiskState(prev_oi=1.0), "ETHUSDT": RiskState(last_regime="NEUTRAL")}
+    store.save(states)
+
+    assert store.load(["BTCUSDT", "ETHUSDT"]) == states
+    assert "symbols" in json.loads((tmp_path / "state.json").read_text())
+
+
+def test_sqlite_store_round_trips_and_writes_only_changed_rows(tmp_path) -> None:
+    state_file = str(tmp_path / "state.db")
+    path = sqlite_state_path(state_file)
+    states = {
+        "BTCUSDT": RiskState(last_alert_ts=5, last_regime="NEUTRAL", prev_oi=1.5, indicators={"closes": [1.0]}),
+        "ETHUSDT": RiskState(),
+    }
+    with SqliteStateStore(path) as store:
+        store.save(states)
+        changes = store._conn.total_changes
+        states["ETHUSDT"].prev_oi = 2.0
+        store.save(states)
+        assert store._conn.total_changes == changes + 1
+
+    with create_state_store("sqlite", state_file) as store:
+        restored = store.load(["BTCUSDT", "ETHUSDT", "SOLUSDT"])
+    assert restored["BTCUSDT"] == states["BTCUSDT"]
+    assert restored["ETHUSDT"].prev_oi == 2.0
+    assert restored["SOLUSDT"] == RiskState()
+    assert sqlite3.connect(path).execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_sqlite_store_imports_the_json_state_on_first_open(tmp_path) -> None:
+    json_path = str(tmp_path / "state.json")
+    states = {"BTCUSDT": RiskState(last_alert_ts=5, last_regime="NEUTRAL"), "ETHUSDT": RiskState(prev_oi=2.0)}
+    save_states(json_path, states)
+
+    assert sqlite_state_path(json_path) == str(tmp_path / "state.sqlite")
+    with create_state_store("sqlite", json_path) as store:
+        assert store.path == str(tmp_path / "state.sqlite")
+        assert store.load(["BTCUSDT", "ETHUSDT"]) == states
+
+    # Only an empty database is seeded; later JSON changes are not re-imported.
+    save_states(json_path, {"BTCUSDT": RiskState(last_regime="RISK_ON_EUPHORIA")})
+    with create_state_store("sqlite", json_path) as store:
+        assert store.load(["BTCUSDT"])["BTCUSDT"].last_regime == "NEUTRAL"
+    assert json.loads((tmp_path / "state.json").read_text())["symbols"]["BTCUSDT"]["last_regime"] == "RISK_ON_EUPHORIA"
+
+
+def test_sqlite_store_imports_a_legacy_single_symbol_file(tmp_path) -> None:
+    # Any state_file name: the database always gets its own file next to it.
+    state_file = str(tmp_path / "state")
+    save_state(state_file, RiskState(last_regime="NEUTRAL"))
+
+    with create_state_store("sqlite", state_file, legacy_symbol="BTCUSDT") as store:
+        assert store.path == f"{state_file}.sqlite"
+        restored = store.load(["BTCUSDT", "ETHUSDT"])
+    assert restored == {"BTCUSDT": RiskState(last_regime="NEUTRAL"), "ETHUSDT": RiskState()}
+    assert load_state(state_file) == RiskState(last_regime="NEUTRAL")
+
+
+def test_state_lock_blocks_a_second_holder(tmp_path) -> None:
+    path = str(tmp_path / "state.json")
+    with state_lock(path):
+        with pytest.raises(StateLockError):
+            with state_lock(path, timeout_seconds=0.2, poll_seconds=0.05):
+                pass
+    with state_lock(path, timeout_seconds=0.2):
+        pass
@@ -0,0 +1,137 @@
+import asyncio
+import json
+
+import pytest
+
+from riskline.sources.binance_stream import LiveMarket, run_stream, stream_url
+
+websockets = pytest.importorskip("websockets")
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _mark(symbol: str, price: str, funding: str) -> dict:
+    return {
+        "stream": f"{symbol.lower()}@markPrice@1s",
+        "data": {"e": "markPriceUpdate", "E": 1, "s": symbol, "p": price, "r": funding},
+    }
+
+
+def _force_order(symbol: str, side: str, qty: str, price: str) -> dict:
+    return {
+        "stream": f"{symbol.lower()}@forceOrder",
+        "data": {"e": "forceOrder", "E": 1, "o": {"s": symbol, "S": side, "q": qty, "z": qty, "ap": price, "p": price}},
+    }
+
+
+def test_stream_url_combines_streams_per_symbol() -> None:
+    assert stream_url(["BTCUSDT"], "wss://x/stream") == "wss://x/stream?streams=btcusdt@markPrice@1s/btcusdt@forceOrder"
+
+
+def test_live_market_tracks_funding_and_rolling_liquidations() -> None:
+    clock = _Clock()
+    market = LiveMarket(["BTCUSDT"], liquidation_window_seconds=60, clock=clock)
+
+    assert market.snapshot("BTCUSDT") is None
+    assert market.apply(_mark("BTCUSDT", "70000.5", "0.0001")) == "BTCUSDT"
+    assert market.apply(_force_order("BTCUSDT", "SELL", "2", "70000")) == "BTCUSDT"
+    clock.now += 30
+    market.apply(_force_order("BTCUSDT", "BUY", "1", "71000"))
+    assert market.apply(_mark("ETHUSDT", "3500", "0.0001")) is None
+
+    snapshot = market.snapshot("BTCUSDT")
+    assert snapshot.funding_rate == 0.0001
+    assert snapshot.mark_price == 70000.5
+    assert snapshot.long_liquidations == 140000.0
+    assert snapshot.short_liquidations == 71000.0
+    assert snapshot.liquidations_label() == "longs $140K / shorts $71K"
+
+    clock.now += 31
+    snapshot = market.snapshot("BTCUSDT")
+    assert snapshot.long_liquidations == 0.0
+    assert snapshot.short_liquidations == 71000.0
+    assert market.snapshot("BTCUSDT", max_age_seconds=60) is None
+
+
+def test_run_stream_consumes_local_websocket() -> None:
+    messages = [
+        _mark("BTCUSDT", "70000", "-0.0002"),
+        _force_order("BTCUSDT", "SELL", "1", "70000"),
+        {"result": None, "id": 1},
+    ]
+
+    async def _handler(connection) -> None:
+        for message in messages:
+            await connection.send(json.dumps(message))
+        await connection.wait_closed()
+
+    async def _scenario() -> list[str]:
+        updates: list[str] = []
+        done = asyncio.Event()
+
+        def _on_update(symbol: str) -> None:
+            updates.append(symbol)
+            if len(updates) == 2:
+                done.set()
+
+        market = LiveMarket(["BTCUSDT"])
+        async with websockets.serve(_handler, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            task = asyncio.create_task(run_stream(f"ws://127.0.0.1:{port}", market, on_update=_on_update))
+            await asyncio.wait_for(done.wait(), timeout=5)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        snapshot = market.snapshot("BTCUSDT")
+        assert snapshot.funding_rate == -0.0002
+        assert snapshot.long_liquidations == 70000.0
+        return updates
+
+    assert asyncio.run(_scenario()) == ["BTCUSDT", "BTCUSDT"]
+
+
+def test_run_stream_skips_malformed_messages_without_reconnecting() -> None:
+    broken_mark = _mark("BTCUSDT", "70000", "-0.0002")
+    del broken_mark["data"]["p"]
+    frames = [
+        json.dumps(broken_mark),
+        json.dumps(_force_order("BTCUSDT", "SELL", None, None)),
+        json.dumps(["not", "an", "event"]),
+        "{not json",
+        json.dumps(_mark("BTCUSDT", "71000", "0.0001")),
+    ]
+    connections: list[object] = []
+
+    async def _handler(connection) -> None:
+        connections.append(connection)
+        for frame in frames:
+            await connection.send(frame)
+        await connection.wait_closed()
+
+    async def _scenario() -> list[str]:
+        updates: list[str] = []
+        done = asyncio.Event()
+
+        def _on_update(symbol: str) -> None:
+            updates.append(symbol)
+            done.set()
+
+        market = LiveMarket(["BTCUSDT"])
+        async with websockets.serve(_handler, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            task = asyncio.create_task(run_stream(f"ws://127.0.0.1:{port}", market, on_update=_on_update))
+            await asyncio.wait_for(done.wait(), timeout=5)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        assert market.snapshot("BTCUSDT").mark_price == 71000.0
+        return updates
+
+    assert asyncio.run(_scenario()) == ["BTCUSDT"]
+    assert len(connections) == 1
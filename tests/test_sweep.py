@@ -0,0 +1,88 @@
+import pytest
+
+from riskline.backtest import HistoricalSeries, precompute_inputs, simulate
+from riskline.config import DEFAULT_THRESHOLDS
+from riskline.sweep import grid, main, random_samples, run_sweep
+
+DAY = 86_400
+
+
+def _inputs(symbol: str, count: int = 120):
+    closes = [100.0 + ((i * 11) % 13) - i * 0.1 for i in range(count)]
+    return precompute_inputs(
+        HistoricalSeries(
+            symbol=symbol,
+            timestamps=[i * DAY for i in range(count)],
+            closes=closes,
+            funding_rates=[(-0.0002, 0.0, 0.0002)[i % 3] for i in range(count)],
+            open_interest=[1000.0 + (i % 7) * 30 for i in range(count)],
+            fear_greed=[(i * 9) % 100 for i in range(count)],
+        )
+    )
+
+
+def test_grid_covers_cartesian_product_over_base() -> None:
+    candidates = list(grid({"fear_greed_buy": ["10", "25"], "high_volatility_pct": [2, 4, 6]}, DEFAULT_THRESHOLDS))
+
+    assert len(candidates) == 6
+    assert {c.fear_greed_buy for c in candidates} == {10, 25}
+    assert {c.high_volatility_pct for c in candidates} == {2.0, 4.0, 6.0}
+    assert all(c.fear_greed_sell == DEFAULT_THRESHOLDS.fear_greed_sell for c in candidates)
+
+
+def test_random_samples_are_reproducible() -> None:
+    space = {"oi_deleveraging_pct": [-1, -2, -3, -4], "fear_greed_sell": [60, 70, 80]}
+    first = list(random_samples(space, DEFAULT_THRESHOLDS, count=5, seed=7))
+    second = list(random_samples(space, DEFAULT_THRESHOLDS, count=5, seed=7))
+    assert first == second
+    assert len(first) == 5
+
+
+def test_grid_rejects_unknown_fields() -> None:
+    with pytest.raises(ValueError, match="Unknown threshold fields"):
+        list(grid({"not_a_threshold": [1]}, DEFAULT_THRESHOLDS))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_sweep_matches_direct_simulation(workers) -> None:
+    inputs = [_inputs("BTCUSDT"), _inputs("ETHUSDT", count=80)]
+    candidates = list(grid({"fear_greed_buy": [10, 30], "trend_risk_off_pct": [-1.0, -5.0]}, DEFAULT_THRESHOLDS))
+
+    results = run_sweep(inputs, candidates, cooldown_hours=6, workers=workers, chunksize=1)
+
+    assert [result.thresholds for result in results] == candidates
+    for result in results:
+        direct = [simulate(item, result.thresholds, cooldown_hours=6) for item in inputs]
+        assert result.alerts_by_symbol == {item.symbol: item.alert_count for item in direct}
+        assert sum(result.regimes.values()) == 200
+
+
+def test_run_sweep_scores_with_the_selected_backend(monkeypatch) -> None:
+    import riskline.backtest as backtest
+
+    backends: list[str] = []
+    score_batch = backtest.score_batch
+
+    def _spy(**kwargs):
+        backends.append(kwargs["backend"])
+        return score_batch(**kwargs)
+
+    monkeypatch.setattr(backtest, "score_batch", _spy)
+    run_sweep([_inputs("BTCUSDT")], [DEFAULT_THRESHOLDS], cooldown_hours=6, workers=1, backend="python")
+
+    assert backends == ["python"]
+
+
+def test_sweep_cli_reports_results(tmp_path, capsys) -> None:
+    csv_path = tmp_path / "btcusdt.csv"
+    csv_path.write_text(
+        "timestamp,close,funding_rate,open_interest,fear_greed\n"
+        + "".join(f"{i * DAY},{100 + i},0.0,{1000 + i},{(i * 17) % 100}\n" for i in range(30))
+    )
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("alert_cooldown_hours: 6\n")
+
+    main([str(csv_path), "--config", str(config_path), "--param", "fear_greed_buy=10,20", "--workers", "1"])
+    lines = capsys.readouterr().out.strip().splitlines()
+    assert len(lines) == 2
+    assert lines[0].startswith("fear_greed_buy=10: alerts=30")
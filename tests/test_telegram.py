@@ -26,6 +26,8 @@ def test_send_telegram_alert_success(monkeypatch) -> None:
     called = {"count": 0}
 
     class _Resp:
+        status_code = 200
+
         @staticmethod
         def raise_for_status() -> None:
             return None
@@ -52,6 +54,8 @@ def test_send_telegram_alert_success(monkeypatch) -> None:
 
 def test_send_telegram_alert_raises_when_api_payload_not_ok(monkeypatch) -> None:
     class _Resp:
+        status_code = 200
+
         @staticmethod
         def raise_for_status() -> None:
             return None